@@ -0,0 +1,247 @@
+"""
+Writes synthetic VALSO run directories for offline benchmarks.
+
+The files reproduce the names of the CDFTOOLS/Elmer outputs produced by
+run_all.bash (ISF_ALL_*_1y_y1976_flxT.nc, rapid_*_moc.nc, WG_*_psi.nc,
+ismip6 monitoring files ...) and the variables read through YML/plots.yml,
+so run_plot.py, run_score.py and BENCH/run_bench.py can run on them without
+any HPC access. A styles.yml listing the generated runs is written next to
+the run directories.
+"""
+import os
+import numpy as np
+import netCDF4 as nc
+import yaml
+
+# ===================== FILE FAMILIES =====================
+# file name template (CONFIG, RUNID, FREQ, TAG, MM), variables (mean, amplitude) and files per year
+# (MONTHS: one file per month suffix, as the sea ice and mixed layer split files)
+FAMILIES = {
+    "ISF":   {"FILE": "ISF_ALL_{CONFIG}-{RUNID}_{FREQ}_{TAG}_flxT.nc",
+              "VARS": {"isfmelt_GETZ": (144., 20.), "isfmelt_TWAI": (97., 15.), "isfmelt_PINE": (101., 15.),
+                       "isfmelt_FRIS": (155., 30.), "isfmelt_ROSS": (47., 10.), "isfmelt_TOTA": (1500., 150.)}},
+    "ACC":   {"FILE": "ACC_{CONFIG}-{RUNID}_{FREQ}_{TAG}_transports.nc",
+              "VARS": {"vtrp": (-157., 8.)}},
+    "MOC":   {"FILE": "rapid_{CONFIG}-{RUNID}_{FREQ}_{TAG}_moc.nc",
+              "VARS": {"Total_max_amoc_rapid": (17., 2.)}},
+    "MHT":   {"FILE": "{CONFIG}-{RUNID}_{FREQ}_{TAG}_mht_265.nc",
+              "VARS": {"zomht_atl": (1.2, 0.2)}},
+    "HFDS":  {"FILE": "GLO_hfds_{CONFIG}-{RUNID}_{FREQ}_{TAG}_grid-T.nc",
+              "VARS": {"mean_hfds": (0.5, 1.)}},
+    "SST":   {"FILE": "SO_sst_{CONFIG}-{RUNID}_{FREQ}_{TAG}_grid-T.nc",
+              "VARS": {"mean_thetao": (5., 0.5)}},
+    "NWC":   {"FILE": "NWC_sst_{CONFIG}-{RUNID}_{FREQ}_{TAG}_grid-T.nc",
+              "VARS": {"mean_thetao": (12., 1.)}},
+    "BOT":   {"FILE": "{AREA}_{CONFIG}-{RUNID}_{FREQ}_{TAG}_bottom-T.nc",
+              "AREAS": {"WROSS_so": {"mean_sosbs": (34.8, 0.1)}, "WWED_so": {"mean_sosbs": (34.7, 0.1)},
+                        "AMU_thetao": {"mean_sosbt": (1.0, 0.3)}, "EROSS_thetao": {"mean_sosbt": (-1.0, 0.3)},
+                        "EWED_thetao": {"mean_sosbt": (-1.5, 0.3)}, "FRIS_thetao": {"mean_sosbt_tmask": (-1.9, 0.1)},
+                        "ROSS_thetao": {"mean_sosbt_tmask": (-1.8, 0.1)}, "AMUS_thetao": {"mean_sosbt_tmask": (0.8, 0.3)}}},
+    "PSI":   {"FILE": "{AREA}_{CONFIG}-{RUNID}_{FREQ}_{TAG}_psi.nc",
+              "AREAS": {"WG": {"max_sobarstf": (50e6, 10e6)}, "RG": {"max_sobarstf": (20e6, 5e6)}}},
+    "ICB":   {"FILE": "SH_{CONFIG}-{RUNID}_{FREQ}_{TAG}_icb-T.nc",
+              "VARS": {"sum_berg_melt_tmask": (6e7, 1e7)}},
+    "SIE":   {"FILE": "GLO_sie_{CONFIG}-{RUNID}_{FREQ}_{TAG}m{MM}.nc", "MONTHS": True,
+              "VARS": {"NExnsidc": (10000., 4000.), "SExnsidc": (11000., 7000.)}},
+    "AMUXL": {"FILE": "AMUXL_sie_{CONFIG}-{RUNID}_{FREQ}_{TAG}m{MM}.nc", "MONTHS": True,
+              "VARS": {"SExnsidc": (500., 300.)}},
+    "MXL":   {"FILE": "WMXL_{CONFIG}-{RUNID}_1m_{TAG}m{MM}_gridT.nc", "MONTHS": True,
+              "VARS": {"max_somxl010": (150., 120.)}},
+    "SSH":   {"FILE": "zos_wmean_{CONFIG}-{RUNID}_{FREQ}_{TAG}_grid_T.nc",
+              "VARS": {"zos_wmean": (0., 0.05)}},
+    "ISMIP6": {"FILE": "ismip6_{KIND}_{RUNID}_{TAG}_monitoring_{ICE}.nc",
+               "ICES": ("antarctica", "greenland"),
+               "KINDS": {"fluxes": {"Ice_flux_at_Grounding_Line": (-2000., 100.), "BMB_Flux": (-1200., 100.),
+                                    "SMB_Flux": (2500., 200.), "Ice_Discharge": (-1500., 100.),
+                                    "Volume_rate_of_change": (-100., 50.)},
+                         "states": {"Floating_ice_area": (1.5, 0.05), "Volume_Above_Flotation": (26., 0.1)}},
+               "BASINS": ("00", "11")},
+}
+
+TIME_UNITS = "seconds since 1900-01-01 00:00:00"
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# ===================== WRITERS =====================
+def record_times(year, nrec, month=None):
+    """
+    Returns the centered times (noleap, TIME_UNITS) of the records of one file.
+
+    Args:
+        year (int): Year of the file.
+        nrec (int): Number of records (1 for an annual mean, 12 for monthly means).
+        month (int): Month of a single-month file (0-based, None for a yearly file).
+
+    Returns:
+        np.ndarray: Times in seconds.
+    """
+    start = np.concatenate([[0], np.cumsum(MONTH_DAYS)])
+    if month is not None:
+        days = np.array([start[month] + MONTH_DAYS[month] / 2.])
+    elif nrec == 12:
+        days = start[:-1] + MONTH_DAYS / 2.
+    else:
+        days = np.array([182.5])
+    return ((year - 1900) * 365 + days) * 86400.
+
+
+def write_file(path, times, variables, compress=False):
+    """
+    Writes one scalar time series file as CDFTOOLS does (time_counter, y, x = 1, 1).
+
+    Args:
+        path (str): Output file.
+        times (np.ndarray): Times in seconds (TIME_UNITS, noleap).
+        variables (dict): Values (one per record) per variable name.
+        compress (bool): Use zlib compression (netCDF4 format).
+    """
+    with nc.Dataset(path, "w", format="NETCDF4" if compress else "NETCDF4_CLASSIC") as ds:
+        ds.createDimension("time_counter", None)
+        ds.createDimension("y", 1)
+        ds.createDimension("x", 1)
+        time = ds.createVariable("time_counter", "f8", ("time_counter",))
+        time.units = TIME_UNITS
+        time.calendar = "noleap"
+        time.standard_name = "time"
+        time[:] = times
+        for name in ("nav_lon", "nav_lat"):
+            ds.createVariable(name, "f4", ("y", "x"))[:] = 0.
+        for name, values in variables.items():
+            var = ds.createVariable(name, "f4", ("time_counter", "y", "x"), zlib=compress)
+            var[:] = np.asarray(values, dtype=np.float32).reshape(-1, 1, 1)
+
+
+def make_values(rng, mean, amplitude, year, nrec, ir):
+    """
+    Returns synthetic values: mean + run bias + decadal oscillation + seasonal cycle + noise.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        mean (float): Mean value.
+        amplitude (float): Variability amplitude.
+        year (int): Year of the records.
+        nrec (int): Number of records.
+        ir (int): Run index (sets the run bias and phase).
+
+    Returns:
+        np.ndarray: Values.
+    """
+    month = np.arange(nrec) if nrec > 1 else np.array([5.5])
+    t = year + month / 12.
+    bias = 0.3 * amplitude * np.sin(1.7 * ir)
+    decadal = 0.5 * amplitude * np.sin(2 * np.pi * t / 11. + ir)
+    seasonal = 0.5 * amplitude * np.cos(2 * np.pi * (month - 8) / 12.) if nrec > 1 else 0.
+    return mean + bias + decadal + seasonal + 0.2 * amplitude * rng.standard_normal(nrec)
+
+
+def make_run(cdir, config, runid, ir, yearb, yeare, freq="1y", families=None, compress=False, seed=0):
+    """
+    Writes all the files of one synthetic run.
+
+    Args:
+        cdir (str): Base directory of the runs.
+        config (str): Configuration name.
+        runid (str): Run ID.
+        ir (int): Run index.
+        yearb (int): First year.
+        yeare (int): Last year.
+        freq (str): 1y (one annual record per file) or 1m (12 monthly records per yearly file).
+        families (list): File families to write (default: all of FAMILIES).
+        compress (bool): Use zlib compression.
+        seed (int): Random seed.
+
+    Returns:
+        int: Number of files written.
+    """
+    rng = np.random.default_rng(seed + ir)
+    rdir = os.path.join(cdir, f"{config}-{runid}")
+    os.makedirs(rdir, exist_ok=True)
+    nrec = 12 if freq == "1m" else 1
+    nfile = 0
+    for fam in families or FAMILIES:
+        info = FAMILIES[fam]
+        for year in range(yearb, yeare + 1):
+            tag = f"y{year}"
+            names = dict(CONFIG=config, RUNID=runid, FREQ=freq, TAG=tag)
+            if "AREAS" in info:
+                for area, variables in info["AREAS"].items():
+                    path = os.path.join(rdir, info["FILE"].format(AREA=area, **names))
+                    write_file(path, record_times(year, nrec), {v: make_values(rng, *mv, year, nrec, ir) for v, mv in variables.items()}, compress)
+                    nfile += 1
+            elif "KINDS" in info:
+                for ice in info["ICES"]:
+                    for kind, variables in info["KINDS"].items():
+                        path = os.path.join(rdir, info["FILE"].format(KIND=kind, ICE=ice, **names))
+                        values = {f"{v}_{b}": make_values(rng, *mv, year, nrec, ir) for v, mv in variables.items() for b in info["BASINS"]}
+                        write_file(path, record_times(year, nrec), values, compress)
+                        nfile += 1
+            elif info.get("MONTHS"):
+                for month in range(12):
+                    path = os.path.join(rdir, info["FILE"].format(MM=f"{month:02d}", **names))
+                    write_file(path, record_times(year, 1, month), {v: make_values(rng, *mv, year, 1, ir) for v, mv in info["VARS"].items()}, compress)
+                    nfile += 1
+            else:
+                path = os.path.join(rdir, info["FILE"].format(**names))
+                write_file(path, record_times(year, nrec), {v: make_values(rng, *mv, year, nrec, ir) for v, mv in info["VARS"].items()}, compress)
+                nfile += 1
+    return nfile
+
+
+# ===================== MAIN FUNCTION =====================
+def main(cdir, nrun=4, yearb=1976, yeare=2005, freq="1y", config="eORCA025.L121", prefix="SYN", families=None, compress=False, seed=0):
+    """
+    Writes nrun synthetic runs and the corresponding styles.yml in cdir.
+
+    Args:
+        cdir (str): Base directory of the runs.
+        nrun (int): Number of runs.
+        yearb (int): First year.
+        yeare (int): Last year.
+        freq (str): 1y or 1m records.
+        config (str): Configuration name.
+        prefix (str): Prefix of the run IDs (runs are <prefix>000, <prefix>001 ...).
+        families (list): File families to write (default: all).
+        compress (bool): Use zlib compression.
+        seed (int): Random seed.
+    """
+    os.makedirs(cdir, exist_ok=True)
+    colors = ["black", "crimson", "navy", "forestgreen", "orange", "royalblue", "sienna", "gray"]
+    runs = {}
+    for ir in range(nrun):
+        runid = f"{prefix}{ir:03d}"
+        nfile = make_run(cdir, config, runid, ir, yearb, yeare, freq, families, compress, seed)
+        runs[f"{config}-{runid}"] = {"NAME": runid, "LINE": "-", "COLOR": colors[ir % len(colors)]}
+        print(f"✅ {config}-{runid}: {nfile} files")
+
+    style = os.path.join(cdir, "styles.yml")
+    with open(style, "w") as fid:
+        yaml.safe_dump({"runs": runs}, fid, sort_keys=False)
+    print(f"✅ Saved {style}")
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Write synthetic VALSO run directories for benchmarks.")
+    parser.add_argument("-dir",      default="./BENCH/RUNS",                   help="Base directory of the runs.")
+    parser.add_argument("-nrun",     default=4, type=int,                      help="Number of runs.")
+    parser.add_argument("-years",    default=[1976, 2005], type=int, nargs=2,  help="First and last year.")
+    parser.add_argument("-freq",     default="1y", choices=["1y", "1m"],       help="1y (annual records) or 1m (12 monthly records per yearly file).")
+    parser.add_argument("-config",   default="eORCA025.L121",                  help="Configuration name.")
+    parser.add_argument("-prefix",   default="SYN",                            help="Prefix of the run IDs.")
+    parser.add_argument("-families", default=None, nargs="+", choices=list(FAMILIES), help="File families to write (default: all).")
+    parser.add_argument("-compress", action="store_true",                      help="Use zlib compressed netCDF4 files.")
+    parser.add_argument("-seed",     default=0, type=int,                      help="Random seed.")
+    args = parser.parse_args()
+
+    main(
+        cdir=args.dir,
+        nrun=args.nrun,
+        yearb=args.years[0],
+        yeare=args.years[1],
+        freq=args.freq,
+        config=args.config,
+        prefix=args.prefix,
+        families=args.families,
+        compress=args.compress,
+        seed=args.seed
+    )
@@ -0,0 +1,269 @@
+"""
+Times the loading and rendering path of run_plot.py on a set of runs.
+
+The runs are usually written by BENCH/make_runs.py. Every case is repeated
+and the min/median wall times are reported:
+  - load_cold: Run.load_ts for every run, after removing the catalog and cache sidecars
+  - load_warm: Run.load_ts for every run, with the sidecars of the previous case
+  - generate:  Figure.generate (load + render + savefig)
+  - main:      run_plot.main, as called by the command line
+  - rerender:  Dashboard.get twice on the same figure, as the serve mode after a
+               change; the axis limits of both renders must be identical
+  - read_xarray: reads the files of every plot and run with the former xr.open_dataset loop
+  - read_netcdf: reads the same files with read_scalar_timeseries (netCDF4, no sidecar)
+"""
+import os
+import sys
+import io
+import json
+import glob
+import time
+import tempfile
+import statistics
+import contextlib
+import numpy as np
+import xarray as xr
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("MPLBACKEND", "Agg")
+sys.path.insert(0, ROOT)
+
+from valso_data import load_yaml, load_runs, load_plots, load_obss, Catalog, SeriesCache, read_scalar_timeseries
+from run_plot import load_figure, Dashboard, main as run_plot_main
+
+CASES = ("load_cold", "load_warm", "generate", "main", "rerender", "read_xarray", "read_netcdf")
+
+# ===================== CASES =====================
+def clear_sidecars(cdir, runids):
+    """
+    Removes the catalog and series cache sidecars of the runs.
+
+    Args:
+        cdir (str): Base directory of the runs.
+        runids (list): List of run IDs.
+    """
+    for rid in runids:
+        for sidecar in (Catalog.SIDECAR, SeriesCache.SIDECAR):
+            path = os.path.join(cdir, rid, sidecar)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def load_all(figure, runids, plots_cfg, style_cfg, obss_cfg, cdir):
+    """
+    Loads the time series of all the runs needed by a figure (Run.load_ts).
+
+    Args:
+        figure (Figure): Figure configuration.
+        runids (list): List of run IDs.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory of the runs.
+    """
+    selection = figure.selection(plots_cfg, obss_cfg)
+    obss = load_obss(obss_cfg, selection)
+    plots = load_plots(plots_cfg, selection, obss)
+    for run in load_runs(style_cfg, runids, cdir):
+        run.load_ts(plots, strict=not figure.scorecard)
+
+
+def list_series(figure, runids, plots_cfg, style_cfg, obss_cfg, cdir):
+    """
+    Lists the files, variable and time coordinate of every plot and run of a figure.
+
+    Args:
+        figure (Figure): Figure configuration.
+        runids (list): List of run IDs.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory of the runs.
+
+    Returns:
+        list: (files, var, time_name) of every series found.
+    """
+    selection = figure.selection(plots_cfg, obss_cfg)
+    plots = load_plots(plots_cfg, selection, load_obss(obss_cfg, selection))
+    series = []
+    for run in load_runs(style_cfg, runids, cdir):
+        catalog = Catalog(run.dir)
+        for plot in plots:
+            try:
+                names, var, ctime = catalog.resolve(plot.file_pattern, plot.var)
+            except (FileNotFoundError, KeyError):
+                continue
+            series.append(([os.path.join(run.dir, name) for name in names], var, ctime))
+    return series
+
+
+def read_xarray(files, var, time_name):
+    """
+    Reads a scalar time series as run_plot.py did before read_scalar_timeseries
+    (one xr.open_dataset per file, decoded times and values appended one by one).
+
+    Args:
+        files (list): Files to read.
+        var (str): Variable to read.
+        time_name (str): Time coordinate to read.
+
+    Returns:
+        tuple: Times and values of the series.
+    """
+    times = []
+    values = []
+    for f in files:
+        ds = xr.open_dataset(f)
+        for t in ds[time_name].values[:]:
+            times.append(t)
+        for v in ds[var].values[:]:
+            values.append(v.squeeze())
+        ds.close()
+    return times, np.array(values)
+
+
+def read_all(series, reader):
+    """
+    Reads every series with a reader.
+
+    Args:
+        series (list): (files, var, time_name) of every series (see list_series).
+        reader (callable): read_xarray or read_scalar_timeseries.
+    """
+    for files, var, ctime in series:
+        reader(files, var, ctime)
+
+
+def rerender(figure, runids, plots_cfg, style_cfg, obss_cfg, cdir):
+    """
+    Renders a figure twice through a Dashboard and checks that the data are unchanged
+    and the axis limits of both renders are identical.
+
+    Args:
+        figure (Figure): Figure configuration.
+        runids (list): List of run IDs.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory of the runs.
+
+    Raises:
+        ValueError: If the second render has other axis limits than the first.
+    """
+    dashboard = Dashboard(lambda: [(figure, runids, "bench.png")], plots_cfg, style_cfg, obss_cfg, cdir)
+    limits = []
+    for _ in range(2):
+        # drop the rendered bytes, as Dashboard.watch does when a series changed
+        dashboard.cache.clear()
+        dashboard.get("bench.png")
+        plots = dashboard.outs["bench.png"][4]
+        limits.append([(plot.name, plot.ax.get_ylim()) for plot in plots if getattr(plot, "ax", None) is not None])
+    dashboard.watcher.close()
+    if limits[0] != limits[1]:
+        raise ValueError(f"axis limits changed between two renders: {limits[0]} -> {limits[1]}")
+
+
+def timeit(func, repeat, setup=None):
+    """
+    Times a function, stdout being discarded.
+
+    Args:
+        func (callable): Function to time.
+        repeat (int): Number of repetitions.
+        setup (callable): Function called (untimed) before each repetition.
+
+    Returns:
+        list: Wall times in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - t0)
+    return times
+
+
+# ===================== MAIN FUNCTION =====================
+def main(cdir, runids=None, figs_cfg="YML/figs_VALSO.yml", plots_cfg="YML/plots.yml", style_cfg=None, obss_cfg="YML/obs.yml", jobs=1, repeat=3, cases=CASES, out=None):
+    """
+    Runs the benchmark cases and prints the min/median wall times.
+
+    Args:
+        cdir (str): Base directory of the runs.
+        runids (list): List of run IDs (default: every run of the style file).
+        figs_cfg (str): Path to the figs.yml file to render.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file (default: <cdir>/styles.yml).
+        obss_cfg (str): Path to the observation configuration file.
+        jobs (int): Number of worker processes used by generate and main.
+        repeat (int): Number of repetitions of every case.
+        cases (list): Cases to run (see CASES).
+        out (str): Write the timings to this JSON file.
+    """
+    os.chdir(ROOT)
+    cdir = os.path.abspath(cdir)
+    style_cfg = style_cfg or os.path.join(cdir, "styles.yml")
+    runids = runids or list(load_yaml(style_cfg).get("runs", {}))
+    figure = load_figure(figs_cfg)
+    nfile = sum(len(glob.glob(os.path.join(cdir, rid, "*.nc"))) for rid in runids)
+    print(f"🔄 {len(runids)} runs, {nfile} files, figure {figs_cfg}")
+
+    tmp = tempfile.mkdtemp(prefix="valso_bench_")
+    png = os.path.join(tmp, "bench.png")
+    funcs = {
+        "load_cold": (lambda: load_all(figure, runids, plots_cfg, style_cfg, obss_cfg, cdir), lambda: clear_sidecars(cdir, runids)),
+        "load_warm": (lambda: load_all(figure, runids, plots_cfg, style_cfg, obss_cfg, cdir), None),
+        "generate":  (lambda: figure.generate(runids, plots_cfg, style_cfg, obss_cfg, cdir, png, jobs), None),
+        "main":      (lambda: run_plot_main(runids, plots_cfg, [figs_cfg], style_cfg, obss_cfg, cdir, [png], jobs), None),
+        "rerender":  (lambda: rerender(figure, runids, plots_cfg, style_cfg, obss_cfg, cdir), None),
+        "read_xarray": (lambda: read_all(series, read_xarray), None),
+        "read_netcdf": (lambda: read_all(series, read_scalar_timeseries), None),
+    }
+    if {"read_xarray", "read_netcdf"} & set(cases):
+        series = list_series(figure, runids, plots_cfg, style_cfg, obss_cfg, cdir)
+
+    results = {}
+    for case in cases:
+        func, setup = funcs[case]
+        times = timeit(func, repeat, setup)
+        results[case] = {"min": min(times), "median": statistics.median(times), "times": times}
+        print(f"  {case:<11s} min {min(times):8.3f} s   median {statistics.median(times):8.3f} s")
+
+    if out:
+        info = {"dir": cdir, "runs": len(runids), "files": nfile, "figs": figs_cfg, "jobs": jobs, "repeat": repeat, "cases": results}
+        with open(out, "w") as fid:
+            json.dump(info, fid, indent=1)
+        print(f"✅ Saved {out}")
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Time the loading and rendering path of run_plot.py.")
+    parser.add_argument("-dir",    default="./BENCH/RUNS",                       help="Base directory of the runs (see BENCH/make_runs.py).")
+    parser.add_argument("-runid",  default=None, nargs="+",                      help="List of run IDs (default: every run of the style file).")
+    parser.add_argument("-figs",   default="YML/figs_VALSO.yml",                 help="Path to the figs.yml file to render.")
+    parser.add_argument("-plots",  default="YML/plots.yml",                      help="Path to the full plots database.")
+    parser.add_argument("-style",  default=None,                                 help="Path to the style configuration file (default: <dir>/styles.yml).")
+    parser.add_argument("-obs",    default="YML/obs.yml",                        help="Path to the observation configuration file.")
+    parser.add_argument("-jobs",   default=1, type=int,                          help="Number of worker processes used to load the runs.")
+    parser.add_argument("-repeat", default=3, type=int,                          help="Number of repetitions of every case.")
+    parser.add_argument("-cases",  default=list(CASES), nargs="+", choices=CASES, help="Cases to run.")
+    parser.add_argument("-out",    default=None,                                 help="Write the timings to this JSON file.")
+    args = parser.parse_args()
+
+    main(
+        cdir=args.dir,
+        runids=args.runid,
+        figs_cfg=args.figs,
+        plots_cfg=args.plots,
+        style_cfg=args.style,
+        obss_cfg=args.obs,
+        jobs=args.jobs,
+        repeat=args.repeat,
+        cases=args.cases,
+        out=args.out
+    )
@@ -23,6 +23,9 @@ STOPATH=${CCCSCRATCHDIR}/DRAKKAR/
 # sstat command
 JOBSTATcmd="ccc_mpp -u $USER "
 
+# maximal time limit of a job (s) on the queue, used by run_all.bash -b to cap the time limit of the bundles
+BUNDLE_TMAX=86400
+
 #++++++++++++++++++++++++++++++++++++
 #      FUNCTION to submit task
 #++++++++++++++++++++++++++++++++++++
@@ -31,7 +34,7 @@ load_python() {
 conda activate valso
 }
 
-retreive_data() {
+prepare_data() {
    # $1 = $CONFIG ; $2 = $RUNID ; $3 = $FREQ ; $4 = $TAG ; $5 = $GRID
    # prepare run script
    sed -e  "s!<CONFIG>!${1}!g"\
@@ -39,40 +42,67 @@ retreive_data() {
        -e  "s!<FREQ>!${3}!g"  \
        -e  "s!<TAG>!${4}!g"   \
        -e  "s!<GRID>!${5}!g" ${SCRPATH}/get_data.bash > ${WRKPATH}/${1}-${2}/get_data.bash_${1}_${2}_${3}_${4}_${5}
+   echo ${WRKPATH}/${1}-${2}/get_data.bash_${1}_${2}_${3}_${4}_${5}
+}
+
+prepare_mask() {
+   # $1 = $CONFIG ; $2 = $RUNID
+   # prepare run script
+   sed -e  "s!<CONFIG>!${1}!g"\
+       -e  "s!<RUNID>!${2}!g" ${SCRPATH}/mk_msk.bash > ${WRKPATH}/${1}-${2}/mk_msk.bash_${1}_${2}
+   echo ${WRKPATH}/${1}-${2}/mk_msk.bash_${1}_${2}
+}
+
+prepare_tool() {
+   # $1 = TOOL ; $2 = $CONFIG ; $3 = $TAG ; $4 = $RUNID ; $5 = $FREQ
+   # prepare run script
+   sed -e  "s!<CONFIG>!${2}!g"\
+       -e  "s!<RUNID>!${4}!g" \
+       -e  "s!<FREQ>!${5}!g"  \
+       -e  "s!<TOOL>!${1}!g"  \
+       -e  "s!<TAG>!${3}!g"   ${SCRPATH}/${1}.bash > ${WRKPATH}/${2}-${4}/${1}.bash_${2}_${4}_${3}_${5}
+   echo ${WRKPATH}/${2}-${4}/${1}.bash_${2}_${4}_${3}_${5}
+}
+
+retreive_data() {
+   # $1 = $CONFIG ; $2 = $RUNID ; $3 = $FREQ ; $4 = $TAG ; $5 = $GRID
    # run script
-   ccc_msub -r moo_${4}_${5}                                                          \
+   ccc_msub -r moo_${2}_${4}_${5}                                                     \
             -o  ${JOBOUT_PATH}/moo_${3}_${4}_${5}                                     \
             -e  ${JOBOUT_PATH}/moo_${3}_${4}_${5}_err                                 \
             -T 600 -n 1 -A gen6035 -q rome -m store,work,workflash,scratch -E " -D ${EXEPATH} " \
-            ${WRKPATH}/${1}-${2}/get_data.bash_${1}_${2}_${3}_${4}_${5} | awk '{print $4}'
+            $(prepare_data $@) | awk '{print $4}'
 }
 
 build_mask() {
    # $1 = $CONFIG ; $2 = $RUNID
-   # prepare run script
-   sed -e  "s!<CONFIG>!${1}!g"\
-       -e  "s!<RUNID>!${2}!g" ${SCRPATH}/mk_msk.bash > ${WRKPATH}/${1}-${2}/mk_msk.bash_${1}_${2}
    # run script
    ccc_msub -r mk_msk_${1}_${2}                         \
             -o ${JOBOUT_PATH}/mk_msk_${1}_${2}.out      \
             -e ${JOBOUT_PATH}/mk_msk_${1}_${2}.err      \
             -T 600 -n 1 -A gen6035 -q rome -m store,work,workflash,scratch -E " -D ${EXEPATH} " \
-            ${WRKPATH}/${1}-${2}/mk_msk.bash_${1}_${2} | awk '{print $4}'
+            $(prepare_mask $@) | awk '{print $4}'
 }
 
 run_tool() {
    # $1 = TOOL ; $2 = $CONFIG ; $3 = $TAG ; $4 = $RUNID ; $5 = $FREQ ; $6+ = ID
    # global var njob
-   # prepare run script
-   sed -e  "s!<CONFIG>!${2}!g"\
-       -e  "s!<RUNID>!${4}!g" \
-       -e  "s!<FREQ>!${5}!g"  \
-       -e  "s!<TAG>!${3}!g"   ${SCRPATH}/${1}.bash > ${WRKPATH}/${2}-${4}/${1}.bash_${2}_${4}_${3}_${5}
    # run script
    ccc_msub -r SO_${1}_${2}_${3}_${4}                \
             -o ${JOBOUT_PATH}/${1}_${5}_${3}.out     \
             -e ${JOBOUT_PATH}/${1}_${5}_${3}.err     \
             -T 1800 -n 1 -A gen6035 -q rome -m store,work,workflash,scratch -E " -D ${EXEPATH} --dependency=afterany:${@:6} " \
-            ${WRKPATH}/${2}-${4}/${1}.bash_${2}_${4}_${3}_${5} | awk '{print $4}' #> /dev/null 2>&1 &
+            $(prepare_tool ${@:1:5}) | awk '{print $4}' #> /dev/null 2>&1 &
    njob=$((njob+1))
 }
+
+submit_job() {
+   # $1 = job name ; $2 = time limit (s) ; $3 = dependencies (job ids separated by :, can be empty) ; $4 = script ; $5 = log file (without .out/.err)
+   # used by run_all.bash -b to submit the bundles
+   if [[ -n $3 ]]; then DEPENDENCY="--dependency=afterany:$3" ; else DEPENDENCY='' ; fi
+   ccc_msub -r $1                                       \
+            -o ${5}.out                                 \
+            -e ${5}.err                                 \
+            -T $2 -n 1 -A gen6035 -q rome -m store,work,workflash,scratch -E " -D ${EXEPATH} ${DEPENDENCY} " \
+            $4 | awk '{print $4}'
+}
@@ -1,5 +1,15 @@
 #!/bin/bash
 
+# every mk_* job is run again as a child of SCRIPT/ledger.py, which records its status, exit code, duration, peak memory
+# and log in the ledger of the tasks (${LEDGER}, SQLite); without python the job runs as before, unrecorded
+# the tool is set by prepare_tool (TOOL=<TOOL>): a submitted job runs from a copy in the spool of the scheduler
+# (slurm_script), so $0 only gives it for the scripts run directly (run_all.bash -l and -b)
+[[ -z $TOOL || $TOOL == "<TOOL>" ]] && TOOL=$(basename $0 | cut -d. -f1)
+if [[ -n $TAG && $TOOL == mk_* && -n $LEDGER && -z $VALSO_LEDGER ]] && load_python > /dev/null 2>&1 && command -v python > /dev/null ; then
+   export VALSO_LEDGER=1
+   exec python ${SCRPATH}/ledger.py -db ${LEDGER} -run -config ${CONFIG} -runid ${RUNID} -freq ${FREQ} -tool ${TOOL} -tag ${TAG} -errors ${EXEPATH}/ERROR.txt -- bash $0 "$@"
+fi
+
 # create repository
 if [ ! -d $DATPATH ]; then mkdir -p $DATPATH ; fi
 
@@ -15,3 +25,64 @@ if [ ! -L mask.nc     ] ; then echo "mask.nc     is missing; exit"; exit 1 ; fi
 if [ ! -L subbasin.nc ] ; then echo "subbasin.nc is missing; exit"; exit 1 ; fi
 if [ ! -L mskisf.nc   ] ; then echo "mskisf.nc   is missing; exit"; exit 1 ; fi
 if [ ! -L isflst.txt  ] ; then echo "isflst.txt  is missing; exit"; exit 1 ; fi
+
+# the registry PARAM/regions.txt is compiled once per mesh and registry version (SCRIPT/mk_regions.py: regions.txt and regions.npz),
+# then shared by all the jobs of the run
+compile_regions() {
+   REGKEY=$( (readlink -f ${DATPATH}/mesh.nc ; stat -L -c '%s %Y' ${DATPATH}/mesh.nc ; cat ${EXEPATH}/PARAM/regions.txt) | md5sum | cut -c1-16 )
+   if ! grep -q "^# KEY ${REGKEY}$" ${DATPATH}/regions.txt 2> /dev/null ; then
+      load_python
+      python ${SCRPATH}/mk_regions.py -mesh ${DATPATH}/mesh.nc -registry ${EXEPATH}/PARAM/regions.txt -out ${DATPATH}/regions -key ${REGKEY} 1>&2
+   fi
+}
+
+# i/j window of a region of PARAM/regions.txt, same output as cdffindij -w (imin imax jmin jmax)
+get_ijbox() {
+   # $1 = region name
+   compile_regions
+   awk -v name=$1 '$1 == name {print $3, $4, $5, $6}' ${DATPATH}/regions.txt
+}
+
+# version of a tool: its scripts, this file (get_ijbox, compile_regions) and the region registry (same in run_all.bash)
+tool_version() {
+   # $1 = TOOL
+   cat ${SCRPATH}/${1}.* ${SCRPATH}/common.bash ${SCRPATH}/mk_regions.py ${EXEPATH}/PARAM/regions.txt 2> /dev/null | md5sum | cut -c1-16
+}
+
+# manifest of the job (inputs, outputs and version of the tool), read by run_all.bash to skip the jobs already up to date
+# written at exit if the job succeeded and reported no error: the inputs are the NEMO files of the job and the mesh,
+# the outputs are the files matching the patterns of the tool (OUTPUTS, set by each mk_* script) written during the job
+# (newer than the start stamp), so the jobs of the same tag running at the same time do not claim each other's files;
+# the diagnostics computed by the job (DIAGS, mk_reduce) are recorded too
+write_manifest() {
+   STATUS=$?
+   MANIFEST=${DATPATH}/MANIFEST/${TOOL}_${FREQ}_${TAG}.txt
+   if [[ $STATUS -eq 0 ]] && ! tail -n +$((MANIFEST_NERR+1)) ${EXEPATH}/ERROR.txt 2> /dev/null | grep "/${RUNID}/" | grep -q "${TOOL}.bash.*${TAG}" ; then
+      INPUTS=''
+      for MFILE in $FILE $FILEU $FILEV $FILET $FILES ${DATPATH}/mesh.nc ; do
+         if [ -f $MFILE ]; then INPUTS="$INPUTS $(basename $MFILE)" ; fi
+      done
+      (
+      echo "# VERSION $(tool_version ${TOOL})"
+      if [[ -n $DIAGS ]]; then echo "# DIAGS" $DIAGS ; fi
+      for MFILE in $FILE $FILEU $FILEV $FILET $FILES ${DATPATH}/mesh.nc ; do
+         if [ -f $MFILE ]; then echo "in $(readlink -f $MFILE) $(stat -L -c '%s %Y' $MFILE)" ; fi
+      done | sort -u
+      set -f ; PATTERNS=($OUTPUTS) ; set +f
+      for PATTERN in ${PATTERNS[@]} ; do
+         for MFILE in ${DATPATH%/}/$PATTERN ; do
+            if [[ -f $MFILE && $MFILE -nt ${MANIFEST_STAMP} && " $INPUTS " != *" $(basename $MFILE) "* ]]; then echo "out $MFILE $(stat -L -c '%s %Y' $MFILE)" ; fi
+         done
+      done | sort -u
+      ) > ${MANIFEST}.$$ && mv ${MANIFEST}.$$ ${MANIFEST}
+   fi
+   rm -f ${MANIFEST_STAMP}
+}
+
+if [[ -n $TAG && $TOOL == mk_* ]]; then
+   mkdir -p ${DATPATH}/MANIFEST
+   MANIFEST_STAMP=${DATPATH}/MANIFEST/.start_${TOOL}_${FREQ}_${TAG}_$$
+   touch ${MANIFEST_STAMP}
+   MANIFEST_NERR=$(cat ${EXEPATH}/ERROR.txt 2> /dev/null | wc -l)
+   trap write_manifest EXIT
+fi
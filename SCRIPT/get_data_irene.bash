@@ -29,18 +29,52 @@ elif [ $FREQ == '30y' ]; then echo '';
 else echo '$FREQ frequency is not supported'; exit 1
 fi
 
+# staging of one file: hard link if STOPATH and WRKPATH are on the same file system, else copy (reflink if supported)
+# a file already there is kept if its size is the one of the source recorded in its staging manifest (MANIFEST/stage_FILE.txt)
+# one line per file is added to ${STAGELOG}: FILE MODE BYTES (MODE is present, link, copy or failed)
+stage_file() {
+   SRC=$(readlink -f $1) ; FILE=$(basename $1)
+   KEY="$SRC $(stat -c '%s %Y' $SRC)" ; SIZE=$(stat -c %s $SRC)
+   STAMP=MANIFEST/stage_${FILE}.txt
+   if [ -f $FILE ] && [[ $(stat -L -c %s $FILE) == $SIZE ]] && [[ ! -f $STAMP || $(cat $STAMP) == $KEY ]]; then
+      MODE=present
+   else
+      echo "staging file ${SRC} in ${DATPATH} ..."
+      rm -f $FILE
+      if ln $SRC $FILE 2> /dev/null ; then
+         MODE=link
+      elif cp --reflink=auto $SRC ${FILE}.tmp$$ && mv ${FILE}.tmp$$ $FILE ; then
+         MODE=copy
+      else
+         rm -f ${FILE}.tmp$$ ; echo "$FILE failed 0" >> ${STAGELOG} ; return 1
+      fi
+   fi
+   echo "$KEY" > $STAMP
+   echo "$FILE $MODE $SIZE" >> ${STAGELOG}
+}
+
+mkdir -p MANIFEST
+STAGELOG=MANIFEST/stage_${FREQ}_${TAG}_${GRID}.$$
+> ${STAGELOG}
+
+# up to ${NSTAGE} files staged at once
 FILE_LST=`ls ${SIMPATH}/${NEMOFILE}`;
+T0=$(date +%s.%N)
 
 for MFILE in `echo ${FILE_LST}`; do
-   FILE=`basename $MFILE`
-   if [ -f $FILE ]; then 
-      echo 'File $FILE already there, test integrity :'
-      TIME=`ncdump -h $FILE | grep UNLIMITED | sed -e 's/(//' | awk '{print $6}'`
-      if [[ $TIME -eq 0 ]]; then echo " $FILE is corrupted "; rm $FILE; else echo 'File seems OK'; fi
-   fi
-   if [ ! -f $FILE ]; then
-      echo "downloading file ${MFILE} in ${DATPATH} ..."
-      cp $MFILE .
-   fi
+   while [[ $(jobs -rp | wc -l) -ge ${NSTAGE:-4} ]]; do wait -n; done
+   stage_file $MFILE &
 done
+wait
+
+# report
+awk -v time=$(awk -v t0=$T0 -v t1=$(date +%s.%N) 'BEGIN {print t1 - t0}') '
+{ n[$2]++ ; b[$2] += $3 }
+END {
+   printf "staged %d files in %.1f s: %d linked (%.2f GB), %d copied (%.2f GB, %.0f MB/s), %d already there, %d failed\n",
+          NR, time, n["link"], b["link"] / 1e9, n["copy"], b["copy"] / 1e9, b["copy"] / 1e6 / (time > 0 ? time : 1e-3), n["present"], n["failed"]
+}' ${STAGELOG}
+NFAIL=$(grep -c ' failed ' ${STAGELOG})
+rm -f ${STAGELOG}
+if [[ $NFAIL -ne 0 ]]; then echo 'E R R O R during the staging'; exit 1; fi
 echo 'done'
@@ -0,0 +1,214 @@
+"""
+Ledger of the mk_* tasks (SQLite, ${LEDGER} set in param.bash).
+
+Every mk_* job is run through this script (see the top of SCRIPT/common.bash;
+the tool is the TOOL=<TOOL> line of the job script, filled by prepare_tool):
+the task (CONFIG, RUNID, FREQ, tool, TAG) is recorded as RUNNING, the job script
+is run as a child and, once it is finished, its status, exit code, duration,
+peak memory (largest resident set of the job and its commands) and log file are
+recorded. A job that exits 0 but added an error for its RUNID, tool and tag
+to ERROR.txt is FAILED, as for the manifests. A job killed before it could be
+recorded (time limit, node failure) stays RUNNING.
+
+The ledger is shared by all the jobs running at once: SQLite serialises the
+writes (busy timeout of 5 min). A job is never failed because of the ledger,
+it only prints a warning if the ledger cannot be written.
+
+run_all.bash -r reads the completed tasks (-completed) to submit only the
+failed or missing ones, and prints the state of the RUNIDs (-summary).
+"""
+import os
+import sys
+import time
+import signal
+import socket
+import sqlite3
+import subprocess
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    config   TEXT,
+    runid    TEXT,
+    freq     TEXT,
+    tool     TEXT,
+    tag      TEXT,
+    status   TEXT,
+    exitcode INTEGER,
+    started  REAL,
+    ended    REAL,
+    duration REAL,
+    maxrss   INTEGER,
+    log      TEXT,
+    host     TEXT,
+    attempts INTEGER DEFAULT 0,
+    PRIMARY KEY (config, runid, freq, tool, tag)
+)
+"""
+KEY = "config = ? AND runid = ? AND freq = ? AND tool = ? AND tag = ?"
+
+
+# ===================== LEDGER =====================
+def connect(path):
+    """
+    Opens the ledger, created if needed.
+
+    Args:
+        path (str): SQLite file.
+
+    Returns:
+        sqlite3.Connection: The ledger (autocommit off, busy timeout of 5 min).
+    """
+    db = sqlite3.connect(path, timeout=300)
+    db.execute(SCHEMA)
+    db.commit()
+    return db
+
+
+def start_task(db, key):
+    """
+    Records a task as RUNNING (one more attempt).
+
+    Args:
+        db (sqlite3.Connection): Ledger.
+        key (tuple): (config, runid, freq, tool, tag).
+    """
+    with db:
+        db.execute("INSERT OR IGNORE INTO tasks (config, runid, freq, tool, tag) VALUES (?, ?, ?, ?, ?)", key)
+        db.execute(f"UPDATE tasks SET status = 'RUNNING', exitcode = NULL, started = ?, ended = NULL, duration = NULL, "
+                   f"maxrss = NULL, host = ?, attempts = attempts + 1 WHERE {KEY}", (time.time(), socket.gethostname(), *key))
+
+
+def end_task(db, key, status, exitcode, started, maxrss, log):
+    """
+    Records the end of a task.
+
+    Args:
+        db (sqlite3.Connection): Ledger.
+        key (tuple): (config, runid, freq, tool, tag).
+        status (str): COMPLETED or FAILED.
+        exitcode (int): Exit code of the job (128 + signal if it was killed).
+        started (float): Start time (epoch).
+        maxrss (int): Peak memory in kB.
+        log (str): Standard output of the job.
+    """
+    ended = time.time()
+    with db:
+        db.execute(f"UPDATE tasks SET status = ?, exitcode = ?, ended = ?, duration = ?, maxrss = ?, log = ? WHERE {KEY}",
+                   (status, exitcode, ended, ended - started, maxrss, log, *key))
+
+
+def count_errors(path, runid, tool, tag):
+    """Returns the number of lines of ERROR.txt for this RUNID, tool and tag (see the E R R O R lines of the mk_* scripts)."""
+    try:
+        with open(path) as fid:
+            return sum(f"{tool}.bash" in line and f"/{runid}/" in line and tag in line for line in fid)
+    except OSError:
+        return 0
+
+
+# ===================== WRAPPER =====================
+def run(dbpath, key, cmd, errors):
+    """
+    Runs a job script and records it in the ledger.
+
+    Args:
+        dbpath (str): SQLite file.
+        key (tuple): (config, runid, freq, tool, tag).
+        cmd (list): Command running the job script.
+        errors (str): ERROR.txt of the campaign.
+
+    Returns:
+        int: Exit code of the job.
+    """
+    runid, tool, tag = key[1], key[3], key[4]
+    try:
+        log = os.readlink("/proc/self/fd/1")
+    except OSError:
+        log = ""
+    nerr = count_errors(errors, runid, tool, tag)
+
+    db = None
+    try:
+        db = connect(dbpath)
+        start_task(db, key)
+    except sqlite3.Error as err:
+        print(f"⚠️ Warning: ledger {dbpath} not written ({err})")
+        db = None
+
+    started = time.time()
+    proc = subprocess.Popen(cmd)
+    # the job is stopped (time limit, scancel) through the ledger: forward the signal and record the end
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGUSR1):
+        signal.signal(sig, lambda signum, frame: proc.send_signal(signum))
+    # wait4 gives the peak memory of the job script and of all the commands it ran
+    _, status, usage = os.wait4(proc.pid, 0)
+    exitcode = 128 + os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+    proc.returncode = exitcode
+
+    state = "COMPLETED" if exitcode == 0 and count_errors(errors, runid, tool, tag) == nerr else "FAILED"
+    if db is not None:
+        try:
+            end_task(db, key, state, exitcode, started, usage.ru_maxrss, log)
+        except sqlite3.Error as err:
+            print(f"⚠️ Warning: ledger {dbpath} not written ({err})")
+        db.close()
+    return exitcode
+
+
+# ===================== QUERIES =====================
+def completed(db, config, runid):
+    """
+    Prints the completed tasks of a RUNID, one per line: TOOL TAG FREQ (read by run_all.bash -r).
+    """
+    rows = db.execute("SELECT tool, tag, freq FROM tasks WHERE config = ? AND runid = ? AND status = 'COMPLETED'", (config, runid))
+    for tool, tag, freq in rows:
+        print(tool, tag, freq)
+
+
+def summary(db, config, runids):
+    """
+    Prints, per RUNID and tool, the number of tasks by status, their total and
+    longest duration and peak memory, then the tasks not completed with their log.
+    """
+    marks = ",".join("?" * len(runids))
+    rows = db.execute(
+        "SELECT runid, tool, "
+        "SUM(status = 'COMPLETED'), SUM(status = 'FAILED'), SUM(status = 'RUNNING'), "
+        "SUM(duration), MAX(duration), MAX(maxrss) "
+        f"FROM tasks WHERE config = ? AND runid IN ({marks}) GROUP BY runid, tool ORDER BY runid, tool",
+        (config, *runids)).fetchall()
+    print(f"{'RUNID':<12s} {'TOOL':<10s} {'DONE':>6s} {'FAILED':>6s} {'RUNNING':>7s} {'TIME (h)':>9s} {'MAX (s)':>8s} {'MEM (MB)':>9s}")
+    for runid, tool, ndone, nfail, nrun, total, longest, mem in rows:
+        print(f"{runid:<12s} {tool:<10s} {ndone:6d} {nfail:6d} {nrun:7d} {(total or 0) / 3600:9.2f} {longest or 0:8.0f} {(mem or 0) / 1024:9.0f}")
+    rows = db.execute(
+        f"SELECT runid, tool, tag, freq, status, exitcode, log FROM tasks WHERE config = ? AND runid IN ({marks}) "
+        "AND status != 'COMPLETED' ORDER BY runid, tool, tag", (config, *runids))
+    for runid, tool, tag, freq, status, exitcode, log in rows:
+        print(f"❌ {runid} {tool} {freq} {tag} {status} (exit {exitcode}, see {log})")
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Ledger of the mk_* tasks.")
+    parser.add_argument("-db",        required=True,                 help="SQLite file of the ledger.")
+    parser.add_argument("-run",       action="store_true",           help="Run the command after -- and record it.")
+    parser.add_argument("-completed", action="store_true",           help="Print the completed tasks of -runid (TOOL TAG FREQ).")
+    parser.add_argument("-summary",   action="store_true",           help="Print the state of the tasks of the -runid list.")
+    parser.add_argument("-config",    required=True,                 help="Configuration.")
+    parser.add_argument("-runid",     nargs="+", default=[],         help="RUNID (list for -summary).")
+    parser.add_argument("-freq",      default="",                    help="Output frequency of the task (-run).")
+    parser.add_argument("-tool",      default="",                    help="Tool of the task (-run).")
+    parser.add_argument("-tag",       default="",                    help="Tag of the task (-run).")
+    parser.add_argument("-errors",    default="ERROR.txt",           help="ERROR.txt of the campaign (-run).")
+    parser.add_argument("cmd",        nargs=argparse.REMAINDER,      help="-- command running the job script (-run).")
+    args = parser.parse_args()
+
+    if args.run:
+        cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        sys.exit(run(args.db, (args.config, args.runid[0], args.freq, args.tool, args.tag), cmd, args.errors))
+    with connect(args.db) as db:
+        if args.completed:
+            completed(db, args.config, args.runid[0])
+        if args.summary:
+            summary(db, args.config, args.runid)
@@ -9,6 +9,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 TBOTvar='|sosbt|sbt|votemper_bot|'
 SBOTvar='|sosbs|sbs|vosaline_bot|'
@@ -31,6 +32,8 @@ FILE=`get_nemofilename`
 if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./mk_bot.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_bot_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
 
 FILEOUT=${CONFIG}-${RUNID}_${FREQ}_${TAG}_bottom-${GRID}.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash): bottom fields and their means by region
+OUTPUTS="$FILEOUT *_$FILEOUT"
 if [[ $BOT == 1 ]]; then
    # make bot
    $CDFPATH/cdfbottom -f $FILE -nc4 -o tmp_$FILEOUT
@@ -48,27 +51,27 @@ fi
 
 set -x
 # Amundsen avg (CDW)
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w -109.640 -102.230  -75.800  -71.660 | tail -2 | head -1)
+ijbox=$(get_ijbox AMU)
 $CDFPATH/cdfmean -f $FILEOUT -v $TBOTvar -p T -w ${ijbox} 0 0 -o AMU_thetao_$FILEOUT 
 if [ $? -ne 0 ] ; then write_err AMU ; fi
 
 # WRoss avg (bottom water)
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w 157.100  173.333  -78.130  -74.040 | tail -2 | head -1)
+ijbox=$(get_ijbox WROSS)
 $CDFPATH/cdfmean -f $FILEOUT -v $SBOTvar -p T -w ${ijbox} 0 0 -o WROSS_so_$FILEOUT 
 if [ $? -ne 0 ] ; then write_err WROS ; fi
 
 # ERoss avg (CDW)
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w -176.790 -157.820  -78.870  -77.520 | tail -2 | head -1)
+ijbox=$(get_ijbox EROSS)
 $CDFPATH/cdfmean -f $FILEOUT -v $TBOTvar -p T -w ${ijbox} 0 0 -o EROSS_thetao_$FILEOUT 
 if [ $? -ne 0 ] ; then write_err EROSS ; fi
 
 # Weddell Avg (bottom water)
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w -65.130  -53.020  -75.950  -72.340 | tail -2 | head -1)
+ijbox=$(get_ijbox WWED)
 $CDFPATH/cdfmean -f $FILEOUT -v $SBOTvar  -p T -w ${ijbox} 0 0 -o WWED_so_$FILEOUT 
 if [ $? -ne 0 ] ; then write_err WWED ; fi
 
 # EWeddell Avg (CDW)
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w -45.647  -32.253  -78.632  -76.899 | tail -2 | head -1)
+ijbox=$(get_ijbox EWED)
 $CDFPATH/cdfmean -f $FILEOUT -v $TBOTvar  -p T -w ${ijbox} 0 0 -o EWED_thetao_$FILEOUT
 if [ $? -ne 0 ] ; then write_err EWED ; fi
 
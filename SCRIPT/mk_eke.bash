@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -28,6 +29,8 @@ if [ ! -f $FILET ] ; then echo "$FILET is missing; exit"; echo "E R R O R in : .
 
 # make eke
 FILEOUT=${CONFIG}-${RUNID}_${FREQ}_${TAG}_eke.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="$FILEOUT"
 $CDFPATH/cdfeke -u $FILEU -u2 $FILEU -v $FILEV -v2 $FILEV -t $FILET -nc4 -mke -o tmp_$FILEOUT
 
 # mv output file
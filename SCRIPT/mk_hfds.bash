@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -24,6 +25,8 @@ if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./m
 
 # make mxl
 FILEOUT=GLO_hfds_${CONFIG}-${RUNID}_${FREQ}_${TAG}_grid-${GRID}.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="$FILEOUT"
 set -x
 pwd
 $CDFPATH/cdfmean -f $FILE -v '|sohefldo|hfds|' -surf -p T -o $FILEOUT 
@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 VAR='|berg_melt|iceberg|'
 
@@ -25,6 +26,8 @@ FILE=`get_nemofilename`
 if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./mk_icb.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_icb_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
 
 FILEOUT=${CONFIG}-${RUNID}_${FREQ}_${TAG}_icb-${GRID}.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="SH_$FILEOUT NH_$FILEOUT"
 set -x
 # SH
 $CDFPATH/cdfmean -f $FILE -v $VAR -p T -surf -o SH_$FILEOUT -B mask_bassin_SH.nc tmask
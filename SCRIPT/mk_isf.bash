@@ -11,6 +11,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 VAR='|fwfisf|sowflisf_cav|iceshelf|'
 
@@ -32,6 +33,8 @@ if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./m
 
 # compute melt
 FILEOUT=ISF_ALL_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="$FILEOUT"
 $CDFPATH/cdfisf_diags -f $FILE -v $VAR -mskf mskisf.nc -mskv mask_isf -l isflst.txt -o $FILEOUT
 if [[ $? -ne 0 ]]; then write_err ; fi
 #
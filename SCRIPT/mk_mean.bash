@@ -7,7 +7,7 @@ write_err() {
 }
 
 compute_means_obs() {
-   IJBOX=$($CDFPATH/cdffindij -c mesh.nc -p T -w $LLBOX | tail -2 | head -1)
+   IJBOX=$(get_ijbox $ZONE)
    # compute profile T
    FILEOUT=${ZONE}_${PRET}_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc
    $CDFPATH/cdfmean -f $FILE -v $VART -p T -o $FILEOUT -w $IJBOX 0 0
@@ -20,7 +20,7 @@ compute_means_obs() {
 
 
 compute_means() {
-   IJBOX=$($CDFPATH/cdffindij -c mesh.nc -p T -w $LLBOX | tail -2 | head -1)
+   IJBOX=$(get_ijbox $ZONE)
    # compute profile T
    FILEOUT=${ZONE}_${PRET}_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc
    $CDFPATH/cdfmean -f $FILE -v $VART -p T -o $FILEOUT ${VVL} -w $IJBOX 0 0
@@ -36,8 +36,10 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
-if [[ $# -lt 5 ]] ; then lOBS=0; fi
+# observations: 5th argument (sbatch) or OBSTS tag (job queued by run_all.bash -b or -l)
+if [[ $# -lt 5 && $TAG != OBSTS ]] ; then lOBS=0; else lOBS=1; fi
 
 # load path and mask
 . param.bash
@@ -51,7 +53,7 @@ if [[ $# -lt 5 ]] ; then lOBS=0; fi
 cd $DATPATH/
 
 if [[ lOBS -eq 1 ]]; then
-    . PARAM/param_obs.bash
+    . ${EXEPATH}/PARAM/param_obs.bash
     FILE=${OBSTS_DIR}/${OBSTS_FILE}
 else  
     GRID=$GRIDT
@@ -72,42 +74,34 @@ else
 fi
 
 PRET='Tprof'    ; PRES='Sprof' 
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash): T and S profiles of every zone
+OUTPUTS="*_${PRET}_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc *_${PRES}_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc"
 ZONE='AMUSill'
-LLBOX='-106.972 -101.992  -72.189  -70.970'
 $MEAN_SCRIPT
 
 ZONE='GETZSill'
-LLBOX='-119.460 -117.478  -72.514  -71.841'
 $MEAN_SCRIPT
 
 ZONE='AMUopen'
-LLBOX='-130 -86 -70 -65'
 $MEAN_SCRIPT
 
 ZONE='ROSSgyre'
-LLBOX='-168.500 -135.750 -72.650 -61.600'
 $MEAN_SCRIPT
 
 ZONE='WEDgyre'
-LLBOX='-20.0 20.0 -66.500 -60.400'
 $MEAN_SCRIPT
 
 ZONE='WROSS'
-LLBOX='157.100  173.333  -78.130  -74.040'
 $MEAN_SCRIPT
 
 ZONE='WWED'
-LLBOX='-65.130  -53.020  -75.950  -72.340'
 $MEAN_SCRIPT
 
 ZONE='EROSS'
-LLBOX='-176.790 -157.820  -78.870  -77.520'
 $MEAN_SCRIPT
 
 ZONE='EWED'
-LLBOX='-45.647  -32.253  -78.632  -76.899'
 $MEAN_SCRIPT
 
 ZONE='AMU'
-LLBOX='-109.640 -102.230  -75.800  -71.660'
 $MEAN_SCRIPT
@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -23,6 +24,8 @@ if [ ! -f $FILEV ] ; then echo "$FILEV is missing; exit"; echo "E R R O R in : .
 
 # make mht
 FILEOUT=${CONFIG}-${RUNID}_${FREQ}_${TAG}_mht.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="$FILEOUT ${CONFIG}-${RUNID}_${FREQ}_${TAG}_mht_265.nc"
 set -x
 $CDFPATH/cdfmhst -vt $FILEV ${VVL} -o tmp_$FILEOUT
 
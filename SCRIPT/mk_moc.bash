@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -29,6 +30,8 @@ if [ ! -f $FILES ] ; then echo "$FILES is missing; exit"; echo "E R R O R in : .
 
 # make moc
 FILEOUT=${CONFIG}-${RUNID}_${FREQ}_${TAG}_moc.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="rapid_$FILEOUT"
 set -x
 $CDFPATH/cdfmoc -v $FILEV -u $FILEU -t $FILET -s $FILES -rapid ${VVL} -o tmp_$FILEOUT
 
@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 MXLvar='|somxzint1|sokaraml|somxl010|mldr0_1|'
 
@@ -25,9 +26,11 @@ FILE=`get_nemofilename`
 if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./mk_mxl.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_mxl_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
 
 FILEOUT=WMXL_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash; the mean is kept as tmp_$FILEOUT)
+OUTPUTS="*$FILEOUT"
 
 # make mxl
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w -31.250   37.500  -66.500  -60.400 | tail -2 | head -1)
+ijbox=$(get_ijbox WG)
 $CDFPATH/cdfmean -f $FILE -v $MXLvar -p T -w ${ijbox} 0 0 -o tmp_$FILEOUT
 
 # mv output file
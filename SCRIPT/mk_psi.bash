@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -26,6 +27,8 @@ if [ ! -f $FILEU ] ; then echo "$FILEU is missing; exit"; echo "E R R O R in : .
 
 # make psi
 FILEOUT=${CONFIG}-${RUNID}_${FREQ}_${TAG}_psi.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="$FILEOUT WG_$FILEOUT RG_$FILEOUT"
 $CDFPATH/cdfpsi -u $FILEU -v $FILEV ${VVL} -nc4 -ref 1 1 -o tmp_$FILEOUT
 
 # mv output file
@@ -36,11 +39,11 @@ else
 fi
 
 # WG max
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w -31.250 37.500 -66.500 -60.400 | tail -2 | head -1)
+ijbox=$(get_ijbox WG)
 $CDFPATH/cdfmean -f $FILEOUT -v sobarstf -p T -w ${ijbox} 0 0 -o WG_$FILEOUT
 if [ $? -ne 0 ] ; then echo "error when running cdfmean (WG)"; echo "E R R O R in : ./mk_psi.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_psi_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; fi
 
 # RG max
-ijbox=$($CDFPATH/cdffindij -c mesh.nc -p T -w -168.500 -135.750 -72.650 -61.600 | tail -2 | head -1)
+ijbox=$(get_ijbox RG)
 $CDFPATH/cdfmean -f $FILEOUT -v sobarstf -p T -w ${ijbox} 0 0 -o RG_$FILEOUT
 if [ $? -ne 0 ] ; then echo "error when running cdfmean (RG)"; echo "E R R O R in : ./mk_psi.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_psi_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; fi
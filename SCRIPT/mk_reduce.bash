@@ -0,0 +1,50 @@
+#!/bin/bash
+
+# inputs
+CONFIG=<CONFIG>
+RUNID=<RUNID>
+TAG=<TAG>
+FREQ=<FREQ>
+TOOL=<TOOL>
+
+# load path and mask
+. param.bash
+
+# load config param
+. PARAM/param_${CONFIG}.bash
+
+# make links
+. ${SCRPATH}/common.bash
+
+cd $DATPATH/
+
+# check presence of input file
+GRID=$GRIDT
+FILE=`get_nemofilename`
+if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./mk_reduce.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_reduce_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
+
+# diagnostics done in the same pass (outputs of mk_bot, mk_sst and mk_mean)
+DIAGS=''
+[[ $runBOT  == 1 ]] && DIAGS="$DIAGS bot"
+if [[ $runSST == 1 ]]; then
+   if [[ ${CONFIG} == "eANT025.L121" ]]; then DIAGS="$DIAGS sst_eANT" ; else DIAGS="$DIAGS sst" ; fi
+fi
+[[ $runMEAN == 1 ]] && DIAGS="$DIAGS mean"
+
+# outputs of the diagnostics (file patterns, see write_manifest in SCRIPT/common.bash, same names as mk_bot, mk_sst and mk_mean)
+OUTPUTS=''
+[[ " $DIAGS " == *" bot "*  ]] && OUTPUTS="$OUTPUTS *_${CONFIG}-${RUNID}_${FREQ}_${TAG}_bottom-${GRID}.nc"
+[[ " $DIAGS " == *" sst"*   ]] && OUTPUTS="$OUTPUTS *_sst_${CONFIG}-${RUNID}_${FREQ}_${TAG}_grid-${GRID}.nc"
+[[ " $DIAGS " == *" mean "* ]] && OUTPUTS="$OUTPUTS *_Tprof_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc *_Sprof_${CONFIG}-${RUNID}_${FREQ}_${TAG}_${GRID}.nc"
+
+# i/j windows of the regions
+compile_regions
+
+# reduce
+load_python
+set -x
+python ${SCRPATH}/mk_reduce.py -f $FILE -mesh mesh.nc -regions regions.npz -diags $DIAGS ${VVL} \
+       -config $CONFIG -runid $RUNID -freq $FREQ -tag $TAG -grid $GRID
+if [[ $? -ne 0 ]]; then
+   echo "error when running mk_reduce.py; exit"; echo "E R R O R in : ./mk_reduce.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_reduce_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1
+fi
@@ -0,0 +1,289 @@
+"""
+Fused reducer of the gridT diagnostics (mk_mean, mk_bot and mk_sst).
+
+cdfmean reads the whole gridT file once per region and variable (more than 40
+passes per year for mk_mean, mk_bot and mk_sst). Here every variable is read
+once, in chunks of levels (one time record at a time), and all the regions
+using it are reduced from the same chunk:
+  - regions are the i/j windows of PARAM/regions.txt compiled by mk_regions.py
+    (regions.npz) or the shelf masks (msk_*_shelf.nc) built by mk_msk.bash
+  - 3D fields are weighted by e1t*e2t*e3t*tmask (e3t read from the file if vvl,
+    e3t_0 from the mesh otherwise), 2D fields by e1t*e2t*tmask(surface)
+  - bottom fields are read from the file if present (BOT=0), else taken at the
+    deepest wet level of the 3D field (as cdfbottom does, BOT=1)
+The outputs have the file and variable names written by cdfmean (mean_<var>,
+mean_3D<var>, max_<var>, sum_<var>, with a _tmask suffix for the shelf masks),
+so plots.yml reads them unchanged.
+
+mk_mxl is not fused: it is one cdfmean of a 2D field of the monthly September
+file (TAG09, 1m), not of the gridT file reduced here, so it saves no pass.
+"""
+import os
+import sys
+import numpy as np
+import netCDF4 as nc
+
+# ===================== REDUCTIONS =====================
+TVAR = "votemper|t_an|thetao"
+SVAR = "vosaline|s_an|so"
+TBOT = "sosbt|sbt|votemper_bot"
+SBOT = "sosbs|sbs|vosaline_bot"
+E3T = "e3t|thkcello"
+
+PROFILES = ["AMUSill", "GETZSill", "AMUopen", "ROSSgyre", "WEDgyre", "WROSS", "WWED", "EROSS", "EWED", "AMU"]
+SHELVES = ["FRIS", "ROSS", "AMUS", "GETZ", "BELING", "WPEN"]
+BOTTOM = "{CONFIG}-{RUNID}_{FREQ}_{TAG}_bottom-{GRID}.nc"
+
+# OUT: output file, VAR: variable(s) reduced, FROM: 3D variable(s) the bottom field is taken from if VAR is not in the file,
+# FIELD: 3D or 2D, REGION: region of PARAM/regions.txt, BAND: whole j band of the region, MASK: shelf mask, LEVELS: 1-based levels
+REDUCTIONS = {
+    "mean": [{"OUT": f"{zone}_{prof}_{{CONFIG}}-{{RUNID}}_{{FREQ}}_{{TAG}}_{{GRID}}.nc", "VAR": var, "FIELD": "3D", "REGION": zone}
+             for zone in PROFILES for prof, var in (("Tprof", TVAR), ("Sprof", SVAR))],
+    "bot":  [{"OUT": f"{zone}_{name}_{BOTTOM}", "VAR": var, "FROM": src, "FIELD": "2D", "REGION": zone}
+             for zone, name, var, src in (("AMU", "thetao", TBOT, TVAR), ("WROSS", "so", SBOT, SVAR), ("EROSS", "thetao", TBOT, TVAR),
+                                          ("WWED", "so", SBOT, SVAR), ("EWED", "thetao", TBOT, TVAR))]
+          + [{"OUT": f"{area}_{name}_{BOTTOM}", "VAR": var, "FROM": src, "FIELD": "2D", "MASK": f"msk_{area}_shelf.nc"}
+             for area in SHELVES for name, var, src in (("thetao", TBOT, TVAR), ("so", SBOT, SVAR))],
+    "sst":  [{"OUT": "SO_sst_{CONFIG}-{RUNID}_{FREQ}_{TAG}_grid-{GRID}.nc", "VAR": TVAR, "FIELD": "3D", "REGION": "SO", "BAND": True, "LEVELS": (1, 1)},
+             {"OUT": "NWC_sst_{CONFIG}-{RUNID}_{FREQ}_{TAG}_grid-{GRID}.nc", "VAR": TVAR, "FIELD": "3D", "REGION": "NWC", "LEVELS": (1, 1)}],
+    "sst_eANT": [{"OUT": "SO_sst_{CONFIG}-{RUNID}_{FREQ}_{TAG}_grid-{GRID}.nc", "VAR": TVAR, "FIELD": "3D", "REGION": "SO_eANT", "BAND": True, "LEVELS": (1, 1)}],
+}
+
+
+def find_var(ds, names):
+    """
+    Returns the first of the names (cdftools style: a|b|c) found in a dataset, None if none is.
+    """
+    for name in names.strip("|").split("|"):
+        if name in ds.variables:
+            return name
+    return None
+
+
+# ===================== TARGET =====================
+class Target:
+    """
+    One reduction (output file) and its running sums.
+
+    Attributes:
+        spec (dict): Entry of REDUCTIONS.
+        var (str): Variable read from the file.
+        name (str): Variable name in the output (var, or the first name of VAR for a bottom field).
+        jsl, isl (slice): Window of the region in the band read from the file.
+        sel (np.ndarray): Mask of the region in its window (shelf mask or None).
+        klev (slice): Levels reduced (3D fields).
+    """
+    def __init__(self, spec, var, name, jsl, isl, sel, klev, nt):
+        self.spec = spec
+        self.var = var
+        self.name = name
+        self.jsl, self.isl, self.sel, self.klev = jsl, isl, sel, klev
+        nk = klev.stop - klev.start if spec["FIELD"] == "3D" else 1
+        self.num = np.zeros((nt, nk))
+        self.den = np.zeros((nt, nk))
+        self.vmax = np.full((nt, nk), -np.inf)
+
+    def add(self, t, k0, values, weights):
+        """
+        Adds a chunk of levels (k0 is the first level of the chunk, 2D fields are one level chunks).
+        """
+        nk = values.shape[0]
+        ka, kb = max(k0, self.klev.start), min(k0 + nk, self.klev.stop)
+        for k in range(ka, kb):
+            v = values[k - k0, self.jsl, self.isl]
+            w = weights[k - k0, self.jsl, self.isl]
+            if self.sel is not None:
+                w = w * self.sel
+            kl = k - self.klev.start
+            self.num[t, kl] += np.sum(v * w)
+            self.den[t, kl] += np.sum(w)
+            if np.any(w > 0):
+                self.vmax[t, kl] = max(self.vmax[t, kl], np.max(v[w > 0]))
+
+    def write(self, out, ds, time_name, depth, fill=-9999.):
+        """
+        Writes the means, maxima and sums (cdfmean names) with the time axis of the input file.
+        """
+        suffix = "_tmask" if "MASK" in self.spec else ""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(self.den > 0, self.num / self.den, fill)
+            mean3d = np.where(self.den.sum(1) > 0, self.num.sum(1) / self.den.sum(1), fill)
+        vmax = np.where(np.isfinite(self.vmax), self.vmax, fill)
+
+        tmp = f"{out}.{os.getpid()}"
+        with nc.Dataset(tmp, "w") as dso:
+            tin = ds.variables[time_name]
+            dso.createDimension("time_counter", None)
+            tout = dso.createVariable("time_counter", "f8", ("time_counter",))
+            tout.setncatts({k: tin.getncattr(k) for k in tin.ncattrs() if k != "_FillValue"})
+            tout[:] = tin[:]
+            if self.spec["FIELD"] == "3D":
+                dso.createDimension("deptht", self.num.shape[1])
+                dout = dso.createVariable("deptht", "f4", ("deptht",))
+                dout.units = "m"
+                dout[:] = depth[self.klev] if depth is not None else np.arange(self.klev.start, self.klev.stop) + 1
+                dims = ("time_counter", "deptht")
+                mean3 = dso.createVariable(f"mean_3D{self.name}{suffix}", "f8", ("time_counter",), fill_value=fill)
+                mean3[:] = mean3d
+            else:
+                dims = ("time_counter",)
+                mean, vmax = mean[:, 0], vmax[:, 0]
+            for prefix, values in (("mean", mean), ("max", vmax)):
+                ncvar = dso.createVariable(f"{prefix}_{self.name}{suffix}", "f8", dims, fill_value=fill)
+                ncvar[:] = values
+            ncvar = dso.createVariable(f"sum_{self.name}{suffix}", "f8", ("time_counter",), fill_value=fill)
+            ncvar[:] = self.num.sum(1)
+            dso.source = f"mk_reduce.py {os.path.basename(ds.filepath())}"
+        os.replace(tmp, out)
+        print(f"✅ Saved {out}")
+
+
+# ===================== REDUCER =====================
+def reduce_file(fin, mesh, regions, diags, names, vvl=False, chunk=10):
+    """
+    Reduces a gridT file for all the regions of the requested diagnostics.
+
+    Args:
+        fin (str): gridT file.
+        mesh (str): NEMO mesh mask (e1t, e2t, e3t_0, tmask).
+        regions (str): Compiled regions (regions.npz of mk_regions.py).
+        diags (list): Diagnostics to compute (keys of REDUCTIONS).
+        names (dict): CONFIG, RUNID, FREQ, TAG and GRID used in the output names.
+        vvl (bool): Read e3t from the file (variable volume).
+        chunk (int): Number of levels read at once.
+
+    Returns:
+        list: Output files that could not be computed (variable or mask missing).
+    """
+    failed = []
+    windows = np.load(regions)
+    with nc.Dataset(fin) as ds, nc.Dataset(mesh) as dm:
+        ds.set_auto_mask(False)
+        dm.set_auto_mask(False)
+        time_name = find_var(ds, "time_counter|time|t")
+        nt = len(ds.variables[time_name])
+        nz = dm.variables["tmask"].shape[1]
+        ny, nx = dm.variables["tmask"].shape[2:]
+        depth_name = find_var(ds, "deptht|depth|olevel|lev")
+        depth = ds.variables[depth_name][:] if depth_name else None
+
+        # resolve the variables and regions of every output
+        specs = []
+        for diag in diags:
+            for spec in REDUCTIONS[diag]:
+                out = spec["OUT"].format(**names)
+                var, src = find_var(ds, spec["VAR"]), None
+                if var is None and "FROM" in spec:
+                    src = find_var(ds, spec["FROM"])
+                if var is None and src is None:
+                    print(f"⚠️ Warning: none of {spec['VAR']} in {fin}, {out} skipped")
+                    failed.append(out)
+                    continue
+                if "MASK" in spec:
+                    if not os.path.exists(spec["MASK"]):
+                        print(f"⚠️ Warning: {spec['MASK']} is missing, {out} skipped")
+                        failed.append(out)
+                        continue
+                    with nc.Dataset(spec["MASK"]) as dsm:
+                        msk = np.squeeze(dsm.variables["tmask"][:])
+                        msk = (msk[0] if msk.ndim == 3 else msk).astype(np.float64)
+                    rows = np.nonzero(msk.any(1))[0]
+                    cols = np.nonzero(msk.any(0))[0]
+                    if rows.size == 0:
+                        print(f"⚠️ Warning: {spec['MASK']} is empty, {out} skipped")
+                        failed.append(out)
+                        continue
+                    window = (cols[0], cols[-1] + 1, rows[0], rows[-1] + 1)
+                    sel = msk[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+                else:
+                    imin, imax, jmin, jmax = windows[f"{spec['REGION']}.window"]
+                    window = (0, nx, jmin - 1, jmax) if spec.get("BAND") else (imin - 1, imax, jmin - 1, jmax)
+                    sel = None
+                specs.append((spec, out, var, src, window, sel))
+
+        if not specs:
+            return failed
+
+        # band of rows covering all the regions, the only part of the file read
+        jlo = min(s[4][2] for s in specs)
+        jhi = max(s[4][3] for s in specs)
+        band = slice(jlo, jhi)
+        e1e2 = (np.squeeze(dm.variables["e1t"][:])[band] * np.squeeze(dm.variables["e2t"][:])[band]).astype(np.float64)
+
+        # profiles: 3D variable -> targets, derived: 3D variable -> bottom targets, direct: 2D variable -> targets
+        targets, profiles, derived, direct = [], {}, {}, {}
+        for spec, out, var, src, (i0, i1, j0, j1), sel in specs:
+            levels = spec.get("LEVELS", (1, nz))
+            klev = slice(levels[0] - 1, levels[1])
+            name = var or spec["VAR"].split("|")[0]
+            target = Target(spec, var or src, name, slice(j0 - jlo, j1 - jlo), slice(i0, i1), sel, klev, nt)
+            targets.append((out, target))
+            if spec["FIELD"] == "3D":
+                profiles.setdefault(var, []).append(target)
+            elif var is None:
+                derived.setdefault(src, []).append(target)
+            else:
+                direct.setdefault(var, []).append(target)
+
+        # 3D variables: one read per chunk of levels and time record, the deepest wet value is kept for the bottom fields
+        kmax = nz if derived else max((t.klev.stop for ts in profiles.values() for t in ts), default=0)
+        bot = {src: np.zeros((nt, jhi - jlo, nx)) for src in derived}
+        e3name = find_var(ds, E3T) if vvl else None
+        if vvl and e3name is None:
+            print(f"⚠️ Warning: none of {E3T} in {fin}, e3t_0 of the mesh used")
+        for k0 in range(0, kmax, chunk):
+            k1 = min(k0 + chunk, kmax)
+            tmask = dm.variables["tmask"][0, k0:k1, band, :].astype(np.float64)
+            if e3name is None:
+                e3 = np.asarray(dm.variables[find_var(dm, "e3t_0|e3t")][0, k0:k1, band, :], dtype=np.float64)
+            for t in range(nt):
+                if e3name is not None:
+                    e3 = np.asarray(ds.variables[e3name][t, k0:k1, band, :], dtype=np.float64)
+                weights = e1e2 * e3 * tmask
+                for var in set(profiles) | set(derived):
+                    values = np.where(tmask > 0, ds.variables[var][t, k0:k1, band, :], 0.)
+                    for target in profiles.get(var, []):
+                        target.add(t, k0, values, weights)
+                    if var in bot:
+                        for k in range(k1 - k0):
+                            bot[var][t] = np.where(tmask[k] > 0, values[k], bot[var][t])
+
+        # 2D fields: the bottom fields of the file or of the 3D variables
+        tmask = dm.variables["tmask"][0, 0:1, band, :].astype(np.float64)
+        weights = e1e2 * tmask
+        for var, ts in list(direct.items()) + list(derived.items()):
+            for t in range(nt):
+                if var in bot:
+                    values = bot[var][t][None]
+                else:
+                    values = np.where(tmask > 0, ds.variables[var][t, band, :], 0.)
+                for target in ts:
+                    target.add(t, 0, values, weights)
+
+        for out, target in targets:
+            target.write(out, ds, time_name, depth)
+    return failed
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Reduce a gridT file for all the regions of mk_mean, mk_bot and mk_sst in one pass.")
+    parser.add_argument("-f",       required=True,                                 help="gridT file.")
+    parser.add_argument("-mesh",    default="mesh.nc",                             help="NEMO mesh mask file.")
+    parser.add_argument("-regions", default="regions.npz",                         help="Compiled regions (see mk_regions.py).")
+    parser.add_argument("-diags",   default=["mean", "bot", "sst"], nargs="+", choices=list(REDUCTIONS), help="Diagnostics to compute.")
+    parser.add_argument("-vvl",     action="store_true",                           help="Read e3t from the file (variable volume).")
+    parser.add_argument("-chunk",   default=10, type=int,                          help="Number of levels read at once.")
+    parser.add_argument("-config",  required=True,                                 help="CONFIG used in the output names.")
+    parser.add_argument("-runid",   required=True,                                 help="RUNID used in the output names.")
+    parser.add_argument("-freq",    required=True,                                 help="FREQ used in the output names.")
+    parser.add_argument("-tag",     required=True,                                 help="TAG used in the output names.")
+    parser.add_argument("-grid",    required=True,                                 help="GRID used in the output names.")
+    args = parser.parse_args()
+
+    names = {"CONFIG": args.config, "RUNID": args.runid, "FREQ": args.freq, "TAG": args.tag, "GRID": args.grid}
+    failed = reduce_file(args.f, args.mesh, args.regions, args.diags, names, args.vvl, args.chunk)
+    if failed:
+        print(f"❌ {len(failed)} outputs not computed: {' '.join(failed)}")
+        sys.exit(1)
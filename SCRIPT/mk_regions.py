@@ -0,0 +1,131 @@
+"""
+Compiles the region registry (PARAM/regions.txt) for one mesh.
+
+Every region (lon/lat box) is turned into its i/j window on the mesh, found as
+cdffindij -w does (nearest grid point of the lower left and upper right
+corners), and into the horizontal cell weights (e1*e2) and surface mask of
+the window. The result is written next to the mesh:
+  - regions.txt: NAME POINT IMIN IMAX JMIN JMAX (1-based, as printed by cdffindij -w)
+  - regions.npz: <NAME>.window, <NAME>.weight and <NAME>.mask for each region
+Both files start with the key of the mesh and registry they were compiled
+from, so the diagnostics only compile them again if the mesh or the registry
+changes (see get_ijbox in SCRIPT/common.bash).
+"""
+import os
+import numpy as np
+import netCDF4 as nc
+
+
+# ===================== REGISTRY =====================
+def read_registry(registry):
+    """
+    Reads the region registry.
+
+    Args:
+        registry (str): Path to the registry (NAME POINT LONMIN LONMAX LATMIN LATMAX).
+
+    Returns:
+        dict: (point, lonmin, lonmax, latmin, latmax) by region name.
+
+    Raises:
+        ValueError: If a line is malformed or a region is defined twice.
+    """
+    regions = {}
+    with open(registry) as fid:
+        for line in fid:
+            items = line.split("#")[0].split()
+            if not items:
+                continue
+            if len(items) != 6:
+                raise ValueError(f"Malformed region in {registry}: {line.strip()}")
+            if items[0] in regions:
+                raise ValueError(f"Region {items[0]} defined twice in {registry}")
+            regions[items[0]] = (items[1].upper(), *map(float, items[2:]))
+    return regions
+
+
+# ===================== COMPILER =====================
+def nearest_point(lon, lat, lon0, lat0):
+    """
+    Returns the indices of the grid point nearest to (lon0, lat0) (great circle).
+
+    Args:
+        lon (np.ndarray): 2D longitudes of the grid.
+        lat (np.ndarray): 2D latitudes of the grid.
+        lon0 (float): Longitude of the point.
+        lat0 (float): Latitude of the point.
+
+    Returns:
+        tuple: (i, j) 0-based indices.
+    """
+    rlon, rlat = np.radians(lon), np.radians(lat)
+    rlon0, rlat0 = np.radians(lon0), np.radians(lat0)
+    # cosine of the angular distance, maximum at the nearest point
+    cosd = np.sin(rlat) * np.sin(rlat0) + np.cos(rlat) * np.cos(rlat0) * np.cos(rlon - rlon0)
+    j, i = np.unravel_index(np.argmax(cosd), cosd.shape)
+    return int(i), int(j)
+
+
+def compile_regions(mesh, registry, out, key):
+    """
+    Compiles the registry for a mesh into regions.txt and regions.npz.
+
+    Args:
+        mesh (str): Path to the NEMO mesh mask (glam*, gphi*, e1*, e2*, *mask).
+        registry (str): Path to the region registry.
+        out (str): Output path without extension.
+        key (str): Key of the mesh and registry, written in the outputs.
+    """
+    regions = read_registry(registry)
+    grids = {}
+    lines = [
+        f"# regions compiled by mk_regions.py from {registry} for {mesh}",
+        f"# KEY {key}",
+        "# NAME     POINT  IMIN  IMAX  JMIN  JMAX",
+    ]
+    arrays = {"key": np.array(key)}
+
+    with nc.Dataset(mesh) as ds:
+        for name, (point, lonmin, lonmax, latmin, latmax) in regions.items():
+            p = point.lower()
+            if p not in grids:
+                mask = ds.variables[f"{p}mask"]
+                grids[p] = (
+                    np.squeeze(ds.variables[f"glam{p}"][:]).astype(np.float64),
+                    np.squeeze(ds.variables[f"gphi{p}"][:]).astype(np.float64),
+                    np.squeeze(ds.variables[f"e1{p}"][:]).astype(np.float64),
+                    np.squeeze(ds.variables[f"e2{p}"][:]).astype(np.float64),
+                    np.squeeze(mask[0, 0] if mask.ndim == 4 else mask[0]).astype(np.float64),
+                )
+            lon, lat, e1, e2, msk = grids[p]
+            imin, jmin = nearest_point(lon, lat, lonmin, latmin)
+            imax, jmax = nearest_point(lon, lat, lonmax, latmax)
+            window = np.array([imin + 1, imax + 1, jmin + 1, jmax + 1])
+            lines.append(f"{name:<10s} {point:<5s} {window[0]:5d} {window[1]:5d} {window[2]:5d} {window[3]:5d}")
+            sl = (slice(jmin, jmax + 1), slice(imin, imax + 1))
+            arrays[f"{name}.window"] = window
+            arrays[f"{name}.weight"] = e1[sl] * e2[sl]
+            arrays[f"{name}.mask"] = msk[sl]
+
+    # written next to the final files and renamed, several jobs may compile at once
+    tmp = f"{out}.{os.getpid()}"
+    with open(f"{tmp}.npz", "wb") as fid:
+        np.savez_compressed(fid, **arrays)
+    with open(f"{tmp}.txt", "w") as fid:
+        fid.write("\n".join(lines) + "\n")
+    os.replace(f"{tmp}.npz", f"{out}.npz")
+    os.replace(f"{tmp}.txt", f"{out}.txt")
+    print(f"✅ Saved {out}.txt and {out}.npz ({len(regions)} regions)")
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile the region registry for a mesh.")
+    parser.add_argument("-mesh",     default="mesh.nc",             help="NEMO mesh mask file.")
+    parser.add_argument("-registry", default="PARAM/regions.txt",   help="Region registry.")
+    parser.add_argument("-out",      default="regions",             help="Output path without extension (.txt and .npz are written).")
+    parser.add_argument("-key",      default="none",                help="Key of the mesh and registry (see get_ijbox in SCRIPT/common.bash).")
+    args = parser.parse_args()
+
+    compile_regions(args.mesh, args.registry, args.out, args.key)
@@ -9,6 +9,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -26,6 +27,9 @@ GRID=$GRIDI
 FILE=`get_nemofilename`
 if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./mk_sie.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_sie_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
 
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash): yearly or split by month
+OUTPUTS="GLO_sie_${CONFIG}-${RUNID}_${FREQ}_${TAG}*.nc AMUXL_sie_${CONFIG}-${RUNID}_${FREQ}_${TAG}*.nc"
+
 # make sie
 set -x
 
@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -23,13 +24,15 @@ FILE=`get_nemofilename`
 if [ ! -f $FILE ] ; then echo "$FILE is missing; exit"; echo "E R R O R in : ./mk_sst.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_sst_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
 
 FILEOUT=SO_sst_${CONFIG}-${RUNID}_${FREQ}_${TAG}*_grid-${GRID}.nc
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash)
+OUTPUTS="$FILEOUT NWC_sst_nemo_${RUN_NAME}o_${FREQ}_${TAG}*_grid-${GRID}.nc"
 
 # make sst
 set -x
 if [[ ${CONFIG} == "eANT025.L121" ]]; then
-jlimits=$($CDFPATH/cdffindij -w 0.0 1.0 -60.000  -52.800 -c mesh.nc -p T | tail -2 | head -1 | tr -s ' ' | cut -d' ' -f4-5)
+jlimits=$(get_ijbox SO_eANT | cut -d' ' -f3-4)
 else
-jlimits=$($CDFPATH/cdffindij -w 0.0 1.0 -60.000  -40.000 -c mesh.nc -p T | tail -2 | head -1 | tr -s ' ' | cut -d' ' -f4-5)
+jlimits=$(get_ijbox SO | cut -d' ' -f3-4)
 fi
 echo "jlimits : $jlimits"
 $CDFPATH/cdfmean -f $FILE -v '|thetao|votemper|' -w 0 0 ${jlimits} 1 1 -p T -o tmp_$FILEOUT 
@@ -47,7 +50,7 @@ echo "only SO"
 
 else
 FILEOUT=NWC_sst_nemo_${RUN_NAME}o_${FREQ}_${TAG}*_grid-${GRID}.nc
-ijbox=$($CDFPATH/cdffindij -w -50.190 -32.873 41.846 54.413 -c mesh.nc -p T | tail -2 | head -1 )
+ijbox=$(get_ijbox NWC)
 echo "ijbox : $ijbox"
 $CDFPATH/cdfmean -f $FILE -v '|thetao|votemper|' -w ${ijbox} 1 1 -p T -o tmp_$FILEOUT 
 
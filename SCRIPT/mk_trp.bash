@@ -5,6 +5,7 @@ CONFIG=<CONFIG>
 RUNID=<RUNID>
 TAG=<TAG>
 FREQ=<FREQ>
+TOOL=<TOOL>
 
 # load path and mask
 . param.bash
@@ -23,6 +24,9 @@ GRID=$GRIDU ; FILEU=`get_nemofilename`
 if [ ! -f $FILEV ] ; then echo "$FILEV is missing; exit"; echo "E R R O R in : ./mk_trp.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_trp_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
 if [ ! -f $FILEU ] ; then echo "$FILEU is missing; exit"; echo "E R R O R in : ./mk_trp.bash $@ (see SLURM/${CONFIG}/${RUNID}/mk_trp_${FREQ}_${TAG}.out)" >> ${EXEPATH}/ERROR.txt ; exit 1 ; fi
 
+# outputs of the tool (file patterns, see write_manifest in SCRIPT/common.bash): one file per section
+OUTPUTS=$(awk -v sfx=${CONFIG}-${RUNID}_${FREQ}_${TAG} 'NF == 1 && $1 != "EOF" {print "*" $1 "*_" sfx "*.nc"}' ${EXEPATH}/SECTIONS/section_LONLAT.dat)
+
 # make trp
 $CDFPATH/cdftransport -u $FILEU -v $FILEV -lonlat -noheat ${VVL} -pm  -sfx ${CONFIG}-${RUNID}_${FREQ}_${TAG} < ${EXEPATH}/SECTIONS/section_LONLAT.dat
 
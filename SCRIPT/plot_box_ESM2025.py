@@ -48,6 +48,21 @@ class box(object):
         self.ymax=corner[3]-1
         self.name=name
 
+def read_regions(cfile):
+# i/j windows of the region registry compiled by SCRIPT/mk_regions.py (1-based, as cdffindij -w)
+    regions={}
+    for line in open(cfile):
+        items=line.split()
+        if items and not line.startswith('#'):
+            regions[items[0]]=[int(v) for v in items[2:6]]
+    return regions
+
+# i/j windows of the boxes: regions.txt compiled for this mesh by SCRIPT/mk_regions.py
+# (${DATPATH}/regions.txt of a run, or python SCRIPT/mk_regions.py -mesh [MESH] -out [DIR]/regions)
+parser = argparse.ArgumentParser(description='Plot the boxes of the diagnostics on the bathymetry.')
+parser.add_argument('-regions', default='regions.txt', help='regions.txt compiled by SCRIPT/mk_regions.py for the mesh of the plot')
+args = parser.parse_args()
+
 cfile='./mask.nc'
 ncid   = nc.Dataset(cfile)
 bathy = ncid.variables['bathy_metry'][0,0:-2,:]
@@ -73,11 +88,12 @@ j_lst,i_lst=np.nonzero(delta_lon>180)
 for idx in range(0,len(j_lst)):
     lon[j_lst[idx], i_lst[idx]+1:] += 360
 
+regions=read_regions(args.regions)
 box_lst=[]
-box_lst.append(box([891,938,204,258],'WWED'))
-box_lst.append(box([347,404,150,233],'WROSS'))
-box_lst.append(box([1025,1300,325,380],'WG'))
-box_lst.append(box([476,607 ,254,370],'RG'))
+box_lst.append(box(regions['WWED'],'WWED'))
+box_lst.append(box(regions['WROSS'],'WROSS'))
+box_lst.append(box(regions['WG'],'WG'))
+box_lst.append(box(regions['RG'],'RG'))
 
 mask=np.zeros(shape=bathy.shape)
 for box in box_lst:
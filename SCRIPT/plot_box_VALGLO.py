@@ -47,6 +47,21 @@ class box(object):
         self.ymax=corner[3]-1
         self.name=name
 
+def read_regions(cfile):
+# i/j windows of the region registry compiled by SCRIPT/mk_regions.py (1-based, as cdffindij -w)
+    regions={}
+    for line in open(cfile):
+        items=line.split()
+        if items and not line.startswith('#'):
+            regions[items[0]]=[int(v) for v in items[2:6]]
+    return regions
+
+# i/j windows of the boxes: regions.txt compiled for this mesh by SCRIPT/mk_regions.py
+# (${DATPATH}/regions.txt of a run, or python SCRIPT/mk_regions.py -mesh [MESH] -out [DIR]/regions)
+parser = argparse.ArgumentParser(description='Plot the boxes of the diagnostics on the bathymetry.')
+parser.add_argument('-regions', default='regions.txt', help='regions.txt compiled by SCRIPT/mk_regions.py for the mesh of the plot')
+args = parser.parse_args()
+
 cfile='/data/cr1/pmathiot/MESH_MASK/bathymetry_eORCA025-GO6.nc'
 ncid   = nc.Dataset(cfile)
 bathy = ncid.variables['Bathymetry'][0:-2,:]
@@ -62,8 +77,9 @@ for idx in range(0,len(j_lst)):
     lon[j_lst[idx], i_lst[idx]+1:] += 360
 print lon.shape, lat.shape, bathy.shape
 
+regions=read_regions(args.regions)
 box_lst=[None]*1
-box_lst[0]=box([950,1020,870,940],'NWC')
+box_lst[0]=box(regions['NWC'],'NWC')
 
 mask=np.zeros(shape=bathy.shape)
 for box in box_lst:
@@ -0,0 +1,146 @@
+"""
+Runs the jobs queued by run_all.bash -l on the local machine.
+
+The queue (one job per line: KIND JOBNAME TLIMIT SCRIPT OUT ERR DEPENDENCIES,
+see queue_* in run_all.bash) holds the same job graph as the submission:
+staging (data) and mask jobs, then the mk_* tools depending on them. A job
+starts as soon as all its dependencies are finished, whatever their exit
+status (as --dependency=afterany), on a pool of local processes. There is no
+scheduler and no queue latency. The runtime of every completed job is added to
+the RUNTIMES file used by the planner (run_all.bash -n).
+"""
+import os
+import sys
+import time
+import subprocess
+import concurrent.futures as cf
+
+
+# ===================== TASKS =====================
+class Task:
+    """
+    One queued job.
+
+    Attributes:
+        kind (str): data, mask or tool.
+        name (str): Job name (as submitted to the scheduler).
+        tlimit (int): Time limit of the job in seconds.
+        script (str): Job script (prepared by run_all.bash).
+        out (str): Standard output log.
+        err (str): Standard error log.
+        deps (list): Names of the jobs it depends on.
+    """
+    def __init__(self, kind, name, tlimit, script, out, err, deps):
+        self.kind = kind
+        self.name = name
+        self.tlimit = int(tlimit)
+        self.script = script
+        self.out = out
+        self.err = err
+        self.deps = [d for d in deps.split(":") if d and d != "-"]
+
+    def __str__(self):
+        return f"{self.name} ({self.kind})"
+
+
+def read_tasks(path):
+    """
+    Reads the queue written by run_all.bash.
+
+    A job queued twice (same staging for two tools) is only kept once.
+    Dependencies on jobs that are not in the queue are dropped.
+
+    Args:
+        path (str): Queue file.
+
+    Returns:
+        dict: Task by job name, in queue order.
+    """
+    tasks = {}
+    with open(path) as fid:
+        for line in fid:
+            items = line.split()
+            if len(items) != 7:
+                continue
+            task = Task(*items)
+            tasks.setdefault(task.name, task)
+    for task in tasks.values():
+        task.deps = [d for d in task.deps if d in tasks]
+    return tasks
+
+
+# ===================== EXECUTOR =====================
+def run_task(task, cwd):
+    """
+    Runs a job script, its output going to the job logs.
+
+    Returns:
+        tuple: Exit status and wall time in seconds.
+    """
+    t0 = time.time()
+    with open(task.out, "w") as fout, open(task.err, "w") as ferr:
+        status = subprocess.call(["bash", task.script], stdout=fout, stderr=ferr, cwd=cwd)
+    return status, time.time() - t0
+
+
+def run_dag(tasks, jobs=None, cwd=".", runtimes=None):
+    """
+    Runs the job graph, each job as soon as its dependencies are finished.
+
+    Args:
+        tasks (dict): Task by job name (see read_tasks).
+        jobs (int): Number of jobs run at once (default: number of cores).
+        cwd (str): Directory the jobs are run from (EXEPATH).
+        runtimes (str): Append "JOBNAME ELAPSED 1 COMPLETED" to this file for each completed job.
+
+    Returns:
+        list: Names of the jobs that failed.
+
+    Raises:
+        ValueError: If the dependencies are circular.
+    """
+    jobs = jobs or os.cpu_count()
+    pending = dict(tasks)
+    finished, failed, running = set(), [], {}
+    ntask, t0 = len(tasks), time.time()
+    print(f"🔄 {ntask} jobs on {jobs} processes")
+
+    with cf.ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # ready jobs are started in queue order, the pool runs at most `jobs` of them at once
+            for task in [t for t in pending.values() if all(d in finished for d in t.deps)]:
+                running[pool.submit(run_task, task, cwd)] = task
+                del pending[task.name]
+            if not running:
+                raise ValueError(f"Circular dependencies between {', '.join(pending)}")
+
+            done, _ = cf.wait(running, return_when=cf.FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                status, elapsed = future.result()
+                finished.add(task.name)
+                if status == 0:
+                    print(f"✅ [{len(finished)}/{ntask}] {task} {elapsed:.0f} s")
+                    if runtimes:
+                        with open(runtimes, "a") as fid:
+                            fid.write(f"{task.name} {elapsed:.0f} 1 COMPLETED\n")
+                else:
+                    print(f"❌ [{len(finished)}/{ntask}] {task} exit {status} (see {task.err})")
+                    failed.append(task.name)
+
+    print(f"{ntask} jobs done in {time.time() - t0:.0f} s, {len(failed)} failed")
+    return failed
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the jobs queued by run_all.bash -l on the local machine.")
+    parser.add_argument("-tasks",    required=True,                  help="Queue written by run_all.bash.")
+    parser.add_argument("-jobs",     default=None, type=int,         help="Number of jobs run at once (default: number of cores).")
+    parser.add_argument("-dir",      default=".",                    help="Directory the jobs are run from (EXEPATH).")
+    parser.add_argument("-runtimes", default=None,                   help="Append the runtime of each completed job to this file.")
+    args = parser.parse_args()
+
+    failed = run_dag(read_tasks(args.tasks), args.jobs, args.dir, args.runtimes)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,311 @@
+"""
+Follows the jobs submitted by run_all.bash until they are all finished.
+
+The states of all the jobs are queried at once (one sacct call per poll, for
+every RUNID of the campaign) instead of listing the user queue every second.
+The poll interval starts at -min seconds and grows up to -max seconds while
+nothing changes, so long campaigns put little load on the scheduler. Each job
+keeps its state, start and end. Every poll with a change prints the progress
+per tool and per RUNID, with an ETA: the remaining jobs of a tool are counted
+at the mean runtime of the jobs of this tool already completed (this campaign,
+else RUNTIMES), and the remaining work is shared by the jobs running now.
+
+Once all the jobs are finished, the last poll gives their final state: it is
+written to log_status_<RUNID> and the runtime of the completed jobs is added to
+RUNTIMES (used by the planner, run_all.bash -n).
+"""
+import sys
+import time
+import subprocess
+
+# sacct states of the jobs not finished yet
+ACTIVE = ("PENDING", "RUNNING", "REQUEUED", "RESIZING", "SUSPENDED", "CONFIGURING", "COMPLETING")
+FIELDS = "jobid,jobname,state,start,end,elapsedraw,ncpus,exitcode"
+
+
+# ===================== JOBS =====================
+class Job:
+    """
+    One submitted job.
+
+    Attributes:
+        jobid (str): Scheduler job id.
+        runid (str): RUNID the job was submitted for.
+        name (str): Job name (known once the job is in the accounting).
+        state (str): Scheduler state (PENDING until the job is in the accounting).
+        start (str): Start time, as given by sacct.
+        end (str): End time, as given by sacct.
+        elapsed (int): Run time in seconds (so far if running).
+        ncpus (int): Number of cores.
+        exitcode (str): Exit code, as given by sacct.
+        seen (bool): Whether the job was found in the accounting.
+    """
+    def __init__(self, jobid, runid):
+        self.jobid = jobid
+        self.runid = runid
+        self.name = jobid
+        self.state = "PENDING"
+        self.start = self.end = "Unknown"
+        self.elapsed = 0
+        self.ncpus = 1
+        self.exitcode = "0:0"
+        self.seen = False
+
+    @property
+    def tool(self):
+        return tool_key(self.name)
+
+    @property
+    def done(self):
+        return self.state not in ACTIVE
+
+
+def tool_key(name):
+    """
+    Returns the tool of a job from its name (same keys as plan_summary in run_all.bash).
+
+    Args:
+        name (str): Job name (SO_<tool>_..., moo_<runid>_<tag>_<grid>, mk_msk_...).
+
+    Returns:
+        str: mk_trp, moo_gridT, mk_msk, bundle_data ...
+    """
+    if name.startswith("SO_"):
+        return "_".join(name.split("_")[1:3])
+    if name.startswith("moo_"):
+        # the grid is the last part (older names: moo_<tag>_<grid>)
+        return "moo_" + name.rsplit("_", 1)[-1]
+    if name.startswith("mk_msk"):
+        return "mk_msk"
+    return name
+
+
+def read_jobs(path):
+    """
+    Reads the job list written by run_all.bash (one job per line: RUNID JOBID).
+
+    Returns:
+        dict: Job by job id, in submission order.
+    """
+    jobs = {}
+    with open(path) as fid:
+        for line in fid:
+            items = line.split()
+            if len(items) == 2 and items[1].isdigit():
+                jobs.setdefault(items[1], Job(items[1], items[0]))
+    return jobs
+
+
+def read_runtimes(path):
+    """
+    Mean runtime of the past completed jobs, by tool.
+
+    Args:
+        path (str): RUNTIMES file (jobname elapsed(s) ncpus state).
+
+    Returns:
+        dict: Mean runtime in seconds by tool (empty if there is no file).
+    """
+    total, count = {}, {}
+    try:
+        with open(path) as fid:
+            for line in fid:
+                items = line.split()
+                if len(items) == 4 and items[3] == "COMPLETED":
+                    key = tool_key(items[0])
+                    total[key] = total.get(key, 0) + int(items[1])
+                    count[key] = count.get(key, 0) + 1
+    except OSError:
+        pass
+    return {key: total[key] / count[key] for key in total}
+
+
+# ===================== SCHEDULER =====================
+def query(jobs, sacct="sacct", batch=1000):
+    """
+    Updates the state of the jobs not finished yet, with one accounting query per batch of job ids.
+
+    Args:
+        jobs (dict): Job by job id.
+        sacct (str): Accounting command.
+        batch (int): Maximum number of job ids per query.
+
+    Returns:
+        tuple: Number of jobs whose state changed, and whether every query succeeded.
+    """
+    ids = [jobid for jobid, job in jobs.items() if not job.done]
+    nchange = 0
+    for i in range(0, len(ids), batch):
+        cmd = sacct.split() + ["-n", "-P", "-X", "-j", ",".join(ids[i:i + batch]), f"--format={FIELDS}"]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        except (OSError, subprocess.TimeoutExpired) as err:
+            print(f"⚠️ Warning: {sacct} failed ({err}), retrying at the next poll")
+            return nchange, False
+        if proc.returncode != 0:
+            err = proc.stderr.strip() or f"exit {proc.returncode}"
+            print(f"⚠️ Warning: {sacct} failed ({err}), retrying at the next poll")
+            return nchange, False
+        out = proc.stdout
+        for line in out.splitlines():
+            items = line.split("|")
+            if len(items) != 8 or items[0] not in jobs:
+                continue
+            job = jobs[items[0]]
+            # "CANCELLED by 1234" -> CANCELLED
+            state = items[2].split()[0] if items[2] else job.state
+            nchange += state != job.state
+            job.name, job.state, job.start, job.end, job.seen = items[1], state, items[3], items[4], True
+            job.elapsed = int(items[5] or 0)
+            job.ncpus = int(items[6] or 1)
+            job.exitcode = items[7]
+    return nchange, True
+
+
+# ===================== PROGRESS =====================
+def remaining(jobs, means):
+    """
+    Expected remaining run time of each job not finished yet.
+
+    A job is counted at the mean runtime of its tool (or of all the tools if its
+    tool never completed), minus the time it has already run.
+
+    Returns:
+        dict: Remaining seconds by job id (None if no runtime is known at all).
+    """
+    default = sum(means.values()) / len(means) if means else None
+    left = {}
+    for jobid, job in jobs.items():
+        if job.done:
+            continue
+        mean = means.get(job.tool, default)
+        left[jobid] = None if mean is None else max(mean - (job.elapsed if job.state == "RUNNING" else 0), 0)
+    return left
+
+
+def hms(seconds):
+    """Formats a duration as HH:MM:SS (?? if unknown)."""
+    if seconds is None:
+        return "??:??:??"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def report(jobs, history):
+    """
+    Prints the progress per tool, per RUNID and in total, with an ETA.
+
+    Args:
+        jobs (dict): Job by job id.
+        history (dict): Mean runtime by tool of the past jobs (see read_runtimes).
+    """
+    # mean runtime by tool: completed jobs of this campaign, else the past jobs
+    total, count = {}, {}
+    for job in jobs.values():
+        if job.state == "COMPLETED":
+            total[job.tool] = total.get(job.tool, 0) + job.elapsed
+            count[job.tool] = count.get(job.tool, 0) + 1
+    means = dict(history)
+    means.update({key: total[key] / count[key] for key in total})
+    left = remaining(jobs, means)
+    nrun = max(sum(job.state == "RUNNING" for job in jobs.values()), 1)
+
+    def line(label, group):
+        ndone = sum(job.done for job in group)
+        nfail = sum(job.done and job.state != "COMPLETED" for job in group)
+        nrunning = sum(job.state == "RUNNING" for job in group)
+        work = [left[job.jobid] for job in group if not job.done]
+        eta = None if None in work else sum(work) / nrun
+        print(f"   {label:<20s} done {ndone:5d}/{len(group):<5d} failed {nfail:4d} running {nrunning:4d} pending {len(group) - ndone - nrunning:5d} ETA {hms(eta)}")
+
+    print(f"🔄 {time.strftime('%H:%M:%S')}")
+    for key in sorted({job.tool for job in jobs.values()}):
+        line(key, [job for job in jobs.values() if job.tool == key])
+    runids = sorted({job.runid for job in jobs.values()})
+    if len(runids) > 1:
+        for runid in runids:
+            line(runid, [job for job in jobs.values() if job.runid == runid])
+    line("TOTAL", list(jobs.values()))
+
+
+def track(jobs, sacct="sacct", tmin=5, tmax=120, runtimes=None, nlost=10):
+    """
+    Polls the jobs until they are all finished.
+
+    A job still not in the accounting after nlost successful polls (failed
+    submission) is set to UNKNOWN, so it does not block the tracker. Polls where
+    the accounting could not be queried are not counted.
+
+    Args:
+        jobs (dict): Job by job id (see read_jobs).
+        sacct (str): Accounting command.
+        tmin (float): First (and shortest) poll interval in seconds.
+        tmax (float): Longest poll interval in seconds.
+        runtimes (str): RUNTIMES file, for the ETA of the tools not completed yet.
+        nlost (int): Number of successful polls after which a job never found in the accounting is UNKNOWN.
+    """
+    history = read_runtimes(runtimes) if runtimes else {}
+    interval, t0, npoll = tmin, time.time(), 0
+    print(f"🔄 following {len(jobs)} jobs")
+    while True:
+        nchange, ok = query(jobs, sacct)
+        npoll += ok
+        if ok and npoll == nlost:
+            for job in jobs.values():
+                if not job.seen:
+                    job.state = "UNKNOWN"
+                    nchange += 1
+        if nchange:
+            report(jobs, history)
+            interval = tmin
+        else:
+            interval = min(interval * 1.5, tmax)
+        if all(job.done for job in jobs.values()):
+            break
+        time.sleep(interval)
+    print(f"{len(jobs)} jobs done in {hms(time.time() - t0)}")
+
+
+def write_status(jobs, years, runtimes=None):
+    """
+    Writes the final state of the jobs to log_status_<RUNID> and the runtime of the completed jobs to RUNTIMES.
+
+    Args:
+        jobs (dict): Job by job id.
+        years (str): Years of the campaign (header of the log).
+        runtimes (str): RUNTIMES file the completed jobs are added to.
+    """
+    for runid in sorted({job.runid for job in jobs.values()}):
+        with open(f"log_status_{runid}", "w") as fid:
+            fid.write("===========================\n")
+            fid.write(f"   for YEARS in {years}   \n")
+            fid.write("===========================\n")
+            for job in jobs.values():
+                if job.runid == runid:
+                    fid.write(f"{job.jobid:>12s} {job.name:>40s} {job.state:>10s} {job.exitcode:>8s}\n")
+    if runtimes:
+        with open(runtimes, "a") as fid:
+            for job in jobs.values():
+                if job.state == "COMPLETED":
+                    fid.write(f"{job.name} {job.elapsed} {job.ncpus} COMPLETED\n")
+    for job in jobs.values():
+        if job.state != "COMPLETED":
+            print(f"❌ {job.runid} {job.jobid} {job.name} {job.state} {job.exitcode}")
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Follow the jobs submitted by run_all.bash until they are all finished.")
+    parser.add_argument("-jobs",     required=True,                  help="Job list written by run_all.bash (RUNID JOBID).")
+    parser.add_argument("-runtimes", default=None,                   help="RUNTIMES file (ETA of the tools, runtimes of the completed jobs are added).")
+    parser.add_argument("-years",    default="",                     help="Years of the campaign (header of log_status_<RUNID>).")
+    parser.add_argument("-sacct",    default="sacct",                help="Accounting command.")
+    parser.add_argument("-min",      default=5, type=float,          help="First (and shortest) poll interval in seconds.")
+    parser.add_argument("-max",      default=120, type=float,        help="Longest poll interval in seconds.")
+    args = parser.parse_args()
+
+    jobs = read_jobs(args.jobs)
+    track(jobs, args.sacct, args.min, args.max, args.runtimes)
+    write_status(jobs, args.years, args.runtimes)
+    sys.exit(0 if all(job.state == "COMPLETED" for job in jobs.values()) else 1)
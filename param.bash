@@ -25,6 +25,14 @@ runMEAN=0
 runEKE=0
 #
 runOBS=0
+# BOT, SST and MEAN computed in one pass over gridT (SCRIPT/mk_reduce.py) instead of the cdfmean calls
+runREDUCE=0
+#
+# number of files staged at once by get_data.bash (hard links if STOPATH and WRKPATH share a file system, else copies)
+NSTAGE=4
+#
+# ledger of the mk_* tasks (status, exit code, duration, peak memory, log), read by run_all.bash -r (SCRIPT/ledger.py)
+LEDGER=${WRKPATH}/ledger.db
 #
 if [[ $RUNALL == 1 || $RUNTEST == 1 ]]; then
    runACC=1 #acc  ts
@@ -7,13 +7,82 @@
 #=============================================================================================================================
 
 compute_obs_diags() {
-   [[ $runMEAN == 1 ]] && sbatch mk_mean $CONFIG $TAG $RUNID $FREQ OBSTS > /dev/null 2>&1
+   if [[ $DRYRUN == 1 ]]; then
+      [[ $runMEAN == 1 ]] && echo "tool mk_mean_OBSTS mk_mean 0 0 0 0 1800 -" >> ${PLANFILE}
+   elif [[ $NBUNDLE -gt 0 || $LOCAL == 1 ]]; then
+      # queued with the other jobs (-b, -l), the OBSTS tag switches mk_mean to the observations
+      [[ $runMEAN == 1 ]] && queue_tool mk_mean $CONFIG OBSTS $RUNID $FREQ - > /dev/null
+   else
+      [[ $runMEAN == 1 ]] && sbatch mk_mean $CONFIG $TAG $RUNID $FREQ OBSTS > /dev/null 2>&1
+   fi
+}
+
+tool_version() {
+   # $1 = TOOL
+   # version of a tool, as recorded by write_manifest (same as tool_version in SCRIPT/common.bash)
+   cat ${SCRPATH}/${1}.* ${SCRPATH}/common.bash ${SCRPATH}/mk_regions.py ${EXEPATH}/PARAM/regions.txt 2> /dev/null | md5sum | cut -c1-16
+}
+
+up_to_date() {
+   # $1 = TOOL ; $2 = $TAG ; $3 = $FREQ
+   # true if the manifest of the last run of the tool for this tag (see write_manifest in SCRIPT/common.bash) shows
+   # the same tool version, unchanged inputs and outputs still present and newer than the inputs (always false with -f)
+   local MANIFEST=${DATPATH}/MANIFEST/${1}_${3}_${2}.txt
+   if [[ $FORCE == 1 || ! -f $MANIFEST ]]; then return 1 ; fi
+   if [[ "$(head -1 $MANIFEST)" != "# VERSION $(tool_version $1)" ]]; then return 1 ; fi
+   local KIND MFILE SIZE MTIME ID TIN=0 NOUT=0
+   while read KIND MFILE SIZE MTIME ; do
+      if [[ $KIND != in && $KIND != out ]]; then continue ; fi
+      if [ ! -e $MFILE ]; then return 1 ; fi
+      ID=(`stat -L -c '%s %Y' $MFILE`)
+      if [[ $KIND == in ]]; then
+         if [[ ${ID[0]} != $SIZE || ${ID[1]} != $MTIME ]]; then return 1 ; fi
+         if [[ $MTIME -gt $TIN ]]; then TIN=$MTIME ; fi
+      else
+         if [[ ${ID[1]} -lt $TIN ]]; then return 1 ; fi
+         NOUT=$((NOUT+1))
+      fi
+   done < $MANIFEST
+   [[ $NOUT -gt 0 ]]
+}
+
+is_done() {
+   # $1 = TOOL ; $2 = $TAG ; $3 = $FREQ
+   # true if the outputs of the tool are up to date or, with -r, if the ledger records the task as completed
+   [[ $RESUME == 1 && -n ${COMPLETED["$1 $2 $3"]} ]] || up_to_date $1 $2 $3
+}
+
+skip_done() {
+   # $1 = run switch ; $2 = TOOL ; $3 = $TAG ; $4 = $FREQ
+   # switch off (in the caller) a tool already done (see is_done)
+   if [[ ${!1} == 1 ]] && is_done $2 $3 $4 ; then eval "$1=0" ; NSKIP=$((NSKIP+1)) ; fi
+}
+
+skip_reduced() {
+   # $1 = run switch ; $2 = diagnostic (bot, sst or mean) ; $3 = $TAG ; $4 = $FREQ
+   # switch off (in the caller) a diagnostic of mk_reduce already done: the job is done (see is_done) and its manifest
+   # lists the diagnostic (DIAGS), so the other diagnostics of the fused reducer are still run
+   local MANIFEST=${DATPATH}/MANIFEST/mk_reduce_${4}_${3}.txt
+   if [[ ${!1} == 1 ]] && is_done mk_reduce $3 $4 ; then
+      if [[ " $(sed -n 's/^# DIAGS //p' $MANIFEST 2> /dev/null | sed 's/_eANT//g') " == *" $2 "* ]]; then eval "$1=0" ; NSKIP=$((NSKIP+1)) ; fi
+   fi
 }
 
 compute_diags() {
    # define tags
    TAG=$(get_tag ${FREQ} ${YEAR} ${MONTH} 01)
 
+   # tools up to date for this tag are not run again, nor the staging only they need
+   local runACC=$runACC runBSF=$runBSF runBOT=$runBOT runMOC=$runMOC runMHT=$runMHT runQHF=$runQHF runISF=$runISF runICB=$runICB runSST=$runSST runMEAN=$runMEAN runEKE=$runEKE
+   local mooVyid mooUyid mooTyid mooQyid runACCy00id runPSIy00id runBOTy00id runMOCy00id runMHTy00id runHFDy00id runISFy00id runICBy00id runSSTy00id runAVGy00id runEKEy00id runREDy00id
+   skip_done runACC mk_trp  $TAG $FREQ ; skip_done runBSF mk_psi  $TAG $FREQ ; skip_done runMOC mk_moc $TAG $FREQ ; skip_done runMHT mk_mht $TAG $FREQ
+   skip_done runQHF mk_hfds $TAG $FREQ ; skip_done runISF mk_isf  $TAG $FREQ ; skip_done runICB mk_icb $TAG $FREQ ; skip_done runEKE mk_eke $TAG $FREQ
+   if [[ $runREDUCE == 1 ]]; then
+      skip_reduced runBOT bot $TAG $FREQ ; skip_reduced runSST sst $TAG $FREQ ; skip_reduced runMEAN mean $TAG $FREQ
+   else
+      skip_done runBOT mk_bot $TAG $FREQ ; skip_done runSST mk_sst $TAG $FREQ ; skip_done runMEAN mk_mean $TAG $FREQ
+   fi
+
    # get data (retreive_data function are defined in this script)
    [[ $runACC == 1 || $runBSF == 1 || $runMOC == 1 || $runMHT == 1 || $runEKE == 1 ]]      && mooVyid=$(retreive_data $CONFIG $RUNID $FREQ $TAG $GRIDV  )
    [[ $runACC == 1 || $runBSF == 1 || $runMOC == 1 || $runEKE == 1 ]]                      && mooUyid=$(retreive_data $CONFIG $RUNID $FREQ $TAG $GRIDU  )
@@ -28,19 +97,21 @@ compute_diags() {
    # run cdftools
    [[ $runACC  == 1 ]] && runACCy00id=$(run_tool mk_trp  $CONFIG $TAG $RUNID $FREQ $mooVyid:$mooUyid)
    [[ $runBSF  == 1 ]] && runPSIy00id=$(run_tool mk_psi  $CONFIG $TAG $RUNID $FREQ $mooVyid:$mooUyid              )
-   [[ $runBOT  == 1 ]] && runBOTy00id=$(run_tool mk_bot  $CONFIG $TAG $RUNID $FREQ $mooTyid:$moomskid             )
+   [[ $runBOT  == 1 && $runREDUCE != 1 ]] && runBOTy00id=$(run_tool mk_bot  $CONFIG $TAG $RUNID $FREQ $mooTyid:$moomskid             )
    [[ $runMOC  == 1 ]] && runMOCy00id=$(run_tool mk_moc  $CONFIG $TAG $RUNID $FREQ $mooVyid:$mooTyid              )
    [[ $runMHT  == 1 ]] && runMHTy00id=$(run_tool mk_mht  $CONFIG $TAG $RUNID $FREQ $mooVyid:$mooVyid              )
    [[ $runQHF  == 1 ]] && runHFDy00id=$(run_tool mk_hfds $CONFIG $TAG $RUNID $FREQ $mooQyid                       )
    [[ $runISF  == 1 ]] && runISFy00id=$(run_tool mk_isf  $CONFIG $TAG $RUNID $FREQ $mooQyid:$mooTyid              )
    [[ $runICB  == 1 ]] && runICBy00id=$(run_tool mk_icb  $CONFIG $TAG $RUNID $FREQ $mooQyid:$moomskid             )
-   [[ $runSST  == 1 ]] && runSSTy00id=$(run_tool mk_sst  $CONFIG $TAG $RUNID $FREQ $mooTyid                       )
-   [[ $runMEAN == 1 ]] && runAVGy00id=$(run_tool mk_mean $CONFIG $TAG $RUNID $FREQ $mooTyid                       )
+   [[ $runSST  == 1 && $runREDUCE != 1 ]] && runSSTy00id=$(run_tool mk_sst  $CONFIG $TAG $RUNID $FREQ $mooTyid                       )
+   [[ $runMEAN == 1 && $runREDUCE != 1 ]] && runAVGy00id=$(run_tool mk_mean $CONFIG $TAG $RUNID $FREQ $mooTyid                       )
    [[ $runEKE  == 1 ]] && runEKEy00id=$(run_tool mk_eke  $CONFIG $TAG $RUNID $FREQ $mooTyid:$mooUyid:$mooVyid     )
+   # one pass over gridT for BOT, SST and MEAN (SCRIPT/mk_reduce.py)
+   [[ $runREDUCE == 1 ]] && [[ $runBOT == 1 || $runSST == 1 || $runMEAN == 1 ]] && runREDy00id=$(run_tool mk_reduce $CONFIG $TAG $RUNID $FREQ $mooTyid${moomskid:+:$moomskid})
 
 
    JOBID=`echo "$JOBID $mooVyid $mooUyid $mooTyid $mooQyid $mooTyid $mooQyid"`
-   JOBID=`echo "$JOBID $runACCy00id $runPSIy00id $runBOTy00id $runMOCy00id $runMHTy00id $runHFDy00id $runISFy00id $runICBy00id $runSSTy00id $runAVGy00id $runEKEy00id"`
+   JOBID=`echo "$JOBID $runACCy00id $runPSIy00id $runBOTy00id $runMOCy00id $runMHTy00id $runHFDy00id $runISFy00id $runICBy00id $runSSTy00id $runAVGy00id $runEKEy00id $runREDy00id"`
 }
 
 compute_onlymonthly_diags() {
@@ -49,6 +120,16 @@ compute_onlymonthly_diags() {
    TAG02=$(get_tag 1m ${YEAR} 02 01)
    TAG03=$(get_tag 1m ${YEAR} 03 01)
 
+   # tools up to date for these tags are not run again, nor the staging only they need
+   local runMLD=$runMLD runSIE=$runSIE
+   local mooT09mid mooT03mid mooI09mid mooI02mid mooI03mid runmxly00id runsiey00id runmxlm09id runsiem09id runsiem02id runsiem03id
+   skip_done runMLD mk_mxl $TAG09 1m
+   if [[ $FREQF == 1y ]]; then
+      skip_done runSIE mk_sie $TAG09 1m
+   elif [[ $runSIE == 1 ]] && is_done mk_sie $TAG09 1m && is_done mk_sie $TAG02 1m && is_done mk_sie $TAG03 1m ; then
+      runSIE=0 ; NSKIP=$((NSKIP+3))
+   fi
+
    # get data (retreive_data function are defined in this script)
    if   [[ $FREQF == 1y ]]  ; then   # tag02=tag09=tag03
       [[ $runMLD == 1 ]]                                              && mooT09mid=$(retreive_data $CONFIG $RUNID 1m $TAG02 $GRIDT)
@@ -81,23 +162,148 @@ compute_onlymonthly_diags() {
 
 }
 
-progress_bar() {
-   sleep 5
-   echo''
-   njob=`echo $JOBID | wc -w`
-   ijob=$njob
-   eval "printf '|' ; printf '%0.s ' {0..100} ; printf '|\r' ;"
-   while [[ $ijob -ne 0 ]] ; do
-     ijob=`$JOBSTATcmd | grep 'SO_' | wc -l`
-     icar=$(( ( (njob - ijob) * 100 ) / njob ))
-     eval "printf '|' ; printf '%0.s=' {0..$icar} ; printf '\r' ; "
-     sleep 1
+#-----------------------------------------------------------------------------------------------------------------------------
+# dry run (-n): same job graph as the submission, each job is written to ${PLANFILE} instead of being submitted
+# PLANFILE columns: KIND JOBNAME KEY NFILE NBYTE NCOPY BCOPY TLIMIT DEPENDENCIES
+#-----------------------------------------------------------------------------------------------------------------------------
+plan_data() {
+   # $1 = $CONFIG ; $2 = $RUNID ; $3 = $FREQ ; $4 = $TAG ; $5 = $GRID
+   # list the files get_data.bash would stage from STOPATH (files already in DATPATH with the size of the source are kept)
+   (
+   STOPATH=${ARCHSTOPATH} ; CONFIG=$1 ; RUNID=$2 ; FREQ=$3 ; TAG=$4 ; GRID=$5
+   . PARAM/param_${CONFIG}.bash
+   nfile=0 ; nbyte=0 ; ncopy=0 ; bcopy=0
+   for MFILE in `ls ${SIMPATH}/${NEMOFILE} 2> /dev/null`; do
+      size=`stat -L -c %s $MFILE`
+      nfile=$((nfile+1)) ; nbyte=$((nbyte+size))
+      if [[ `stat -L -c %s ${DATPATH}/$(basename $MFILE) 2> /dev/null` != $size ]]; then ncopy=$((ncopy+1)) ; bcopy=$((bcopy+size)) ; fi
    done
-   eval "printf '|' ; printf '%0.s=' {0..100} ; printf '|\n' ;"
-   echo ''
+   echo "data moo_${2}_${4}_${5} moo_${5} $nfile $nbyte $ncopy $bcopy 600 -" >> ${PLANFILE}
+   )
+   echo moo_${2}_${4}_${5}
+}
+
+plan_mask() {
+   # $1 = $CONFIG ; $2 = $RUNID
+   echo "mask mk_msk_${1}_${2} mk_msk 0 0 0 0 600 -" >> ${PLANFILE}
+   echo mk_msk_${1}_${2}
+}
+
+plan_tool() {
+   # $1 = TOOL ; $2 = $CONFIG ; $3 = $TAG ; $4 = $RUNID ; $5 = $FREQ ; $6+ = ID
+   echo "tool SO_${1}_${2}_${3}_${4} ${1} 0 0 0 0 1800 ${@:6}" >> ${PLANFILE}
+   echo SO_${1}_${2}_${3}_${4}
+}
+
+plan_summary() {
+   # $1 = label ; summary of the jobs in ${PLANFILE} (runtimes from ${RUNTIMES}, else the job time limit)
+   # the history is selected by name: an empty RUNTIMES (first use) must not swallow the plan lines
+   touch ${RUNTIMES}
+   awk -v label="$1" '
+   function key(name) {
+      if (name ~ /^SO_/)    { split(name, p, "_") ; return p[2] "_" p[3] }
+      if (name ~ /^moo_/)   { sub(/^moo_.*_/, "", name) ; return "moo_" name }
+      if (name ~ /^mk_msk/) { return "mk_msk" }
+      return name
+   }
+   FILENAME == ARGV[1] { k = key($1) ; tsum[k] += $2 * $3 ; tnum[k]++ ; next }
+   {
+      njob[$1]++ ; nfile += $4 ; nbyte += $5 ; ncopy += $6 ; bcopy += $7
+      if ($1 == "data" && $4 == 0) nmiss++
+      if ($3 in tnum) { csec += tsum[$3] / tnum[$3] } else { csec += $8 ; nlim++ }
+   }
+   END {
+      printf "%-30s jobs %6d (data %d, mask %d, tool %d)\n", label, njob["data"] + njob["mask"] + njob["tool"], njob["data"], njob["mask"], njob["tool"]
+      printf "%-30s staged files %6d (%.2f GB), to copy from STOPATH %6d (%.2f GB), data jobs without file %d\n", "", nfile, nbyte / 1e9, ncopy, bcopy / 1e9, nmiss
+      printf "%-30s core-hours %.1f (%d jobs without past runtime counted at their time limit)\n", "", csec / 3600., nlim
+   }' ${RUNTIMES} $2
+}
+
+#-----------------------------------------------------------------------------------------------------------------------------
+# bundles (-b N) and local run (-l): the jobs are queued in ${QUEUEFILE} and, at the end of the RUNID, submitted in bundles
+# of N jobs of the same kind, each bundle running its jobs one after the other (same scripts and logs as the single jobs),
+# or, once all the RUNIDs are queued, run on the local cores by SCRIPT/run_dag.py, each job as soon as its dependencies are done
+# (the job names hold the RUNID, so the jobs of all the RUNIDs share one queue)
+# QUEUEFILE columns: KIND JOBNAME TLIMIT SCRIPT OUT ERR DEPENDENCIES
+#-----------------------------------------------------------------------------------------------------------------------------
+queue_data() {
+   # $1 = $CONFIG ; $2 = $RUNID ; $3 = $FREQ ; $4 = $TAG ; $5 = $GRID
+   echo "data moo_${2}_${4}_${5} 600 $(prepare_data $@) ${JOBOUT_PATH}/moo_${3}_${4}_${5} ${JOBOUT_PATH}/moo_${3}_${4}_${5}_err -" >> ${QUEUEFILE}
+   echo moo_${2}_${4}_${5}
+}
+
+queue_mask() {
+   # $1 = $CONFIG ; $2 = $RUNID
+   echo "mask mk_msk_${1}_${2} 600 $(prepare_mask $@) ${JOBOUT_PATH}/mk_msk_${1}_${2}.out ${JOBOUT_PATH}/mk_msk_${1}_${2}.err -" >> ${QUEUEFILE}
+   echo mk_msk_${1}_${2}
+}
+
+queue_tool() {
+   # $1 = TOOL ; $2 = $CONFIG ; $3 = $TAG ; $4 = $RUNID ; $5 = $FREQ ; $6+ = ID
+   echo "tool SO_${1}_${2}_${3}_${4} 1800 $(prepare_tool ${@:1:5}) ${JOBOUT_PATH}/${1}_${5}_${3}.out ${JOBOUT_PATH}/${1}_${5}_${3}.err ${@:6}" >> ${QUEUEFILE}
+   echo SO_${1}_${2}_${3}_${4}
+   njob=$((njob+1))
+}
+
+submit_bundles() {
+   # $1 = queued jobs ; masks first, then data, then tools, at most NBUNDLE jobs per bundle in the order they were queued
+   # a bundle is closed before its time limit (sum of the limits of its jobs) exceeds BUNDLE_TMAX (param_arch.bash)
+   # a bundle depends (afterany) on the bundles running the dependencies of its jobs ; sets BUNDLEIDS
+   declare -A BUNDLEOF
+   BUNDLEIDS=''
+   ibundle=0
+   for KIND in mask data tool; do
+      mapfile -t TASKS < <(grep "^${KIND} " $1)
+      BTASKS=() ; TLIMIT=0
+      for ((itask=0; itask<=${#TASKS[@]}; itask++)); do
+         read TKIND TNAME TTIME TREST <<< "${TASKS[itask]}"
+         if [[ ${#BTASKS[@]} -gt 0 ]] && [[ $itask -eq ${#TASKS[@]} || ${#BTASKS[@]} -eq $NBUNDLE || $((TLIMIT+TTIME)) -gt ${BUNDLE_TMAX:-86400} ]]; then
+            submit_bundle $KIND "${BTASKS[@]}"
+            BTASKS=() ; TLIMIT=0
+         fi
+         if [[ $itask -lt ${#TASKS[@]} ]]; then BTASKS+=("${TASKS[itask]}") ; TLIMIT=$((TLIMIT+TTIME)) ; fi
+      done
+   done
+   echo "$(wc -l < $1) jobs submitted in ${ibundle} bundles"
 }
+
+submit_bundle() {
+   # $1 = KIND ; $2+ = queued jobs of the bundle
+   # called by submit_bundles (uses and updates BUNDLEOF, BUNDLEIDS and ibundle)
+   local KIND=$1 TASK TKIND TNAME TTIME TSCRIPT TOUT TERR TDEPS DEP BID BSCRIPT TLIMIT=0 DEPS='' NAMES=''
+   ibundle=$((ibundle+1))
+   BSCRIPT=${WRKPATH}/${CONFIG}-${RUNID}/bundle_${KIND}.bash_${CONFIG}_${RUNID}_${FREQ}_${YEARB}_${YEARE}_${ibundle}
+   echo '#!/bin/bash' > ${BSCRIPT}
+   for TASK in "${@:2}"; do
+      read TKIND TNAME TTIME TSCRIPT TOUT TERR TDEPS <<< "$TASK"
+      TLIMIT=$((TLIMIT+TTIME)) ; NAMES="$NAMES $TNAME"
+      for DEP in ${TDEPS//:/ }; do [[ -n ${BUNDLEOF[$DEP]} ]] && DEPS="$DEPS ${BUNDLEOF[$DEP]}" ; done
+      # runtime of each job kept for the planner (-n), as sacct does for the single jobs
+      echo "t0=\$(date +%s) ; bash ${TSCRIPT} > ${TOUT} 2> ${TERR} && echo \"${TNAME} \$((\$(date +%s)-t0)) 1 COMPLETED\" >> ${RUNTIMES}" >> ${BSCRIPT}
+   done
+   DEPS=`echo $DEPS | tr ' ' '\n' | sort -u | paste -sd:`
+   BID=$(submit_job SO_bundle_${KIND}_${RUNID}_${ibundle} ${TLIMIT} "${DEPS}" ${BSCRIPT} ${JOBOUT_PATH}/bundle_${KIND}_${FREQ}_${YEARB}_${YEARE}_${ibundle})
+   for TNAME in $NAMES; do BUNDLEOF[$TNAME]=$BID ; done
+   BUNDLEIDS="$BUNDLEIDS $BID"
+}
+
 #=============================================================================================================================
-if [ $# -le 4 ]; then echo 'run_all.sh [CONFIG] [YEARB] [YEARE] [FREQ] [RUNID list]'; exit 42; fi
+DRYRUN=0
+FORCE=0
+RESUME=0
+NBUNDLE=0
+LOCAL=0
+while [[ $1 == -* ]]; do
+   case $1 in
+      -n) DRYRUN=1; shift ;;
+      -b) NBUNDLE=$2; shift 2 ;;
+      -f) FORCE=1; shift ;;
+      -r) RESUME=1; shift ;;
+      -l) LOCAL=1; if [[ $2 =~ ^[0-9]+$ ]]; then NPROC=$2; shift; fi; shift ;;
+      *)  break ;;
+   esac
+done
+if [ $# -le 4 ]; then echo 'run_all.sh [-n] [-f] [-r] [-b N] [-l [NPROC]] [CONFIG] [YEARB] [YEARE] [FREQ] [RUNID list]  (-n: plan only, nothing is submitted ; -f: run again the tools already up to date ; -r: resume, only the tasks not completed in the ledger ; -b: submit the jobs in bundles of N ; -l: run the jobs on NPROC local processes, default all cores)'; exit 42; fi
 
 CONFIG=$1
 YEARB=$2
@@ -107,24 +313,62 @@ RUNIDS=${@:5}
 
 . PARAM/param_arch.bash
 
-if [[ $((YEARE-YEARB)) -gt 100 ]]; then echo 'Check your arguments, you ask for too many years'; exit 10; fi
+# past runtimes (jobname elapsed(s) ncpus state), filled by sacct at the end of each submission
+RUNTIMES=${EXEPATH}/SLURM/${CONFIG}/RUNTIMES.txt
+
+if [[ $DRYRUN == 1 ]]; then
+   # no limit on the number of years: the plan is used to size large reprocessing
+   ARCHSTOPATH=${STOPATH}
+   PLANBASE=plan_${CONFIG}_${FREQ}_${YEARB}_${YEARE}
+   retreive_data() { plan_data "$@" ; }
+   build_mask()    { plan_mask "$@" ; }
+   run_tool()      { plan_tool "$@" ; }
+else
+   if [[ $((YEARE-YEARB)) -gt 100 ]]; then echo 'Check your arguments, you ask for too many years (use -n to plan it)'; exit 10; fi
+
+   # clean ERROR.txt file
+   if [ -f ERROR.txt ]; then rm ERROR.txt ; fi
+
+   if [[ $NBUNDLE -gt 0 || $LOCAL == 1 ]]; then
+      retreive_data() { queue_data "$@" ; }
+      build_mask()    { queue_mask "$@" ; }
+      run_tool()      { queue_tool "$@" ; }
+   fi
+fi
 
-# clean ERROR.txt file
-if [ -f ERROR.txt ]; then rm ERROR.txt ; fi
+# jobs submitted for all the RUNIDs (RUNID JOBID), followed by SCRIPT/track_jobs.py once all the RUNIDs are submitted
+JOBLIST=${EXEPATH}/SLURM/${CONFIG}/jobs_${FREQ}_${YEARB}_${YEARE}.lst
+if [[ $DRYRUN == 0 && $LOCAL == 0 ]]; then mkdir -p $(dirname ${JOBLIST}) ; rm -f ${JOBLIST} ; touch ${JOBLIST} ; fi
+# jobs of all the RUNIDs run locally (-l) by one SCRIPT/run_dag.py once all the RUNIDs are queued
+if [[ $DRYRUN == 0 && $LOCAL == 1 ]]; then QUEUEFILE=${EXEPATH}/SLURM/${CONFIG}/queue_${FREQ}_${YEARB}_${YEARE}.lst ; mkdir -p $(dirname ${QUEUEFILE}) ; rm -f ${QUEUEFILE} ; touch ${QUEUEFILE} ; fi
 
 # loop over years
 echo ''
 for RUNID in `echo $RUNIDS`; do
 
+   JOBID=''
+
    . PARAM/param_${CONFIG}.bash
 
    # set up jobout directory file
    JOBOUT_PATH=${EXEPATH}/SLURM/${CONFIG}/${RUNID}
    if [ ! -d ${JOBOUT_PATH} ]; then mkdir -p ${JOBOUT_PATH} ; fi
 
+   if [[ $DRYRUN == 1 ]]; then PLANFILE=${PLANBASE}_${RUNID} ; if [ -f ${PLANFILE} ]; then rm ${PLANFILE} ; fi ; touch ${PLANFILE} ; fi
+   if [[ $DRYRUN == 0 && $NBUNDLE -gt 0 && $LOCAL == 0 ]]; then QUEUEFILE=${JOBOUT_PATH}/queue_${FREQ}_${YEARB}_${YEARE}.lst ; rm -f ${QUEUEFILE} ; touch ${QUEUEFILE} ; JOBID0=$JOBID ; fi
+
    echo "$RUNID ..."
 
+   # tasks completed in the ledger (TOOL TAG FREQ), not submitted again with -r
+   declare -A COMPLETED=()
+   if [[ $RESUME == 1 ]]; then
+      load_python
+      while read TTOOL TTAG TFREQ ; do COMPLETED["$TTOOL $TTAG $TFREQ"]=1 ; done < <(python ${SCRPATH}/ledger.py -db ${LEDGER} -completed -config ${CONFIG} -runid ${RUNID})
+      echo "${#COMPLETED[@]} tasks completed in ${LEDGER}"
+   fi
+
    njob=0
+   NSKIP=0
    LSTY=`eval echo {${YEARB}..${YEARE}}`
    LSTM=`eval echo {1..12}`
 
@@ -149,25 +393,60 @@ for RUNID in `echo $RUNIDS`; do
       compute_onlymonthly_diags
       
    done
+   if [[ $NSKIP -gt 0 ]]; then echo "$NSKIP tasks up to date, not run again (use -f to force them)" ; fi
 
-   # print task bar
-   progress_bar  
- 
-   # wait it is all done (probably useless because of the progress bar loop)
-#   wait
-
-   # retreive all job exit
-   if [ -f log_status_$RUNID ]; then rm log_status_$RUNID ; fi
-   echo "===========================" >> log_status_$RUNID
-   echo "   for YEARS in $LSTY   " >> log_status_$RUNID
-   echo "===========================" >> log_status_$RUNID
-   for id in $JOBID; do
-       sacct -j $id --format=jobid,jobname%40,state,exitcode | grep "$id " >> log_status_$RUNID
-   done
-   grep -v COMPLETED log_status_$RUNID
-   echo 'DONE'
+   if [[ $DRYRUN == 1 ]]; then
+      plan_summary $RUNID ${PLANFILE}
+      continue
+   fi
+
+   if [[ $LOCAL == 1 ]]; then
+      echo "$(grep -c " ${JOBOUT_PATH}/" ${QUEUEFILE}) jobs queued"
+      continue
+   fi
+
+   if [[ $NBUNDLE -gt 0 ]]; then
+      submit_bundles ${QUEUEFILE}
+      JOBID="$JOBID0 $BUNDLEIDS"
+   fi
+
+   for id in $JOBID; do echo "$RUNID $id" ; done >> ${JOBLIST}
+   echo "$(echo $JOBID | wc -w) jobs submitted"
 
 done # end runids
+if [[ $DRYRUN == 1 ]]; then
+   echo ''
+   for RUNID in `echo $RUNIDS`; do cat ${PLANBASE}_${RUNID} ; done > ${PLANBASE}
+   plan_summary TOTAL ${PLANBASE}
+   echo ''
+   echo "nothing submitted, job list in ${PLANBASE} (one file per RUNID in ${PLANBASE}_<RUNID>)"
+   exit 0
+fi
+# run the jobs of all the RUNIDs on the local cores
+if [[ $LOCAL == 1 ]]; then
+   echo ''
+   load_python
+   if python ${SCRPATH}/run_dag.py -tasks ${QUEUEFILE} -dir ${EXEPATH} -runtimes ${RUNTIMES} ${NPROC:+-jobs $NPROC} ; then
+      echo 'DONE'
+   else
+      echo "❌ some jobs failed or could not run (see the ❌ lines above and their logs in ${EXEPATH}/SLURM/${CONFIG}/[RUNID]/)"
+   fi
+fi
+
+# follow all the jobs (bulk sacct queries), then write log_status_[RUNID] and add the runtimes to RUNTIMES
+if [[ $LOCAL == 0 ]]; then
+   load_python
+   python ${SCRPATH}/track_jobs.py -jobs ${JOBLIST} -runtimes ${RUNTIMES} -years "${LSTY}"
+   echo 'DONE'
+fi
+
+# state of the tasks in the ledger
+if [ -f ${LEDGER} ]; then
+   echo ''
+   load_python
+   python ${SCRPATH}/ledger.py -db ${LEDGER} -summary -config ${CONFIG} -runid ${RUNIDS}
+fi
+
 # print out
 sleep 1
 ls > /dev/null 2>&1 # without this the following command sometimes failed (maybe it force to flush all the file on disk)
@@ -1,309 +1,30 @@
 import os
-import re
-import cftime
 import numpy as np
-import glob
-import yaml
-import xarray as xr
-import pandas as pd
 import matplotlib
-matplotlib.use('TkAgg')
+if "MPLBACKEND" not in os.environ:
+    matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.gridspec import GridSpec
+from matplotlib.lines import Line2D
+from matplotlib.transforms import Bbox
 #import matplotlib.ticker as ticker
-import warnings
+import io
+import html
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import time
-import tracemalloc
-warnings.filterwarnings(
-    "ignore",
-    category=RuntimeWarning,
-    message="Converting a CFTimeIndex.*noleap.*"
-)
-
-# ===================== CLASSES =====================
-def read_scalar_timeseries(files, var, time_name):
-    times = []
-    values = []
-
-    for f in files:
-        ds = xr.open_dataset(f)
-        for t in ds[time_name].values[:]:
-            times.append(t)
-        for v in ds[var].values[:]:
-            values.append(v.squeeze())
-        ds.close()
-    return times, np.array(values)
-
-
-class Run:
-    """
-    Represents the style and data for a specific run.
-    """
-
-    def __str__(self):
-        return f'    Run(runid={self.runid}, name={self.name}, line={self.line}, color={self.color}, marker={self.marker}, dir={self.dir})'
-
-    def __init__(self, cdir, runid, name, line="-", color="black", marker=None):
-        """
-        Initializes a Run object.
-
-        Args:
-            runid (str): Identifier for the run.
-            name (str): Name of the run.
-            line (str): Line style for plotting.
-            color (str): Color for plotting.
-        """
-        self.runid = runid
-        self.name = name
-        self.line = line
-        self.marker = marker
-        self.color = color
-        self.dir = os.path.join(cdir, self.runid)
-        self.ts = {}
-
-    def load_ts(self, plots):
-        """
-        Loads time series data for the run using a Plot object.
-    
-        Args:
-            plots (list): List of Plot configuration objects.
-    
-        Returns:
-            pd.DataFrame: Time series data.
-        """
-        for plot in plots:
-            file_pattern = plot.file_pattern
-            var_pattern = plot.var  # ex: 'toto|titi'
-            sf = plot.sf
-            files = glob.glob(os.path.join(self.dir, file_pattern))
-            print(plot)
-            if not files:
-                raise FileNotFoundError(f'No files match {file_pattern} in {self.dir}')
-    
-            # get time dimension and variable
-            TIME_REGEX = re.compile(r'^time(?!.*bounds)(_.*)?$', re.IGNORECASE)
-            ds = xr.open_dataset(files[0])
-            for dim in ds.dims:
-                if TIME_REGEX.match(dim):
-                    ctime_dim = dim
-           
-            ctime = None
-            for coord in ds.coords:
-                if TIME_REGEX.match(coord):
-                    ctime = coord
-
-            if ctime == None:
-                for var in ds.data_vars:
-                    if TIME_REGEX.match(var):
-                        ctime = var
-
-            # gestion des variables avec regex
-            matched_vars = [v for v in ds.data_vars if re.fullmatch(var_pattern, v)]
-            if not matched_vars:
-                raise KeyError(f"No variable in dataset matches pattern '{var_pattern}'")
-            if len(matched_vars) > 1:
-                raise ValueError(f"Multiple variables match pattern '{var_pattern}': {matched_vars}")
-    
-            var = matched_vars[0]  # on prend la seule variable valide
- 
-            times, data = read_scalar_timeseries(files, var=var, time_name=ctime)
-
-            # Exemple : si runid doit être décalé
-            if self.runid in ["IPSLCM-ECM71-ico-LR-pi-01"]:
-                times = [cftime.DatetimeNoLeap(t.year - 20, t.month, t.day) for t in times]
-
-            da = xr.DataArray(data * sf, [(ctime, times)], name=self.name).sortby(ctime)
-
-            # manage time
-            try:
-                da[ctime] = pd.to_datetime(da.indexes[ctime])
-            except:
-                da[ctime] = da.indexes[ctime].to_datetimeindex()
-            self.ts[plot.name] = da.to_dataframe(name=self.name)
-
-        return self.ts
-
-    def plot_ts(self, ax, plot):
-        """
-        Plots the time series data on the given axis.
-
-        Args:
-            ax (matplotlib.axes.Axes): Axis to plot on.
-            var (str): Variable to plot.
-
-        Raises:
-            ValueError: If time series data is not loaded.
-        """
-        if self.ts is None:
-            raise ValueError(f"Time series not loaded for run {self.runid}")
-
-        self.ts[plot.name].plot(ax=ax, legend=False, label=self.name, linestyle=self.line, marker=self.marker, color=self.color, linewidth=2)
-
-        rmin  = self.ts[plot.name].values.min()
-        rmax  = self.ts[plot.name].values.max()
-
-        tmin = self.ts[plot.name].index.min()
-        tmax = self.ts[plot.name].index.max()
-
-        # set x axis
-        ax.tick_params(axis='both', labelsize=18)
-#        if (not plot.time):
-#            ax.set_xticklabels([])
-#        else:
-#            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-        for lt in ax.get_xticklabels():
-            lt.set_ha('center')
-        ax.set_xlabel('')
-
-        return rmin, rmax, tmin, tmax
-
-
-class Plot:
-    """
-    Represents a plot configuration.
-    """
-
-    def __str__(self):
-        return f'        Plot(name={self.name}, var={self.var}, file_pattern={self.file_pattern}, sf={self.sf}, title={self.title}, loc={self.row}|{self.col})'
-
-    def __init__(self, data, obs=None):
-        """
-        Initializes a Plot object.
-
-        Args:
-            data (dict): Dictionary containing plot configuration.
-        """
-        self.name = data.get("NAME", "UNKNOWN")
-        self.pref = data.get("PREF", None)
-        self.var = data.get("VAR", None)
-        self.file_pattern = data.get("FILE_PATTERN", None)
-        self.sf = data.get("SF", 1.0)
-        self.title = data.get("TITLE", "UNKNOWN")
-        if ( self.pref != None ):
-            self.title = f"{self.pref} {self.title}"
-        self.row = data.get("ROW", 1)
-        self.col = data.get("COL", 1)
-        self.rowspan = data.get("ROWSPAN", 1)
-        self.colspan = data.get("COLSPAN", 1)
-        self.time = data.get("TIME", True)
-        self.fig_file = data.get("FIG_FILE", None)
-        if obs:
-            self.ymin = obs.obs_min
-            self.ymax = obs.obs_max
-        else:
-            self.ymin =  9999.
-            self.ymax = -9999.
-
-    def plot_timeseries(self, runs):
-        """
-        Plots time series data for the given plot configuration.
-
-        Args:
-            ax (matplotlib.axes.Axes): Axis to plot on.
-            runs (list): List of Run objects containing time series data.
-
-        Returns:
-            tuple: Handles and labels for the legend.
-        """
-        rmin = self.ymin
-        rmax = self.ymax
-        for run in runs:
-            zmin, zmax, tmin, tmax = run.plot_ts(self.ax, self)
-            rmin = min(rmin, zmin)
-            rmax = max(rmax, zmax)
-#            xmin = min(xmin, tmin)
-#            xmax = min(xmax, tmax)
-        rrange = rmax - rmin
-        self.ymin = rmin - 0.02 * rrange
-        self.ymax = rmax + 0.02 * rrange
-
-#        self.xmin = xmin - pd.DateOffset(months=6)
-#        self.xmax = xmax - pd.DateOffset(months=6)
-
-        self.ax.set_ylim([self.ymin, self.ymax])
-        hl, lb = self.ax.get_legend_handles_labels()
-        self.ax.set_title(self.title, fontsize=24)
-        self.ax.grid(True)
-        return hl, lb
-
-    def plot_observation(self, obs):
-        """
-        Plots observation data for the given plot configuration.
-
-        Args:
-            ax (matplotlib.axes.Axes): Axis to plot on.
-            obs (Obs): Observation data for the plot.
-        """
-
-    
-        if obs is not None:
-            # Add an additional axis for observations to the right
-            x0 = self.ax.get_position().x1
-            x1 = x0 + 0.02
-            y0 = self.ax.get_position().y0
-            y1 = self.ax.get_position().y1
-
-            # define axes for observation
-            obs_ax = plt.axes([x0+0.005, y0, x1-x0, y1-y0])
-            obs_ax.set_visible(True)
-
-            # plot observation
-            plt.errorbar(0, obs.mean, yerr=obs.std, fmt='*', markeredgecolor='k', markersize=8, color='k', linewidth=2)
-            obs_ax.set_xlim([-1, 1])
-            obs_ax.set_ylim([self.ymin, self.ymax])
-            obs_ax.set_xticks([])
-            obs_ax.set_yticklabels([])
-            obs_ax.grid()
-
-    def set_ax(self, fig, gs):
-        """
-        Sets the axis for the plot using GridSpec.
-
-        Args:
-            fig (matplotlib.figure.Figure): The figure to add the subplot to.
-            gs (matplotlib.gridspec.GridSpec): The GridSpec object defining the grid layout.
-        """
-        row = self.row - 1
-        col = self.col - 1
-        self.ax = fig.add_subplot(gs[row:row + self.rowspan, col:col + self.colspan])
-        self.ax.set_visible(True)
-
-
-class Obs:
-    """
-    Represents observation data for a specific variable.
-
-    Attributes:
-        mean (float): Mean value of the observation.
-        std (float): Standard deviation of the observation.
-        ref (str): Reference name for the observation.
-    """
-
-    def __init__(self, data):
-        """
-        Initializes an Obs object by loading data from a YAML file.
-
-        Args:
-            data (dict): Dictionary containing observation data.
-        """
-        self.name = data["NAME"]
-        self.mean = data["MEAN"]
-        self.std = data["STD"]
-        self.ref = data.get("REF", "OBS")
-        self.obs_max=self.mean+self.std
-        self.obs_min=self.mean-self.std
-
-    def __str__(self):
-        """
-        Returns a string representation of the Obs object.
-
-        Returns:
-            str: String representation of the observation data.
-        """
-        return f"    Obs(name={self.name}, mean={self.mean}, std={self.std}, ref={self.ref})"
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+from valso_data import load_yaml, load_runs, load_plots, load_obss, load_runs_ts, score_matrix, yaml_modified, DOWNSAMPLE_METHODS, PROFILER
 
+OUTPUT_FORMATS = ("png", "pdf", "svg")
+RASTERIZE_POINTS = 5000  # lines with more points are rasterized in vector outputs
 
+# ===================== CLASSES =====================
 class Figure:
     """
     Represents the configuration for a figure, including layout, legend, and subplots.
@@ -319,6 +40,7 @@ class Figure:
         self.legend = data.get("legend", {"NCOL": 3, "AXES": [0.01, 0.01, 0.92, 0.06]})
         self.ts = data.get("ts", {})
         self.map = data.get("map", {})
+        self.scorecard = data.get("scorecard", {})
         self.layout = data.get("layout", {
             "SUBPLOT": [1, 1],
             "SIZE": [210, 210],
@@ -336,9 +58,32 @@ class Figure:
         return (
             f"Figure(description={self.description}, "
             f"ts_keys={list(self.ts.keys())}, "
-            f"map={self.map})"
+            f"map={self.map}, "
+            f"scorecard={self.scorecard})"
         )
 
+    def selection(self, plots_cfg, obss_cfg):
+        """
+        Returns the plot keys needed by the figure.
+
+        For a scorecard figure, these are the scorecard KEYS (default: every key
+        of obs.yml defined in plots.yml), otherwise the keys of the ts section.
+
+        Args:
+            plots_cfg (str): Path to the plot configuration file.
+            obss_cfg (str): Path to the observation configuration file.
+
+        Returns:
+            dict: Plot keys and their layout.
+        """
+        if not self.scorecard:
+            return self.ts
+        keys = self.scorecard.get("KEYS", None)
+        if keys is None:
+            all_plots = load_yaml(plots_cfg).get("plots", {})
+            keys = [key for key in load_yaml(obss_cfg).get("obs", {}) if key in all_plots]
+        return {key: {} for key in keys}
+
     def plot_map(self, fig, gs):
         """
         Plots a map image for the given plot configuration.
@@ -383,7 +128,7 @@ class Figure:
         lax.set_axis_off()
         return lax
 
-    def generate(self, runids, plots_cfg, style_cfg, obss_cfg, cdir=".", out="output.png"):
+    def generate(self, runids, plots_cfg, style_cfg, obss_cfg, cdir=".", out="output.png", jobs=1, downsample=None, formats=None, thumb=None):
         """
         Generates a single figure based on the current configuration.
 
@@ -394,161 +139,698 @@ class Figure:
             obss_cfg (str): Path to the observation configuration file.
             cdir (str): Base directory for data files.
             out (str): Output file name for the generated plot.
+            jobs (int): Number of worker processes used to load the runs.
+            downsample (str): Default downsampling method of the time series (see render).
+            formats (list): Output formats (see save).
+            thumb (int): DPI of an additional PNG thumbnail (see save).
+        """
+        generate_figures([(self, runids, out)], plots_cfg, style_cfg, obss_cfg, cdir, jobs, downsample, formats, thumb)
+
+    def render(self, runs, plots, obss, out="output.png", downsample=None, formats=None, thumb=None):
+        """
+        Renders the figure from runs whose time series are already loaded.
+
+        Series are downsampled to the pixel width of their panel with the DOWNSAMPLE
+        method of the plot (plots.yml or figs.yml, false to disable), or with the
+        default method if the plot does not set it. Lines with more points than
+        RASTERIZE (layout section, default RASTERIZE_POINTS) are rasterized in
+        the vector outputs.
+
+        Args:
+            runs (list): List of Run objects with loaded time series.
+            plots (list): List of Plot objects of the figure.
+            obss (dict): Dictionary of Obs objects.
+            out (str): Output file name for the generated plot.
+            downsample (str): Default downsampling method (None to draw every point).
+            formats (list): Output formats (see save).
+            thumb (int): DPI of an additional PNG thumbnail (see save).
         """
         print('')
-        print(f"🔄 Generating figure: {out}")
+        print(f"🔄 Generating figure: {getattr(out, 'name', out)}")
         print(self)
         print('')
 
-        obss = load_obss(obss_cfg, self)
-        plots = load_plots(plots_cfg, self, obss)
-        runs = load_runs(style_cfg, runids, cdir)
+        name = os.path.basename(getattr(out, 'name', str(out)))
+        if RENDER_CACHE.dir and not thumb and all(fmt == "png" for _, fmt, _ in output_files(out, formats, self.layout["DPI"])):
+            self.render_tiles(runs, plots, obss, output_files(out, formats, self.layout["DPI"])[0][0], downsample)
+            return
+
+        PROFILER.set_scope(name)
+        with PROFILER.stage("layout"):
+            # Create subplots
+            nrows = self.layout["SUBPLOT"][0]
+            ncols = self.layout["SUBPLOT"][1]
+            figsize = np.array([self.layout["SIZE"][0] * ncols, self.layout["SIZE"][1] * nrows]) / 25.4  # width, height
+            fig = plt.figure(figsize=figsize)
+            gs = GridSpec(nrows, ncols, figure=fig)
+
+            # Set axes for each plot
+            for plot in plots:
+                plot.set_ax(fig, gs)
 
-        for run in runs:
-            print('')
-            print(run)
-            print('')
-            run.load_ts(plots)
+        # Plot time series
+        for plot in plots:
+            method = downsample if plot.downsample is None else plot.downsample
+            npix = int(plot.ax.get_position().width * fig.get_figwidth() * self.layout["DPI"])
+            hl, lb = plot.plot_timeseries(runs, npix, method)
 
+        PROFILER.set_scope(name)
+        with PROFILER.stage("layout"):
+            # Plot map if specified
+            if self.map:
+                self.plot_map(fig, gs)
+
+            # Adjust layout
+            plt.subplots_adjust(*self.layout["ADJUST"])
+
+        # Plot observations
+        for plot in plots:
+            PROFILER.set_scope(name, plot=plot.name)
+            with PROFILER.stage("obs"):
+                obs = obss.get(plot.name, None)
+                plot.plot_observation(obs)
+
+        PROFILER.set_scope(name)
+        with PROFILER.stage("layout"):
+            # Add legend
+            self.add_legend(fig, hl, lb, lvis=True)
+
+        # dense lines are drawn as images in the vector outputs
+        npoint = self.layout.get("RASTERIZE", RASTERIZE_POINTS)
+        if npoint:
+            for plot in plots:
+                for line in plot.ax.get_lines():
+                    if len(line.get_xdata()) > npoint:
+                        line.set_rasterized(True)
+
+        # Finalize and save figure
+        self.save(fig, out, formats, thumb)
         print('')
 
-        # Create subplots
+        plt.close(fig)
+
+    def save(self, fig, out, formats=None, thumb=None):
+        """
+        Saves a figure in every output format from a single layout.
+
+        The tight bounding box is computed once and shared by all the outputs,
+        instead of one extra draw per savefig(bbox_inches='tight').
+
+        Args:
+            fig (matplotlib.figure.Figure): Figure to save.
+            out (str): Output file name (or binary file object).
+            formats (list): Output formats (png, pdf, svg), written next to out
+                with their extension (default: the format of out).
+            thumb (int): DPI of an additional PNG thumbnail (<out>_thumb.png).
+        """
+        dpi = self.layout["DPI"]
+        with PROFILER.stage("savefig"):
+            fig.set_dpi(dpi)
+            bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(matplotlib.rcParams["savefig.pad_inches"])
+            for path, fmt, fdpi in output_files(out, formats, dpi, thumb):
+                fig.savefig(path, dpi=fdpi, format=fmt, bbox_inches=bbox)
+                print(f"✅ Saved {getattr(path, 'name', path)}")
+
+    def canvas(self):
+        """
+        Creates an empty figure with the layout of the figure.
+
+        Returns:
+            tuple: The matplotlib figure and its GridSpec.
+        """
         nrows = self.layout["SUBPLOT"][0]
         ncols = self.layout["SUBPLOT"][1]
         figsize = np.array([self.layout["SIZE"][0] * ncols, self.layout["SIZE"][1] * nrows]) / 25.4  # width, height
         fig = plt.figure(figsize=figsize)
         gs = GridSpec(nrows, ncols, figure=fig)
-        
-        # Set axes for each plot
-        for plot in plots:
-            plot.set_ax(fig, gs)
+        return fig, gs
 
-        # Plot time series
-        for plot in plots:
-            hl, lb = plot.plot_timeseries(runs)
+    def render_tiles(self, runs, plots, obss, out="output.png", downsample=None):
+        """
+        Renders the figure from cached panels, drawing only the panels whose content changed.
 
-        # Plot map if specified
-        if self.map:
-            self.plot_map(fig, gs)
+        Every panel (time series and obs axes), the map and the legend is drawn
+        alone on a figure of the full size and kept as a bitmap tile in the
+        render cache, under a hash of everything it depends on (see RENDER_CACHE).
+        The figure is composited from the tiles, so changing one run style or
+        adding a panel only redraws the affected tiles.
 
-        # Adjust layout
-        plt.subplots_adjust(*self.layout["ADJUST"])
-        
-        # Plot observations
+        Args:
+            runs (list): List of Run objects with loaded time series.
+            plots (list): List of Plot objects of the figure.
+            obss (dict): Dictionary of Obs objects.
+            out (str): Output file name (or binary file object) for the generated plot.
+            downsample (str): Default downsampling method (None to draw every point).
+        """
+        name = os.path.basename(getattr(out, 'name', str(out)))
+        dpi = self.layout["DPI"]
+        styles = [(run.name, run.line, run.color, run.marker) for run in runs]
+        tiles = []
+        ndraw = 0
+
+        # time series panels
         for plot in plots:
+            PROFILER.set_scope(name, plot=plot.name)
             obs = obss.get(plot.name, None)
-            plot.plot_observation(obs)
+            method = downsample if plot.downsample is None else plot.downsample
+            series = [run.ts[plot.key] for run in runs if plot.key in run.ts]
+            key = RENDER_CACHE.key("panel", self.layout, plot, obs, styles, series, method)
+            tile = RENDER_CACHE.get(key)
+            if tile is None:
+                with PROFILER.stage("layout"):
+                    fig, gs = self.canvas()
+                    plot.set_ax(fig, gs)
+                npix = int(plot.ax.get_position().width * fig.get_figwidth() * dpi)
+                plot.plot_timeseries(runs, npix, method)
+                PROFILER.set_scope(name, plot=plot.name)
+                with PROFILER.stage("obs"):
+                    plt.subplots_adjust(*self.layout["ADJUST"])
+                    plot.plot_observation(obs)
+                tile = RENDER_CACHE.put(key, fig, dpi)
+                ndraw += 1
+            tiles.append(tile)
+
+        PROFILER.set_scope(name)
+        with PROFILER.stage("layout"):
+            # map
+            if self.map:
+                img = os.stat(self.map["FILE"]) if os.path.exists(self.map["FILE"]) else None
+                key = RENDER_CACHE.key("map", self.layout, self.map, img and (img.st_mtime, img.st_size))
+                tile = RENDER_CACHE.get(key)
+                if tile is None:
+                    fig, gs = self.canvas()
+                    self.plot_map(fig, gs)
+                    plt.subplots_adjust(*self.layout["ADJUST"])
+                    tile = RENDER_CACHE.put(key, fig, dpi)
+                    ndraw += 1
+                tiles.append(tile)
+
+            # legend (same handles as the lines drawn by Run.plot_ts)
+            key = RENDER_CACHE.key("legend", self.layout, self.legend, styles)
+            tile = RENDER_CACHE.get(key)
+            if tile is None:
+                fig, _ = self.canvas()
+                handles = [Line2D([], [], linestyle=line, marker=marker, color=color, linewidth=2) for _, line, color, marker in styles]
+                self.add_legend(fig, handles, [style[0] for style in styles], lvis=True)
+                tile = RENDER_CACHE.put(key, fig, dpi)
+                ndraw += 1
+            tiles.append(tile)
+
+        with PROFILER.stage("savefig"):
+            plt.imsave(out, composite(tiles, dpi), dpi=dpi, format="png")
+        print(f"✅ Saved {getattr(out, 'name', out)} ({len(tiles) - ndraw}/{len(tiles)} panels from the render cache)")
+        print('')
 
-        # Add legend
-        self.add_legend(fig, hl, lb, lvis=True)
+    def render_scorecard(self, runs, plots, obss, out="output.png", formats=None, thumb=None):
+        """
+        Renders a runs x keys heatmap of the normalized departures from the obs ranges.
 
-        # Finalize and save figure
-        plt.savefig(out, dpi=self.layout["DPI"], bbox_inches='tight')
-        print(f"✅ Saved {out}")
+        The departures (see score_matrix) are drawn as one dense array by a single
+        imshow call, so the cost does not depend on the number of runs. Cells
+        inside the obs range are 0, missing series are left blank.
+
+        Args:
+            runs (list): List of Run objects with loaded time series.
+            plots (list): List of Plot objects (keys with an Obs entry).
+            obss (dict): Dictionary of Obs objects.
+            out (str): Output file name (or binary file object) for the generated plot.
+            formats (list): Output formats (see save).
+            thumb (int): DPI of an additional PNG thumbnail (see save).
+        """
+        print('')
+        print(f"🔄 Generating scorecard: {getattr(out, 'name', out)}")
+        print(self)
+        print('')
+
+        PROFILER.set_scope(os.path.basename(getattr(out, 'name', str(out))))
+        plots = [plot for plot in plots if plot.name in obss]
+        with PROFILER.stage("score"):
+            scores = score_matrix(runs, plots, obss, self.scorecard.get("PERIOD", None))
+        departure = np.ma.masked_invalid(scores["departure"])
+        nrun, nkey = departure.shape
+
+        # cell size (width, height) in mm
+        cell = self.scorecard.get("CELL", [15, 5])
+        figsize = np.array([max(nkey * cell[0] + 80, 150), max(nrun * cell[1] + 60, 100)]) / 25.4
+        fig, ax = plt.subplots(figsize=figsize)
+
+        vmax = self.scorecard.get("VMAX", 2.0)
+        cmap = plt.get_cmap(self.scorecard.get("CMAP", "RdBu_r")).copy()
+        cmap.set_bad("lightgrey")
+        with PROFILER.stage("plot"):
+            im = ax.imshow(departure, cmap=cmap, vmin=-vmax, vmax=vmax, aspect="auto", interpolation="nearest")
+
+        # labels
+        fontsize = self.scorecard.get("FONTSIZE", 10)
+        ax.set_xticks(np.arange(nkey))
+        ax.set_xticklabels([plot.title for plot in plots], rotation=60, ha="left", fontsize=fontsize)
+        ax.xaxis.tick_top()
+        ax.set_yticks(np.arange(nrun))
+        ax.set_yticklabels([run.name for run in runs], fontsize=fontsize)
+        ax.set_title(self.description.get("NAME", ""), fontsize=fontsize + 4)
+
+        cb = fig.colorbar(im, ax=ax, extend="both", fraction=0.05, pad=0.02)
+        cb.set_label("departure from obs range (range width)", fontsize=fontsize)
+
+        self.save(fig, out, formats, thumb)
         print('')
 
         plt.close(fig)
 
+class RenderCache:
+    """
+    Content-addressed cache of rendered figure panels (see Figure.render_tiles).
+
+    A tile is the RGBA bitmap of one panel drawn alone on a figure of the full
+    size, cropped to its tight bounding box, with its position in pixels. It is
+    stored in the cache directory under the SHA-1 of everything the drawing
+    depends on: the series values, the plot and obs definitions, the run
+    styles, the figure layout and the matplotlib version. Tiles are never
+    invalidated, a changed input gives a new key; the directory can be
+    safely deleted.
+    """
 
-# ===================== LOADERS =====================
-def load_yaml(file_path):
+    def __str__(self):
+        return f'    RenderCache(dir={self.dir}, hits={self.hits}, misses={self.misses})'
+
+    def __init__(self):
+        """
+        Initializes a disabled RenderCache object (see enable).
+        """
+        self.dir = None
+        self.hits = 0
+        self.misses = 0
+
+    def enable(self, cdir):
+        """
+        Enables the render cache.
+
+        Args:
+            cdir (str): Directory of the cached tiles.
+        """
+        os.makedirs(cdir, exist_ok=True)
+        self.dir = cdir
+
+    @staticmethod
+    def key(*parts):
+        """
+        Returns the hash of the inputs of a tile.
+
+        Args:
+            *parts: Inputs of the tile (primitives, Plot or Obs objects, DataFrames).
+
+        Returns:
+            str: Hexadecimal SHA-1 digest.
+        """
+        sha = hashlib.sha1(matplotlib.__version__.encode())
+
+        def feed(part):
+            if isinstance(part, (list, tuple)):
+                sha.update(b"[")
+                for item in part:
+                    feed(item)
+                sha.update(b"]")
+            elif isinstance(part, dict):
+                feed(sorted(part.items(), key=lambda item: str(item[0])))
+            elif hasattr(part, "index") and hasattr(part, "values"):
+                # DataFrame: time axis and values
+                sha.update(np.ascontiguousarray(part.index.values).tobytes())
+                sha.update(np.ascontiguousarray(part.values).tobytes())
+            elif hasattr(part, "__dict__"):
+                # Plot or Obs: its definition (not the axes nor the y-range set while drawing)
+                feed({k: v for k, v in vars(part).items() if k not in ("ax", "ylim")})
+            else:
+                sha.update(repr(part).encode())
+
+        for part in parts:
+            feed(part)
+        return sha.hexdigest()
+
+    def get(self, key):
+        """
+        Returns a cached tile.
+
+        Args:
+            key (str): Tile hash.
+
+        Returns:
+            tuple: (x0, y1, rgba) position of the top left corner in pixels and
+                RGBA array, or None if the tile is not cached.
+        """
+        path = os.path.join(self.dir, f"{key}.npz")
+        try:
+            with np.load(path) as data:
+                tile = (int(data["x0"]), int(data["y1"]), data["rgba"])
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tile
+
+    def put(self, key, fig, dpi):
+        """
+        Renders a figure as a tile, stores it and closes the figure.
+
+        Args:
+            key (str): Tile hash.
+            fig (matplotlib.figure.Figure): Figure holding the drawing of the tile only.
+            dpi (int): Resolution of the output figure.
+
+        Returns:
+            tuple: (x0, y1, rgba), see get.
+        """
+        with PROFILER.stage("savefig"):
+            # tight box of the drawing, on the pixel grid of the output figure
+            bbox = fig.get_tightbbox(fig.canvas.get_renderer())
+            x0, y0 = int(np.floor(bbox.x0 * dpi)), int(np.floor(bbox.y0 * dpi))
+            x1, y1 = int(np.ceil(bbox.x1 * dpi)), int(np.ceil(bbox.y1 * dpi))
+            buf = io.BytesIO()
+            fig.savefig(buf, format="png", dpi=dpi, facecolor="none", bbox_inches=Bbox([[x0 / dpi, y0 / dpi], [x1 / dpi, y1 / dpi]]))
+            buf.seek(0)
+            rgba = np.round(plt.imread(buf, format="png") * 255.).astype(np.uint8)
+        plt.close(fig)
+
+        tmp = os.path.join(self.dir, f"{key}.{os.getpid()}.npz")
+        try:
+            with open(tmp, "wb") as fid:
+                np.savez_compressed(fid, x0=x0, y1=y1, rgba=rgba)
+            os.replace(tmp, os.path.join(self.dir, f"{key}.npz"))
+        except OSError as e:
+            print(f"⚠️ Warning: could not write render cache {self.dir}: {e}")
+        return x0, y1, rgba
+
+
+RENDER_CACHE = RenderCache()
+
+
+def output_files(out, formats=None, dpi=150, thumb=None):
     """
-    Loads a YAML file.
+    Returns the files written for one figure output.
 
     Args:
-        file_path (str): Path to the YAML file.
+        out (str): Output file name (or binary file object, written in its own format only).
+        formats (list): Output formats, the extension of out is replaced by each of them
+            (default: the format of out).
+        dpi (int): Resolution of the raster outputs.
+        thumb (int): DPI of an additional PNG thumbnail (<out>_thumb.png).
 
     Returns:
-        dict: Parsed YAML data.
+        list: List of (file, format, dpi) tuples.
     """
-    with open(file_path) as fid:
-        return yaml.safe_load(fid)
+    if not isinstance(out, str):
+        ext = os.path.splitext(getattr(out, 'name', ''))[1][1:].lower()
+        return [(out, ext or "png", dpi)]
+    root, ext = os.path.splitext(out)
+    files = [(f"{root}.{fmt}", fmt, dpi) for fmt in (formats or [ext[1:].lower() or "png"])]
+    if thumb:
+        files.append((f"{root}_thumb.png", "png", thumb))
+    return files
 
 
-def load_runs(style_file, runids, cdir):
+def composite(tiles, dpi):
     """
-    Loads run styles from a YAML file.
+    Composites tiles over a white background, cropped as savefig(bbox_inches='tight').
 
     Args:
-        style_file (str): Path to the style configuration file.
-        runids (list): List of run IDs to load.
-        cdir (str): Base directory for the runs.
+        tiles (list): List of (x0, y1, rgba) tiles (see RenderCache.get).
+        dpi (int): Resolution of the figure.
 
     Returns:
-        list: List of Run objects.
+        np.ndarray: RGB image (uint8).
+    """
+    pad = int(round(matplotlib.rcParams["savefig.pad_inches"] * dpi))
+    left = min(x0 for x0, _, _ in tiles) - pad
+    top = max(y1 for _, y1, _ in tiles) + pad
+    right = max(x0 + rgba.shape[1] for x0, _, rgba in tiles) + pad
+    bottom = min(y1 - rgba.shape[0] for _, y1, rgba in tiles) - pad
+
+    image = np.full((top - bottom, right - left, 3), 255, dtype=np.uint8)
+    for x0, y1, rgba in tiles:
+        i, j = top - y1, x0 - left
+        h, w = rgba.shape[:2]
+        block = image[i:i + h, j:j + w]
+        alpha = rgba[..., 3:].astype(np.float32) / 255.
+        block[...] = np.round(rgba[..., :3] * alpha + block * (1. - alpha))
+    return image
+
+
+class RunWatcher:
+    """
+    Waits for files to be added or changed in a set of run directories.
 
-    Raises:
-        ValueError: If a run ID is not found in the style file.
+    inotify is used when the inotify_simple module is available (events are
+    gathered until the directories are quiet for SETTLE seconds), otherwise the
+    directories are listed and stat-ed every interval seconds. Hidden files
+    (catalog and cache sidecars) are ignored.
     """
-    data = load_yaml(style_file).get("runs", {})
-    runs = []
-    for rid in runids:
-        if rid not in data:
-            raise ValueError(f"RunID {rid} not found in style file")
-        info = data[rid]
-        runs.append(Run(cdir, rid, info.get("NAME", rid), info.get("LINE", "-"), info.get("COLOR", "black")))
-    return runs
 
+    SETTLE = 5
 
-def load_plots(plots_file, figure, obss):
-    """
-    Loads selected plots from plots.yml database based on figs.yml selection.
+    def __str__(self):
+        return f'    RunWatcher(mode={self.mode}, dirs={len(self.dirs)}, interval={self.interval})'
 
-    Args:
-        plots_file (str): Path to the plots.yml file.
-        figure (Figure): Figure object containing layout and configuration.
+    def __init__(self, dirs, interval=60):
+        """
+        Initializes a RunWatcher object.
 
-    Returns:
-        list: List of Plot objects.
+        Args:
+            dirs (list): Run directories to watch.
+            interval (float): Polling period in seconds (without inotify).
+        """
+        self.dirs = list(dirs)
+        self.interval = interval
+        self.watches = {}
+        self.inotify = None
+        if INotify is not None:
+            try:
+                self.inotify = INotify()
+                for cdir in self.dirs:
+                    self.add_watches(cdir, cdir)
+            except OSError as e:
+                print(f"⚠️ Warning: inotify not available ({e}), falling back to polling")
+                self.inotify = None
+        self.mode = "inotify" if self.inotify is not None else "polling"
+        self.snapshots = {cdir: self.snapshot(cdir) for cdir in self.dirs} if self.inotify is None else {}
+
+    def add_watches(self, path, cdir):
+        """
+        Watches a directory and its (non hidden) sub-directories.
 
-    Raises:
-        ValueError: If a plot key is not found in plots.yml or figs.yml is invalid.
-    """
-    all_plots = load_yaml(plots_file).get("plots", {})
-    figs = dict(sorted(figure.ts.items(), key=lambda item: item[0]))  # for easy unit testing
-    selected = []
+        Args:
+            path (str): Directory to watch.
+            cdir (str): Run directory it belongs to.
+        """
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.DELETE | flags.CREATE
+        self.watches[self.inotify.add_watch(path, mask)] = (path, cdir)
+        for entry in os.scandir(path):
+            if entry.is_dir() and not entry.name.startswith('.'):
+                self.add_watches(entry.path, cdir)
+
+    def snapshot(self, cdir):
+        """
+        Lists the (non hidden) files of a run directory with their mtime and size.
+
+        Args:
+            cdir (str): Run directory.
 
-    for key, layout in figs.items():
-        if key not in all_plots:
-            raise ValueError(f"Plot key {key} not found in plots.yml")
-        data = dict(all_plots[key])
-        data.update(layout)  # add row/col info
-        data["NAME"] = key  # add the plot key as NAME
-        selected.append(Plot(data, obss.get(key, None)))
-    return selected
+        Returns:
+            dict: (mtime, size) per file path.
+        """
+        files = {}
+        stack = [cdir]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    else:
+                        st = entry.stat()
+                        files[entry.path] = (st.st_mtime, st.st_size)
+        return files
+
+    def close(self):
+        """
+        Releases the inotify instance (if any).
+        """
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
 
+    def wait(self, timeout=None):
+        """
+        Blocks until files are added or changed in some of the run directories.
 
-def load_obss(obss_file, figure):
+        Args:
+            timeout (float): Maximum waiting time in seconds (None to wait for a change).
+
+        Returns:
+            set: Run directories with new or changed files (empty after a timeout).
+        """
+        while True:
+            changed = set()
+            if self.inotify is not None:
+                events = self.inotify.read(timeout=None if timeout is None else int(timeout * 1000))
+                while events:
+                    for event in events:
+                        if event.wd not in self.watches or event.name.startswith('.'):
+                            continue
+                        path, cdir = self.watches[event.wd]
+                        if event.mask & flags.ISDIR and event.mask & flags.CREATE:
+                            self.add_watches(os.path.join(path, event.name), cdir)
+                        changed.add(cdir)
+                    events = self.inotify.read(timeout=self.SETTLE * 1000)
+            else:
+                time.sleep(self.interval)
+                for cdir in self.dirs:
+                    snapshot = self.snapshot(cdir)
+                    if snapshot != self.snapshots[cdir]:
+                        self.snapshots[cdir] = snapshot
+                        changed.add(cdir)
+            if changed or timeout is not None:
+                return changed
+
+class Dashboard:
+    """
+    Renders figures on demand for a HTTP server and keeps the rendered bytes.
+
+    A figure is rendered on its first request and the PNG bytes are served from
+    memory afterwards. Entries are invalidated when one of their series changes
+    (the run directories are watched in a background thread, see RunWatcher)
+    and all of them when a YAML configuration changes. Rendering and data
+    updates are serialized by one lock (pyplot is not thread safe), a figure
+    requested by several viewers at once is rendered only once.
     """
-    Loads observation data from obs.yml based on figs.yml selection.
 
-    Args:
-        obss_file (str): Path to the obs.yml file.
-        figure (Figure): Figure object containing layout and configuration.
+    def __str__(self):
+        return f'    Dashboard(figures={list(self.outs)}, cached={list(self.cache)})'
 
-    Returns:
-        dict: Dictionary of Obs objects.
+    def __init__(self, load_entries, plots_cfg, style_cfg, obss_cfg, cdir=".", jobs=1, downsample=None, interval=60):
+        """
+        Initializes a Dashboard object and loads the series of all its figures.
 
-    Raises:
-        ValueError: If a plot key is not found in obs.yml or figs.yml is invalid.
+        Args:
+            load_entries (callable): Returns the list of (Figure, runids, out) tuples.
+            plots_cfg (str): Path to the plot configuration file.
+            style_cfg (str): Path to the style configuration file.
+            obss_cfg (str): Path to the observation configuration file.
+            cdir (str): Base directory for data files.
+            jobs (int): Number of worker processes used to load the runs.
+            downsample (str): Default downsampling method of the time series.
+            interval (float): Polling period in seconds (when inotify is not available).
+        """
+        self.load_entries = load_entries
+        self.cfgs = (plots_cfg, style_cfg, obss_cfg, cdir, jobs)
+        self.downsample = downsample
+        self.interval = interval
+        self.lock = threading.RLock()
+        self.cache = {}
+        self.setup()
+
+    def setup(self):
+        """
+        Loads (or reloads) the configurations and the series, and drops the rendered figures.
+        """
+        plots_cfg, style_cfg, obss_cfg, cdir, jobs = self.cfgs
+        with self.lock:
+            self.figures, self.runs, self.needed = load_figures(self.load_entries(), plots_cfg, style_cfg, obss_cfg, cdir, jobs)
+            self.outs = {os.path.basename(entry[2]): entry for entry in self.figures}
+            self.cache = {}
+            self.watcher = RunWatcher([run.dir for run in self.runs.values()], self.interval)
+
+    def watch(self):
+        """
+        Updates the series as new files land in the run directories and drops
+        the rendered figures using a changed series (background thread).
+        """
+        while True:
+            watcher = self.watcher
+            dirs = watcher.wait(timeout=self.interval)
+            with self.lock:
+                if watcher is not self.watcher:
+                    # configurations reloaded, switch to the new watcher
+                    watcher.close()
+                    continue
+                changed = update_runs(self.runs, self.needed, dirs)
+                for name, (_, runids, _, _, plots) in self.outs.items():
+                    if any((rid, plot.key) in changed for rid in runids for plot in plots):
+                        self.cache.pop(name, None)
+
+    def get(self, name):
+        """
+        Returns the PNG bytes of a figure, rendered only if not cached.
+
+        Args:
+            name (str): Base name of the figure output file.
+
+        Returns:
+            bytes: PNG image (None if the figure is unknown).
+        """
+        if yaml_modified():
+            with self.lock:
+                if yaml_modified():
+                    self.setup()
+        data = self.cache.get(name)
+        if data is not None:
+            return data
+        with self.lock:
+            # another viewer may have rendered it while we were waiting
+            if name in self.cache or name not in self.outs:
+                return self.cache.get(name)
+            figure, runids, out, obss, plots = self.outs[name]
+            buf = io.BytesIO()
+            buf.name = name
+            render_figure(figure, [self.runs[rid] for rid in runids], plots, obss, buf, self.downsample)
+            self.cache[name] = buf.getvalue()
+            return self.cache[name]
+
+    def index(self):
+        """
+        Returns the HTML index page listing the figures.
+
+        Returns:
+            bytes: HTML page.
+        """
+        items = "".join(
+            f'<h2>{html.escape(figure.description.get("NAME", name))}</h2><a href="{html.escape(name)}"><img src="{html.escape(name)}" style="max-width:100%"></a>\n'
+            for name, (figure, *_) in self.outs.items()
+        )
+        return f"<html><head><title>VALSO</title></head><body>\n{items}</body></html>".encode()
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of the dashboard: / is the index page, /<out> a figure.
     """
-    all_obss = load_yaml(obss_file).get("obs", {})
-    figs = dict(sorted(figure.ts.items(), key=lambda item: item[0]))  # for easy unit testing
-    selected = {}
 
-    for key, _ in figs.items():
-        if key not in all_obss:
-            print(f"⚠️ Warning: Obs key {key} not found in obs.yml")
-            continue
-        try:
-            data = dict(all_obss[key])
-            data["NAME"] = key  # add the plot key as NAME
-            selected[key] = Obs(data)
-        except (FileNotFoundError, KeyError) as e:
-            print(f"⚠️ Warning: Failed to load observation for {key}: {e}")
-    return selected
+    def do_GET(self):
+        dashboard = self.server.dashboard
+        name = self.path.split("?")[0].lstrip("/")
+        if name in ("", "index.html"):
+            data, ctype = dashboard.index(), "text/html; charset=utf-8"
+        else:
+            try:
+                data, ctype = dashboard.get(name), "image/png"
+            except Exception as e:
+                self.send_error(500, f"Failed to render {name}: {e}")
+                return
+        if data is None:
+            self.send_error(404, f"Unknown figure {name}")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(data)
 
 
+# ===================== LOADERS =====================
 def load_figure(figs_file):
     """
     Loads figure configuration from a figs.yml-like file.
@@ -588,8 +870,227 @@ def load_figure(figs_file):
     return figure
 
 
+def load_batch(batch_file):
+    """
+    Loads a batch manifest listing the figures to generate.
+
+    Each entry of the 'batch' list defines a figure (FIGS, path or base name of
+    a figs yml file), the runs to plot (RUNID) and the output file (OUT).
+
+    Args:
+        batch_file (str): Path to the batch manifest.
+
+    Returns:
+        list: List of (Figure, runids, out) tuples.
+
+    Raises:
+        ValueError: If an entry misses FIGS, RUNID or OUT.
+    """
+    entries = []
+    for i, entry in enumerate(load_yaml(batch_file).get("batch", [])):
+        missing = [key for key in ("FIGS", "RUNID", "OUT") if key not in entry]
+        if missing:
+            raise ValueError(f"Batch entry {i} in {batch_file} misses {missing}")
+        runids = entry["RUNID"]
+        if isinstance(runids, str):
+            runids = runids.split()
+        entries.append((load_figure(entry["FIGS"]), runids, entry["OUT"]))
+    return entries
+
+
 # ===================== MAIN FUNCTION =====================
-def main(runids, plots_cfg="plots.yml", figs_cfgs=["figs.yml"], style_cfg="styles.yml", obss_cfg="obs.yml", cdir=".", outs=["valso.png"]):
+def load_figures(entries, plots_cfg, style_cfg, obss_cfg, cdir=".", jobs=1):
+    """
+    Loads the configurations and the shared pool of time series of several figures.
+
+    The union of the (run, series) needed by all the figures is computed first
+    and each series is loaded exactly once. Series are identified by their full
+    definition (Plot.key), so a figure overriding FILE_PATTERN, VAR, SF or the
+    MONTH, RESAMPLE, ROLLING and CLIM options of a plot key gets its own series.
+
+    Args:
+        entries (list): List of (Figure, runids, out) tuples.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory for data files.
+        jobs (int): Number of worker processes used to load the runs.
+
+    Returns:
+        tuple: The figures (with their plots and obs), the loaded Run objects
+            (by run ID) and the plots needed by each run (by run ID).
+    """
+    figures = []
+    for figure, runids, out in entries:
+        selection = figure.selection(plots_cfg, obss_cfg)
+        obss = load_obss(obss_cfg, selection)
+        plots = load_plots(plots_cfg, selection, obss)
+        figures.append((figure, runids, out, obss, plots))
+
+    # union of the plots needed by each run
+    needed = {}
+    for _, runids, _, _, plots in figures:
+        for rid in runids:
+            keys = needed.setdefault(rid, {})
+            for plot in plots:
+                keys.setdefault(plot.key, plot)
+
+    runs = {run.runid: run for run in load_runs(style_cfg, list(needed), cdir)}
+    # missing series are blank cells in a scorecard, not errors
+    strict = not any(figure.scorecard for figure, *_ in figures)
+    load_runs_ts([(runs[rid], list(keys.values())) for rid, keys in needed.items()], jobs, strict)
+
+    print('')
+
+    return figures, runs, needed
+
+
+def update_runs(runs, needed, dirs):
+    """
+    Reloads the runs whose directory changed, reading only new or changed files.
+
+    Args:
+        runs (dict): Loaded Run objects (by run ID).
+        needed (dict): Plots needed by each run (by run ID).
+        dirs (set): Changed run directories.
+
+    Returns:
+        set: (run ID, Plot.key) of the series that changed.
+    """
+    files = lambda run, key: run.cache.index.get(key, {}).get("files")
+    changed = set()
+    for rid, run in runs.items():
+        if run.dir not in dirs:
+            continue
+        plots = list(needed[rid].values())
+        before = {plot.key: files(run, plot.source) for plot in plots}
+        run.catalog.refresh()
+        try:
+            run.load_ts(plots, strict=False)
+        except (OSError, ValueError) as e:
+            # ex: file still being written, read again on the next change
+            print(f"⚠️ Warning: failed to update {rid}: {e}")
+            continue
+        changed |= {(rid, plot.key) for plot in plots if files(run, plot.source) != before[plot.key]}
+    return changed
+
+
+def generate_figures(entries, plots_cfg, style_cfg, obss_cfg, cdir=".", jobs=1, downsample=None, formats=None, thumb=None):
+    """
+    Generates several figures from a shared pool of loaded time series.
+
+    Every series is loaded once (see load_figures), then every figure is
+    rendered from this shared pool.
+
+    Args:
+        entries (list): List of (Figure, runids, out) tuples.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory for data files.
+        jobs (int): Number of worker processes used to load the runs.
+        downsample (str): Default downsampling method of the time series.
+        formats (list): Output formats (see Figure.save).
+        thumb (int): DPI of an additional PNG thumbnail.
+
+    Returns:
+        tuple: The figures (with their plots and obs), the loaded Run objects
+            (by run ID) and the plots needed by each run (by run ID).
+    """
+    figures, runs, needed = load_figures(entries, plots_cfg, style_cfg, obss_cfg, cdir, jobs)
+
+    for figure, runids, out, obss, plots in figures:
+        render_figure(figure, [runs[rid] for rid in runids], plots, obss, out, downsample, formats, thumb)
+
+    return figures, runs, needed
+
+
+def render_figure(figure, runs, plots, obss, out, downsample=None, formats=None, thumb=None):
+    """
+    Renders a figure (time series or scorecard) from loaded runs.
+
+    Args:
+        figure (Figure): Figure configuration.
+        runs (list): List of Run objects with loaded time series.
+        plots (list): List of Plot objects of the figure.
+        obss (dict): Dictionary of Obs objects.
+        out (str): Output file name for the generated plot.
+        downsample (str): Default downsampling method of the time series.
+        formats (list): Output formats (see Figure.save).
+        thumb (int): DPI of an additional PNG thumbnail.
+    """
+    if figure.scorecard:
+        figure.render_scorecard(runs, plots, obss, out, formats, thumb)
+    else:
+        figure.render(runs, plots, obss, out, downsample, formats, thumb)
+
+
+def watch_figures(entries, plots_cfg, style_cfg, obss_cfg, cdir=".", jobs=1, downsample=None, interval=60, formats=None, thumb=None):
+    """
+    Generates the figures, then keeps them up to date as new files land in the run directories.
+
+    Configurations and loaded series stay in memory: when a run directory
+    changes, only its new or changed files are read (see SeriesCache) and
+    only the figures using a series that changed are rendered again.
+
+    Args:
+        entries (list): List of (Figure, runids, out) tuples.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory for data files.
+        jobs (int): Number of worker processes used for the initial load.
+        downsample (str): Default downsampling method of the time series.
+        interval (float): Polling period in seconds (when inotify is not available).
+        formats (list): Output formats (see Figure.save).
+        thumb (int): DPI of an additional PNG thumbnail.
+    """
+    figures, runs, needed = generate_figures(entries, plots_cfg, style_cfg, obss_cfg, cdir, jobs, downsample, formats, thumb)
+    watcher = RunWatcher([run.dir for run in runs.values()], interval)
+    print(watcher)
+    print(f"👀 Watching {len(runs)} run(s), Ctrl-C to stop")
+
+    while True:
+        # reload the changed runs, only new or changed files are read
+        changed = update_runs(runs, needed, watcher.wait())
+
+        # render again the figures using a changed series
+        for figure, runids, out, obss, plots in figures:
+            if any((rid, plot.key) in changed for rid in runids for plot in plots):
+                render_figure(figure, [runs[rid] for rid in runids], plots, obss, out, downsample, formats, thumb)
+
+
+def serve_figures(load_entries, plots_cfg, style_cfg, obss_cfg, cdir=".", jobs=1, downsample=None, interval=60, port=8000):
+    """
+    Serves the figures over HTTP from a render cache (see Dashboard).
+
+    Args:
+        load_entries (callable): Returns the list of (Figure, runids, out) tuples.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory for data files.
+        jobs (int): Number of worker processes used to load the runs.
+        downsample (str): Default downsampling method of the time series.
+        interval (float): Polling period in seconds (when inotify is not available).
+        port (int): HTTP port (the server listens on localhost only).
+    """
+    dashboard = Dashboard(load_entries, plots_cfg, style_cfg, obss_cfg, cdir, jobs, downsample, interval)
+    threading.Thread(target=dashboard.watch, daemon=True).start()
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), DashboardHandler)
+    server.dashboard = dashboard
+    print(dashboard)
+    print(f"🌐 Serving {len(dashboard.outs)} figure(s) on http://127.0.0.1:{port}/, Ctrl-C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(runids, plots_cfg="plots.yml", figs_cfgs=["figs.yml"], style_cfg="styles.yml", obss_cfg="obs.yml", cdir=".", outs=["valso.png"], jobs=1, batch_cfg=None, downsample=None, watch=False, interval=60, port=None, profile=None, cache=None, formats=None, thumb=None):
     """
     Main function to generate plots with additional axes for observations.
 
@@ -601,26 +1102,67 @@ def main(runids, plots_cfg="plots.yml", figs_cfgs=["figs.yml"], style_cfg="style
         obss_cfg (str): Path to the observation configuration file.
         cdir (str): Base directory for data files.
         outs (list): List of output file names for the generated plots.
+        jobs (int): Number of worker processes used to load the runs.
+        batch_cfg (str): Path to a batch manifest (replaces runids, figs_cfgs and outs).
+        downsample (str): Default downsampling method of the time series (None to draw every point).
+        watch (bool): Keep running and update the figures when new files land in the run directories.
+        interval (float): Polling period in seconds for watch (when inotify is not available).
+        port (int): Serve the figures over HTTP on this port instead of saving them.
+        profile (str): Write the time, bytes read, files opened and peak memory of every stage to this JSON file.
+        cache (str): Keep the rendered panels in this directory and only redraw the panels that changed.
+        formats (list): Output formats (png, pdf, svg) written from a single rendering (default: the extension of outs).
+        thumb (int): DPI of an additional PNG thumbnail of every figure.
     """
-    tracemalloc.start()
-    for figs_cfg, out in zip(figs_cfgs, outs):
-        # Load data and styles
-        figure = load_figure(figs_cfg)
-        figure.generate(runids, plots_cfg, style_cfg, obss_cfg, cdir, out)
+    if profile:
+        PROFILER.enable()
+    if cache:
+        RENDER_CACHE.enable(cache)
+    def load_entries():
+        if batch_cfg:
+            return load_batch(batch_cfg)
+        return [(load_figure(figs_cfg), runids, out) for figs_cfg, out in zip(figs_cfgs, outs)]
+
+    if port:
+        serve_figures(load_entries, plots_cfg, style_cfg, obss_cfg, cdir, jobs, downsample, interval, port)
+        return
+    entries = load_entries()
+    if watch:
+        watch_figures(entries, plots_cfg, style_cfg, obss_cfg, cdir, jobs, downsample, interval, formats, thumb)
+    else:
+        generate_figures(entries, plots_cfg, style_cfg, obss_cfg, cdir, jobs, downsample, formats, thumb)
+        if profile:
+            PROFILER.save(profile)
 
 
 # ===================== ENTRY POINT =====================
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Generate plots for validation and observation data.")
-    parser.add_argument("-runid",                           nargs="+", required=True, help="List of run IDs to process.")
-    parser.add_argument("-figs",  default=["YML/figs.yml"], nargs="+", required=True, help="List of paths to figs.yml files.")
+    parser.add_argument("-runid",                           nargs="+",                help="List of run IDs to process.")
+    parser.add_argument("-figs",  default=["YML/figs.yml"], nargs="+",                help="List of paths to figs.yml files.")
     parser.add_argument("-plots", default="YML/plots.yml",                            help="Path to the full plots database.")
     parser.add_argument("-style", default="YML/styles.yml",                           help="Path to the style configuration file.")
     parser.add_argument("-obs",   default="YML/obs.yml",                              help="Path to the observation configuration file.")
     parser.add_argument("-dir",   default="./RUNS/",                                  help="Base directory for data files.")
     parser.add_argument("-outs",  default=['output.png'],   nargs="+",                help="List of output file names for the generated plots.")
+    parser.add_argument("-jobs",  default=1, type=int,                                help="Number of worker processes used to load the runs.")
+    parser.add_argument("-batch", default=None,                                       help="Batch manifest of (FIGS, RUNID, OUT) entries, loaded data are shared by all figures.")
+    parser.add_argument("-downsample", default=None, choices=DOWNSAMPLE_METHODS,      help="Downsample long series to the panel pixel width (default for plots without DOWNSAMPLE).")
+    parser.add_argument("-watch", action="store_true",                                help="Keep running and update the figures when new files land in the run directories.")
+    parser.add_argument("-interval", default=60, type=float,                          help="Polling period in seconds for -watch/-serve (when inotify_simple is not installed).")
+    parser.add_argument("-serve", default=None, type=int, metavar="PORT",             help="Serve the figures over HTTP on localhost:PORT, rendered on demand and cached.")
+    parser.add_argument("-profile", default=None, metavar="OUT.json",                 help="Write the time, bytes read, files opened and peak memory per stage, run and plot.")
+    parser.add_argument("-cache", default=None, metavar="DIR",                        help="Keep the rendered panels in DIR, only the panels whose data, definition or style changed are redrawn.")
+    parser.add_argument("-formats", default=None, nargs="+",                          help="Output formats (png pdf svg, or png,pdf,svg) written from a single rendering.")
+    parser.add_argument("-thumb", default=None, type=int, metavar="DPI",              help="Also write a PNG thumbnail <out>_thumb.png at this DPI.")
     args = parser.parse_args()
+    formats = [fmt for item in args.formats for fmt in item.split(",") if fmt] if args.formats else None
+    if formats and any(fmt not in OUTPUT_FORMATS for fmt in formats):
+        parser.error(f"-formats must be in {', '.join(OUTPUT_FORMATS)}")
+    if args.batch is None and args.runid is None:
+        parser.error("-runid is required unless -batch is given")
+    if args.profile and (args.watch or args.serve):
+        parser.error("-profile cannot be combined with -watch or -serve")
 
     main(
         runids=args.runid,
@@ -629,5 +1171,15 @@ if __name__ == "__main__":
         style_cfg=args.style,
         obss_cfg=args.obs,
         cdir=args.dir,
-        outs=args.outs
+        outs=args.outs,
+        jobs=args.jobs,
+        batch_cfg=args.batch,
+        downsample=args.downsample,
+        watch=args.watch,
+        interval=args.interval,
+        port=args.serve,
+        profile=args.profile,
+        cache=args.cache,
+        formats=formats,
+        thumb=args.thumb
     )
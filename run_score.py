@@ -0,0 +1,164 @@
+import sys
+import csv
+import json
+import numpy as np
+from valso_data import load_yaml, load_runs, load_plots, load_obss, load_runs_ts, score_matrix
+
+# ===================== SCORES =====================
+def score_records(scores, obss, max_dist=None, min_frac=None):
+    """
+    Flattens a score matrix into one record per (run, key) and applies the thresholds.
+
+    A record fails if its normalized distance is above max_dist or its in-range
+    fraction is below min_frac (MAX_DIST/MIN_FRAC in obs.yml override the
+    default thresholds per key). A missing series fails as soon as a threshold is set.
+
+    Args:
+        scores (dict): Output of score_matrix.
+        obss (dict): Dictionary of Obs objects.
+        max_dist (float): Default threshold on the normalized distance.
+        min_frac (float): Default threshold on the in-range fraction.
+
+    Returns:
+        list: List of dictionaries (one per run and key).
+    """
+    records = []
+    for i, runid in enumerate(scores["runids"]):
+        for j, key in enumerate(scores["keys"]):
+            obs = obss[key]
+            kmax_dist = obs.max_dist if obs.max_dist is not None else max_dist
+            kmin_frac = obs.min_frac if obs.min_frac is not None else min_frac
+            mean = scores["mean"][i, j]
+            if np.isnan(mean):
+                status = "MISSING" if kmax_dist is not None or kmin_frac is not None else "NA"
+            elif (kmax_dist is not None and scores["dist"][i, j] > kmax_dist) or \
+                 (kmin_frac is not None and scores["frac"][i, j] < kmin_frac):
+                status = "FAIL"
+            else:
+                status = "OK"
+            records.append({
+                "runid": runid,
+                "key": key,
+                "mean": _value(mean),
+                "obs_mean": obs.mean,
+                "obs_std": obs.std,
+                "bias": _value(scores["bias"][i, j]),
+                "dist": _value(scores["dist"][i, j]),
+                "frac": _value(scores["frac"][i, j]),
+                "status": status,
+            })
+    return records
+
+
+def _value(x):
+    """
+    Converts a score to a JSON/CSV friendly value (None for NaN).
+    """
+    return None if np.isnan(x) else float(x)
+
+
+def write_scores(records, out):
+    """
+    Writes the score records to a CSV or JSON file (chosen from the extension).
+
+    Args:
+        records (list): List of score records.
+        out (str): Output file name (.csv or .json).
+    """
+    with open(out, "w", newline="") as fid:
+        if out.endswith(".json"):
+            json.dump(records, fid, indent=1)
+        else:
+            writer = csv.DictWriter(fid, fieldnames=list(records[0].keys()) if records else ["runid", "key"])
+            writer.writeheader()
+            writer.writerows(records)
+    print(f"✅ Saved {out}")
+
+
+def print_scores(records):
+    """
+    Prints the score records as a table.
+
+    Args:
+        records (list): List of score records.
+    """
+    fmt = lambda x: "" if x is None else f"{x:.3g}"
+    print(f"{'RUNID':30s} {'KEY':12s} {'MEAN':>10s} {'BIAS':>10s} {'DIST':>8s} {'FRAC':>6s}  STATUS")
+    for r in records:
+        print(f"{r['runid']:30s} {r['key']:12s} {fmt(r['mean']):>10s} {fmt(r['bias']):>10s} {fmt(r['dist']):>8s} {fmt(r['frac']):>6s}  {r['status']}")
+
+
+# ===================== MAIN FUNCTION =====================
+def main(runids, plots_cfg="plots.yml", style_cfg="styles.yml", obss_cfg="obs.yml", cdir=".", keys=None, period=None, out=None, max_dist=None, min_frac=None, jobs=1):
+    """
+    Scores runs against the obs.yml ranges without rendering anything.
+
+    Args:
+        runids (list): List of run IDs to score.
+        plots_cfg (str): Path to the plot configuration file.
+        style_cfg (str): Path to the style configuration file.
+        obss_cfg (str): Path to the observation configuration file.
+        cdir (str): Base directory for data files.
+        keys (list): Plot keys to score (default: every key of obs.yml defined in plots.yml).
+        period (list): First and last year of the scoring period (default: whole series).
+        out (str): Output file (.csv or .json).
+        max_dist (float): Threshold on the normalized distance to the obs range.
+        min_frac (float): Threshold on the fraction of time within the obs range.
+        jobs (int): Number of worker processes used to load the runs.
+
+    Returns:
+        int: Number of failed (run, key) scores.
+    """
+    if keys is None:
+        all_plots = load_yaml(plots_cfg).get("plots", {})
+        keys = [key for key in load_yaml(obss_cfg).get("obs", {}) if key in all_plots]
+    obss = load_obss(obss_cfg, {key: {} for key in keys})
+    plots = load_plots(plots_cfg, {key: {} for key in obss}, obss)
+    runs = load_runs(style_cfg, runids, cdir)
+
+    load_runs_ts([(run, plots) for run in runs], jobs, strict=False)
+
+    scores = score_matrix(runs, plots, obss, period)
+    records = score_records(scores, obss, max_dist, min_frac)
+
+    print('')
+    print_scores(records)
+    if out:
+        write_scores(records, out)
+
+    return sum(r["status"] in ("FAIL", "MISSING") for r in records)
+
+
+# ===================== ENTRY POINT =====================
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Score runs against observation ranges (no plotting).")
+    parser.add_argument("-runid",    nargs="+", required=True,     help="List of run IDs to score.")
+    parser.add_argument("-plots",    default="YML/plots.yml",      help="Path to the full plots database.")
+    parser.add_argument("-style",    default="YML/styles.yml",     help="Path to the style configuration file.")
+    parser.add_argument("-obs",      default="YML/obs.yml",        help="Path to the observation configuration file.")
+    parser.add_argument("-dir",      default="./RUNS/",            help="Base directory for data files.")
+    parser.add_argument("-keys",     nargs="+", default=None,      help="Plot keys to score (default: all obs.yml keys).")
+    parser.add_argument("-period",   nargs=2, type=int, default=None, help="First and last year of the scoring period.")
+    parser.add_argument("-out",      default=None,                 help="Output file (.csv or .json).")
+    parser.add_argument("-max_dist", type=float, default=None,     help="Fail if the normalized distance to the obs range is larger.")
+    parser.add_argument("-min_frac", type=float, default=None,     help="Fail if the fraction of time within the obs range is smaller.")
+    parser.add_argument("-jobs",     default=1, type=int,          help="Number of worker processes used to load the runs.")
+    args = parser.parse_args()
+
+    nfail = main(
+        runids=args.runid,
+        plots_cfg=args.plots,
+        style_cfg=args.style,
+        obss_cfg=args.obs,
+        cdir=args.dir,
+        keys=args.keys,
+        period=args.period,
+        out=args.out,
+        max_dist=args.max_dist,
+        min_frac=args.min_frac,
+        jobs=args.jobs
+    )
+    if nfail:
+        print(f"❌ {nfail} score(s) failed")
+        sys.exit(1)
@@ -0,0 +1,1412 @@
+"""
+Data side of the VALSO plotting tools: run catalogs and caches, readers of the
+CDFTOOLS scalar time series and the Run/Plot/Obs objects with their loaders.
+
+This module does not import matplotlib, so that headless tools (run_score.py)
+do not pay for the plotting stack.
+"""
+import os
+import re
+import json
+import hashlib
+import fnmatch
+import time
+import tracemalloc
+import cftime
+import netCDF4 as nc
+import numpy as np
+import yaml
+import xarray as xr
+from concurrent.futures import ProcessPoolExecutor
+
+# ===================== TIME =====================
+TIME_UNITS = {"days": 86400, "day": 86400, "d": 86400, "hours": 3600, "hour": 3600, "h": 3600,
+              "minutes": 60, "minute": 60, "seconds": 1, "second": 1, "s": 1}
+
+# day of year of the first day of each month (+ year length) for the fixed-length calendars
+CALENDAR_MONTHS = {
+    "noleap":  np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]),
+    "365_day": np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]),
+    "all_leap": np.cumsum([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]),
+    "366_day": np.cumsum([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]),
+    "360_day": np.arange(13) * 30,
+}
+STANDARD_CALENDARS = ("standard", "gregorian", "proleptic_gregorian")
+# first day of the gregorian calendar: before it, standard/gregorian is the julian calendar
+GREGORIAN_START = np.datetime64("1582-10-15", "s")
+
+REF_REGEX = re.compile(r'^\s*(-?\d+)-(\d+)-(\d+)(?:[ T](\d+):(\d+)(?::(\d+(?:\.\d*)?))?)?')
+
+def decode_time(raw, units, calendar="standard"):
+    """
+    Decodes CF numeric times ('<unit> since <date>') to the uniform time axis.
+
+    The decoding is done in bulk with int64 arithmetic, without any cftime
+    object: standard calendars are offsets from the reference date, fixed-length
+    calendars (noleap, all_leap, 360_day) are split into (year, month, day,
+    seconds) arrays within the model calendar and then recomposed on the time
+    axis (see compose_time). Other calendars (julian) fall back on cftime, as do
+    standard/gregorian times before 1582-10-15 (mixed julian/gregorian calendar).
+
+    Args:
+        raw (np.ndarray): Numeric time values.
+        units (str): CF time units.
+        calendar (str): CF calendar.
+
+    Returns:
+        np.ndarray: Times as datetime64[s].
+
+    Raises:
+        ValueError: If the time units cannot be parsed.
+    """
+    calendar = calendar.lower()
+    unit, _, ref = units.partition(" since ")
+    unit = unit.strip().lower()
+    match = REF_REGEX.match(ref)
+    if unit not in TIME_UNITS or match is None:
+        raise ValueError(f"Unsupported time units '{units}'")
+    ryear, rmonth, rday = (int(x) for x in match.groups()[:3])
+    rsec = int(match.group(4) or 0) * 3600 + int(match.group(5) or 0) * 60 + int(float(match.group(6) or 0))
+    delta = np.round(np.asarray(raw, dtype=float) * TIME_UNITS[unit]).astype(np.int64)
+
+    if calendar in STANDARD_CALENDARS:
+        times = compose_time(np.array([ryear]), np.array([rmonth]), np.array([rday]), np.array([rsec]))[0] + delta.astype('timedelta64[s]')
+        gregorian = (ryear, rmonth, rday) >= (1582, 10, 15) and (times.size == 0 or times.min() >= GREGORIAN_START)
+        if calendar == "proleptic_gregorian" or gregorian:
+            return times
+
+    if calendar in CALENDAR_MONTHS:
+        months = CALENDAR_MONTHS[calendar]
+        year_len = int(months[-1]) * 86400
+        total = (ryear * int(months[-1]) + months[rmonth - 1] + rday - 1) * 86400 + rsec + delta
+        years, rem = np.divmod(total, year_len)
+        doy, seconds = np.divmod(rem, 86400)
+        month = np.searchsorted(months, doy, side="right")
+        return compose_time(years, month, doy - months[month - 1] + 1, seconds)
+
+    dates = cftime.num2date(raw, units, calendar)
+    return compose_time(*(np.array([getattr(d, attr) for d in dates], dtype=np.int64) for attr in ("year", "month", "day")),
+                        np.array([d.hour * 3600 + d.minute * 60 + d.second for d in dates], dtype=np.int64))
+
+
+def compose_time(years, months, days, seconds):
+    """
+    Builds times on the uniform time axis from (year, month, day, seconds) arrays.
+
+    Days that do not exist in the proleptic gregorian calendar (ex: 30 February
+    of the 360_day calendar) are clipped to the last day of the month, so that
+    the year and month of a model date are always preserved.
+
+    Args:
+        years, months, days, seconds (np.ndarray): Date components (int).
+
+    Returns:
+        np.ndarray: Times as datetime64[s].
+    """
+    first = ((np.asarray(years) - 1970) * 12 + np.asarray(months) - 1).astype('datetime64[M]')
+    start = first.astype('datetime64[D]')
+    ndays = ((first + 1).astype('datetime64[D]') - start).astype(np.int64)
+    day = np.minimum(np.asarray(days) - 1, ndays - 1)
+    return start.astype('datetime64[s]') + (day * 86400 + np.asarray(seconds)).astype('timedelta64[s]')
+
+
+def split_time(times):
+    """
+    Splits times into (year, month, day, seconds) int arrays.
+
+    Args:
+        times (np.ndarray): Times as datetime64.
+
+    Returns:
+        tuple: Years, months, days and seconds of the day.
+    """
+    times = np.asarray(times).astype('datetime64[s]')
+    month = times.astype('datetime64[M]')
+    year = month.astype('datetime64[Y]')
+    day = times.astype('datetime64[D]')
+    return (year.astype(np.int64) + 1970,
+            (month - year.astype('datetime64[M]')).astype(np.int64) + 1,
+            (day - month.astype('datetime64[D]')).astype(np.int64) + 1,
+            (times - day.astype('datetime64[s]')).astype(np.int64))
+
+
+def shift_years(times, years):
+    """
+    Shifts times by a whole number of years, keeping month and day.
+
+    Args:
+        times (np.ndarray): Times as datetime64.
+        years (int): Number of years to add (can be negative).
+
+    Returns:
+        np.ndarray: Shifted times as datetime64[s].
+    """
+    year, month, day, seconds = split_time(times)
+    return compose_time(year + years, month, day, seconds)
+
+
+# ===================== DOWNSAMPLING =====================
+DOWNSAMPLE_METHODS = ("minmax", "lttb")
+
+def downsample(times, values, npix, method="minmax"):
+    """
+    Selects the points of a series worth drawing on a panel npix pixels wide.
+
+    minmax keeps the first, last, minimum and maximum points of every pixel
+    column (so peaks and the envelope are exact), lttb keeps one point per
+    bucket with the Largest-Triangle-Three-Buckets algorithm (smoother, but
+    isolated peaks may be missed). Series shorter than 4 points per pixel are
+    not downsampled.
+
+    Args:
+        times (np.ndarray): Sorted times (datetime64).
+        values (np.ndarray): Values of the series.
+        npix (int): Width of the panel in pixels.
+        method (str): Downsampling method (minmax or lttb).
+
+    Returns:
+        np.ndarray: Sorted indices of the points to draw.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    n = len(values)
+    if npix <= 0 or n <= 4 * npix:
+        return np.arange(n)
+    x = np.asarray(times).astype('datetime64[s]').astype(np.int64)
+    y = np.asarray(values, dtype=float)
+
+    if method == "minmax":
+        # pixel column of each point (times are sorted, so columns are contiguous)
+        col = ((x - x[0]) * npix // max(x[-1] - x[0], 1)).clip(0, npix - 1)
+        first = np.flatnonzero(np.r_[True, np.diff(col) != 0])
+        last = np.r_[first[1:], n] - 1
+        # argmin/argmax per column from one lexsort each (NaN never selected)
+        imin = np.lexsort((np.where(np.isfinite(y), y, np.inf), col))[first]
+        imax = np.lexsort((np.where(np.isfinite(y), y, -np.inf), col))[last]
+        return np.unique(np.concatenate([first, last, imin, imax]))
+
+    if method == "lttb":
+        nout = 2 * npix
+        edges = np.linspace(1, n - 1, nout - 1).astype(np.int64)
+        xf = (x - x[0]).astype(float)
+        keep = np.empty(nout, dtype=np.int64)
+        keep[0], keep[-1] = 0, n - 1
+        a = 0
+        for i in range(nout - 2):
+            lo, hi = edges[i], edges[i + 1]
+            nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+            cx, cy = xf[nlo:nhi].mean(), np.nanmean(y[nlo:nhi])
+            area = np.abs((xf[a] - cx) * (y[lo:hi] - y[a]) - (xf[a] - xf[lo:hi]) * (cy - y[a]))
+            a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+            keep[i + 1] = a
+        return np.unique(keep)
+
+    raise ValueError(f"Unknown downsampling method '{method}' (expected one of {DOWNSAMPLE_METHODS})")
+
+
+# ===================== TRANSFORMS =====================
+PERIOD_REGEX = re.compile(r'^\s*(\d+)\s*([ym])\s*$')
+CLIM_YEAR = 2000
+
+def parse_period(period):
+    """
+    Parses a period such as '1y', '10y' or '3m'.
+
+    Args:
+        period (str): Number of years (y) or months (m).
+
+    Returns:
+        int: Length of the period in months.
+
+    Raises:
+        ValueError: If the period cannot be parsed.
+    """
+    match = PERIOD_REGEX.match(str(period))
+    if match is None or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid period '{period}' (expected <N>y or <N>m)")
+    return int(match.group(1)) * (12 if match.group(2) == "y" else 1)
+
+
+def _group_mean(group, times, values):
+    """
+    Averages times and values per group (NaN values are ignored).
+
+    Args:
+        group (np.ndarray): Group index of each record (sorted, from 0).
+        times (np.ndarray): Times as datetime64[s].
+        values (np.ndarray): Values.
+
+    Returns:
+        tuple: Group indices, mean times (datetime64[s]) and mean values of the non empty groups.
+    """
+    gmin = group.min()
+    group = group - gmin
+    valid = np.isfinite(values)
+    count = np.bincount(group)
+    nvalid = np.bincount(group, weights=valid)
+    total = np.bincount(group, weights=np.where(valid, values, 0.))
+    tsec = times.astype(np.int64)
+    tmean = tsec.min() + np.round(np.bincount(group, weights=tsec - tsec.min()) / np.maximum(count, 1)).astype(np.int64)
+    keep = count > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.flatnonzero(keep) + gmin, tmean[keep].astype('datetime64[s]'), (total / nvalid)[keep]
+
+
+def transform_series(times, values, plot):
+    """
+    Derives a series from the loaded one, as requested in plots.yml.
+
+    The transforms are applied in this order, all vectorized on the (year,
+    month) arrays of the time axis:
+      - MONTH: keep the records of one month (or a list of months), ex: 9;
+      - RESAMPLE: average over calendar periods, ex: 1y (annual), 3m (seasonal);
+      - ROLLING: centered running mean over a period, ex: 10y (NaN where the window is incomplete);
+      - CLIM: mean seasonal cycle, 12 monthly values drawn over the year CLIM_YEAR.
+    So a single monthly series gives the annual means, the September values,
+    the running means and the seasonal cycle without dedicated files.
+
+    Args:
+        times (np.ndarray): Times as datetime64[s].
+        values (np.ndarray): Values of the series.
+        plot (Plot): Plot configuration.
+
+    Returns:
+        tuple: Transformed times and values.
+
+    Raises:
+        ValueError: If a period is invalid.
+    """
+    if plot.month is None and plot.resample is None and plot.rolling is None and not plot.clim:
+        return times, values
+
+    order = np.argsort(times, kind="stable")
+    times = times[order].astype('datetime64[s]')
+    values = values[order].astype(float)
+    years, months, _, _ = split_time(times)
+
+    if plot.month is not None:
+        sel = np.isin(months, np.atleast_1d(plot.month))
+        times, values, years, months = times[sel], values[sel], years[sel], months[sel]
+
+    if plot.resample is not None and len(times):
+        nmonth = parse_period(plot.resample)
+        _, times, values = _group_mean((years * 12 + months - 1) // nmonth, times, values)
+        years, months, _, _ = split_time(times)
+
+    if plot.rolling is not None and len(times) > 1:
+        # window in records, from the median time step of the series
+        step = np.median(np.diff(times.astype(np.int64)))
+        window = max(int(round(parse_period(plot.rolling) * 365.2425 * 86400 / 12 / step)), 1)
+        valid = np.isfinite(values)
+        csum = np.concatenate([[0.], np.cumsum(np.where(valid, values, 0.))])
+        cnum = np.concatenate([[0], np.cumsum(valid)])
+        rolled = np.full(len(values), np.nan)
+        if window <= len(values):
+            start = np.arange(len(values) - window + 1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rolled[start + (window - 1) // 2] = (csum[start + window] - csum[start]) / (cnum[start + window] - cnum[start])
+        values = rolled
+
+    if plot.clim and len(times):
+        months, _, values = _group_mean(months - 1, times, values)
+        ones = np.ones(len(months), dtype=np.int64)
+        times = compose_time(CLIM_YEAR * ones, months + 1, 15 * ones, 0 * ones)
+
+    return times, values
+
+
+# ===================== PROFILING =====================
+class _Stage:
+    """
+    Context manager measuring one stage of the Profiler.
+    """
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        if hasattr(tracemalloc, "reset_peak"):  # python >= 3.9
+            tracemalloc.reset_peak()
+        self.mem = tracemalloc.get_traced_memory()[0]
+        self.rchar = _read_chars()
+        self.files = self.profiler.files
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        profiler = self.profiler
+        record = profiler.records.setdefault((self.name, *profiler.scope), {"calls": 0, "wall": 0., "bytes": 0, "files": 0, "peak": 0})
+        record["calls"] += 1
+        record["wall"] += wall
+        record["bytes"] += _read_chars() - self.rchar
+        record["files"] += profiler.files - self.files
+        record["peak"] = max(record["peak"], tracemalloc.get_traced_memory()[1] - self.mem)
+        return False
+
+
+class _NoStage:
+    """
+    Context manager doing nothing (disabled Profiler).
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NO_STAGE = _NoStage()
+
+
+def _read_chars():
+    """
+    Returns the number of bytes read by the process so far (Linux /proc/self/io, 0 elsewhere).
+    """
+    try:
+        with open("/proc/self/io", "rb") as fid:
+            return int(fid.readline().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class Profiler:
+    """
+    Stage level instrumentation of the loading and rendering of the figures.
+
+    Every stage (glob, open, decode, convert, plot, obs, savefig ...) is
+    recorded per (figure, run, plot) scope with its number of calls, wall
+    time, bytes read (from /proc/self/io, so it includes the file system
+    overhead), number of files opened and peak memory allocated above the
+    stage start (tracemalloc). When disabled, stage() returns a shared no-op
+    context manager and nothing is measured.
+    """
+
+    def __str__(self):
+        return f'    Profiler(enabled={self.enabled}, records={len(self.records)})'
+
+    def __init__(self):
+        """
+        Initializes a disabled Profiler object.
+        """
+        self.enabled = False
+        self.records = {}
+        self.scope = (None, None, None)
+        self.files = 0
+        self.start = None
+
+    def enable(self):
+        """
+        Enables the profiler (starts tracemalloc) and clears the records.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+        self.records = {}
+        self.files = 0
+        self.start = time.perf_counter()
+
+    def set_scope(self, figure=None, run=None, plot=None):
+        """
+        Sets the (figure, run, plot) the next stages are attributed to.
+        """
+        if self.enabled:
+            self.scope = (figure, run, plot)
+
+    def stage(self, name):
+        """
+        Returns a context manager measuring a stage.
+
+        Args:
+            name (str): Stage name.
+        """
+        return _Stage(self, name) if self.enabled else NO_STAGE
+
+    def count_file(self):
+        """
+        Counts one opened file.
+        """
+        if self.enabled:
+            self.files += 1
+
+    def merge(self, records):
+        """
+        Adds records measured in another process (ex: a load_runs_ts worker).
+
+        Args:
+            records (dict): Records of another Profiler.
+        """
+        for key, rec in records.items():
+            record = self.records.setdefault(key, {"calls": 0, "wall": 0., "bytes": 0, "files": 0, "peak": 0})
+            for item in ("calls", "wall", "bytes", "files"):
+                record[item] += rec[item]
+            record["peak"] = max(record["peak"], rec["peak"])
+
+    def save(self, out):
+        """
+        Writes the records to a JSON file and prints the totals per stage.
+
+        Args:
+            out (str): Output JSON file.
+        """
+        records = [dict(zip(("stage", "figure", "run", "plot"), key), **rec) for key, rec in self.records.items()]
+        totals = {}
+        for rec in records:
+            total = totals.setdefault(rec["stage"], {"calls": 0, "wall": 0., "bytes": 0, "files": 0, "peak": 0})
+            for item in ("calls", "wall", "bytes", "files"):
+                total[item] += rec[item]
+            total["peak"] = max(total["peak"], rec["peak"])
+        with open(out, "w") as fid:
+            json.dump({"wall": time.perf_counter() - self.start, "totals": totals, "stages": records}, fid, indent=1)
+
+        print('')
+        print(f"{'STAGE':10s} {'CALLS':>7s} {'WALL(s)':>9s} {'READ(MB)':>9s} {'FILES':>7s} {'PEAK(MB)':>9s}")
+        for stage, total in sorted(totals.items(), key=lambda item: -item[1]["wall"]):
+            print(f"{stage:10s} {total['calls']:7d} {total['wall']:9.3f} {total['bytes'] / 1e6:9.2f} {total['files']:7d} {total['peak'] / 1e6:9.2f}")
+        print(f"✅ Saved {out}")
+
+PROFILER = Profiler()
+
+
+# ===================== CLASSES =====================
+TIME_REGEX = re.compile(r'^time(?!.*bounds)(_.*)?$', re.IGNORECASE)
+
+def read_scalar_timeseries(files, var, time_name):
+    """
+    Reads a scalar time series spread over several files.
+
+    Only the variable and the time coordinate are read, straight through netCDF4
+    (no xarray decoding of the other variables and coordinates), into
+    preallocated arrays. The raw time values are decoded at the end in one
+    vectorized call per (units, calendar) found in the files.
+    Files whose time coordinate has no units are skipped with a warning (no
+    record read).
+
+    Args:
+        files (list): Files to read (time is the first dimension of var).
+        var (str): Variable to read.
+        time_name (str): Time coordinate to read.
+
+    Returns:
+        tuple: Times (datetime64[s]), values and number of records read per file.
+
+    Raises:
+        ValueError: If var holds more than one value per time record.
+    """
+    values = None
+    traw = None
+    tunits = []
+    counts = []
+    n = 0
+
+    for f in files:
+        with PROFILER.stage("open"):
+            ds = nc.Dataset(f)
+            PROFILER.count_file()
+        with ds, PROFILER.stage("read"):
+            ds.set_always_mask(False)
+            ncvar = ds.variables[var]
+            nctime = ds.variables[time_name]
+            units = getattr(nctime, "units", None)
+            if units is None:
+                # no record read from this file (kept in counts and tunits so that they stay aligned with files)
+                print(f"⚠️ Warning: {f} skipped: no units for {time_name}")
+                tunits.append(None)
+                counts.append(0)
+                continue
+            data = ncvar[:]
+            if np.ma.isMaskedArray(data):
+                data = np.ma.filled(data.astype(np.result_type(data.dtype, np.float32)), np.nan)
+            ntime = data.shape[0] if data.ndim else 1
+            if data.size != ntime:
+                raise ValueError(f"{var} in {f} is not a scalar time series (shape {data.shape})")
+            tdata = np.atleast_1d(nctime[:])
+            tunits.append((units, getattr(nctime, "calendar", "standard")))
+
+        # preallocate for files of the same length as the first one, grow if needed
+        if values is None:
+            values = np.empty(ntime * len(files), dtype=data.dtype)
+            traw = np.empty(ntime * len(files), dtype=float)
+        if n + ntime > values.size:
+            size = max(2 * values.size, n + ntime)
+            values = np.resize(values, size)
+            traw = np.resize(traw, size)
+        values[n:n + ntime] = data.reshape(ntime)
+        traw[n:n + ntime] = tdata
+        counts.append(ntime)
+        n += ntime
+
+    times = np.empty(n, dtype='datetime64[s]')
+    if n:
+        # decode the time axis once per (units, calendar)
+        owner = np.repeat(np.arange(len(counts)), counts)
+        with PROFILER.stage("decode"):
+            for key in set(tunits) - {None}:
+                sel = np.isin(owner, [i for i, k in enumerate(tunits) if k == key])
+                times[sel] = decode_time(traw[:n][sel], *key)
+        return times, values[:n], counts
+    return times, np.array([]), counts
+
+
+class Catalog:
+    """
+    Per-run catalog of the files available in a run directory.
+
+    The run directory is listed once. The header of a file (variables, time
+    dimension, time coordinate and time length) is only read the first time a
+    plot needs it and is stored, with the file mtime and size, in a sidecar
+    file so that unchanged files are never re-opened on the next invocation.
+    """
+
+    SIDECAR = ".valso_catalog.json"
+    VERSION = 1
+
+    def __str__(self):
+        return f'    Catalog(dir={self.dir}, files={len(self.names)}, described={len(self.entries)})'
+
+    def __init__(self, cdir):
+        """
+        Initializes a Catalog object by scanning the run directory.
+
+        Args:
+            cdir (str): Run directory to catalog.
+        """
+        self.dir = cdir
+        self.sidecar = os.path.join(cdir, self.SIDECAR)
+        self.names = []
+        self.entries = {}
+        self.stats = {}
+        self.dirty = False
+        with PROFILER.stage("glob"):
+            self.scan()
+            self.load()
+
+    def scan(self):
+        """
+        Lists the run directory (and its sub-directories) once.
+
+        Hidden files and directories are skipped, as glob does.
+        """
+        names = []
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            try:
+                it = os.scandir(os.path.join(self.dir, rel))
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    name = f"{rel}/{entry.name}" if rel else entry.name
+                    if entry.is_dir():
+                        stack.append(name)
+                    else:
+                        names.append(name)
+        self.names = sorted(names)
+
+    def refresh(self):
+        """
+        Lists the run directory again and forgets the stat results (new or
+        changed files are then seen by glob and stat).
+        """
+        self.stats = {}
+        with PROFILER.stage("glob"):
+            self.scan()
+
+    def load(self):
+        """
+        Loads the file descriptions stored in the sidecar file (if any).
+        """
+        try:
+            with open(self.sidecar) as fid:
+                data = json.load(fid)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.entries = data.get("files", {})
+
+    def save(self):
+        """
+        Writes the file descriptions to the sidecar file if anything changed.
+
+        Files that disappeared from the run directory are dropped. A read-only
+        run directory only triggers a warning.
+        """
+        if not self.dirty:
+            return
+        names = set(self.names)
+        files = {k: v for k, v in self.entries.items() if k in names}
+        tmp = f"{self.sidecar}.{os.getpid()}"
+        try:
+            with open(tmp, "w") as fid:
+                json.dump({"version": self.VERSION, "files": files}, fid)
+            os.replace(tmp, self.sidecar)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Warning: could not write catalog {self.sidecar}: {e}")
+
+    def glob(self, file_pattern):
+        """
+        Matches a glob pattern against the catalog (no file system access).
+
+        Args:
+            file_pattern (str): Glob pattern relative to the run directory.
+
+        Returns:
+            list: Sorted list of matching paths relative to the run directory.
+        """
+        parts = file_pattern.split('/')
+        return [name for name in self.names if _match_parts(name.split('/'), parts)]
+
+    def stat(self, name):
+        """
+        Returns the mtime and size of a file (stat-ed once per catalog).
+
+        Args:
+            name (str): Path relative to the run directory.
+
+        Returns:
+            tuple: mtime and size of the file.
+        """
+        if name not in self.stats:
+            st = os.stat(os.path.join(self.dir, name))
+            self.stats[name] = (st.st_mtime, st.st_size)
+        return self.stats[name]
+
+    def describe(self, name):
+        """
+        Returns the description of a file, reading its header only if the file is
+        unknown or changed since it was last described.
+
+        Args:
+            name (str): Path relative to the run directory.
+
+        Returns:
+            dict: mtime, size, vars, time_dim, time_coord and ntime of the file.
+        """
+        path = os.path.join(self.dir, name)
+        mtime, size = self.stat(name)
+        entry = self.entries.get(name)
+        if entry and entry["mtime"] == mtime and entry["size"] == size:
+            return entry
+
+        with PROFILER.stage("open"):
+            ds = xr.open_dataset(path, decode_times=False)
+            PROFILER.count_file()
+        time_dim = None
+        for dim in ds.dims:
+            if TIME_REGEX.match(dim):
+                time_dim = dim
+
+        time_coord = None
+        for coord in ds.coords:
+            if TIME_REGEX.match(coord):
+                time_coord = coord
+
+        if time_coord is None:
+            for var in ds.data_vars:
+                if TIME_REGEX.match(var):
+                    time_coord = var
+
+        entry = {
+            "mtime": mtime,
+            "size": size,
+            "vars": list(ds.data_vars),
+            "time_dim": time_dim,
+            "time_coord": time_coord,
+            "ntime": int(ds.sizes[time_dim]) if time_dim else 0,
+        }
+        ds.close()
+
+        self.entries[name] = entry
+        self.dirty = True
+        return entry
+
+    def resolve(self, file_pattern, var_pattern):
+        """
+        Resolves a FILE_PATTERN/VAR pair against the catalog.
+
+        Args:
+            file_pattern (str): Glob pattern relative to the run directory.
+            var_pattern (str): Regex matching the variable name (ex: 'toto|titi').
+
+        Returns:
+            tuple: Sorted list of file paths (relative to the run directory), variable
+                name and time coordinate name.
+
+        Raises:
+            FileNotFoundError: If no file matches the pattern.
+            KeyError: If no variable matches the pattern.
+            ValueError: If several variables match the pattern.
+        """
+        with PROFILER.stage("glob"):
+            names = self.glob(file_pattern)
+        if not names:
+            raise FileNotFoundError(f'No files match {file_pattern} in {self.dir}')
+
+        # gestion des variables avec regex
+        entry = self.describe(names[0])
+        matched_vars = [v for v in entry["vars"] if re.fullmatch(var_pattern, v)]
+        if not matched_vars:
+            raise KeyError(f"No variable in dataset matches pattern '{var_pattern}'")
+        if len(matched_vars) > 1:
+            raise ValueError(f"Multiple variables match pattern '{var_pattern}': {matched_vars}")
+
+        return names, matched_vars[0], entry["time_coord"]
+
+
+def _match_parts(parts, pattern_parts):
+    """
+    Matches path components against glob pattern components (as glob does, '*'
+    never crosses a directory separator).
+    """
+    if len(parts) != len(pattern_parts):
+        return False
+    return all(fnmatch.fnmatchcase(p, pp) for p, pp in zip(parts, pattern_parts))
+
+
+class SeriesCache:
+    """
+    Per-run cache of the loaded time series, one entry per series source (see Plot.source).
+
+    For every source file of an entry, the cache keeps its mtime, its size and
+    the number of records it contributed, so that only new or changed files are
+    read and appended to the cached series. The cache is stored as columnar
+    arrays (time, value) in a compressed npz sidecar in the run directory.
+    """
+
+    SIDECAR = ".valso_cache.npz"
+    VERSION = 3
+
+    def __str__(self):
+        return f'    SeriesCache(path={self.path}, keys={list(self.index.keys())})'
+
+    def __init__(self, cdir):
+        """
+        Initializes a SeriesCache object from the sidecar file (if any).
+
+        Args:
+            cdir (str): Run directory.
+        """
+        self.path = os.path.join(cdir, self.SIDECAR)
+        self.index = {}
+        self.arrays = {}
+        self.dirty = False
+        with PROFILER.stage("cache"):
+            self.load()
+
+    def load(self):
+        """
+        Loads the cached series from the sidecar file.
+        """
+        try:
+            with np.load(self.path, allow_pickle=False) as npz:
+                index = json.loads(str(npz["index"]))
+                if index.get("version") != self.VERSION:
+                    return
+                arrays = {key: (npz[f"{key}.time"], npz[f"{key}.value"]) for key in index["entries"]}
+        except (OSError, ValueError, KeyError):
+            return
+        self.index = index["entries"]
+        self.arrays = arrays
+
+    def save(self):
+        """
+        Writes the cached series to the sidecar file if anything changed.
+        """
+        if not self.dirty:
+            return
+        data = {"index": np.array(json.dumps({"version": self.VERSION, "entries": self.index}))}
+        for key, (times, values) in self.arrays.items():
+            data[f"{key}.time"] = times
+            data[f"{key}.value"] = values
+        tmp = f"{self.path}.{os.getpid()}"
+        try:
+            with open(tmp, "wb") as fid:
+                np.savez_compressed(fid, **data)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Warning: could not write cache {self.path}: {e}")
+
+    def read(self, key, catalog, names, var, time_name):
+        """
+        Returns the series of a source, reading only the files that are not
+        already cached (new files or files whose mtime or size changed).
+
+        Args:
+            key (str): Source of the series (see Plot.source).
+            catalog (Catalog): Catalog of the run directory.
+            names (list): Source files, relative to the run directory.
+            var (str): Variable to read.
+            time_name (str): Time coordinate to read.
+
+        Returns:
+            tuple: Times (datetime64[s]) and values of the series.
+        """
+        cached = {}
+        entry = self.index.get(key)
+        if entry and entry["var"] == var and entry["time"] == time_name:
+            times, values = self.arrays[key]
+            start = 0
+            for name, mtime, size, n in entry["files"]:
+                cached[name] = (mtime, size, times[start:start + n], values[start:start + n])
+                start += n
+
+        stats = [catalog.stat(name) for name in names]
+        new = [name for name, st in zip(names, stats) if cached.get(name, (None, None))[:2] != st]
+        if new:
+            print(f"            reading {len(new)} new file(s) out of {len(names)}")
+            times, values, counts = read_scalar_timeseries([os.path.join(catalog.dir, name) for name in new], var, time_name)
+            start = 0
+            for name, n in zip(new, counts):
+                cached[name] = catalog.stat(name) + (times[start:start + n], values[start:start + n])
+                start += n
+
+        files = [[name, *cached[name][:2], len(cached[name][2])] for name in names]
+        times = np.concatenate([cached[name][2] for name in names])
+        values = np.concatenate([cached[name][3] for name in names])
+
+        if new or entry is None or files != entry["files"]:
+            self.index[key] = {"var": var, "time": time_name, "files": files}
+            self.arrays[key] = (times, values)
+            self.dirty = True
+
+        return times, values
+
+
+class Run:
+    """
+    Represents the style and data for a specific run.
+    """
+
+    def __str__(self):
+        return f'    Run(runid={self.runid}, name={self.name}, line={self.line}, color={self.color}, marker={self.marker}, time_offset={self.time_offset}, dir={self.dir})'
+
+    def __init__(self, cdir, runid, name, line="-", color="black", marker=None, time_offset=0):
+        """
+        Initializes a Run object.
+
+        Args:
+            runid (str): Identifier for the run.
+            name (str): Name of the run.
+            line (str): Line style for plotting.
+            color (str): Color for plotting.
+            time_offset (int): Number of years added to the run time axis.
+        """
+        self.runid = runid
+        self.name = name
+        self.line = line
+        self.marker = marker
+        self.color = color
+        self.time_offset = time_offset
+        self.dir = os.path.join(cdir, self.runid)
+        self.catalog = None
+        self.cache = None
+        self.ts = {}
+
+    def load_ts(self, plots, strict=True):
+        """
+        Loads time series data for the run using a Plot object.
+    
+        Args:
+            plots (list): List of Plot configuration objects.
+            strict (bool): If False, plots without matching files or variable are
+                skipped with a warning instead of raising.
+    
+        Returns:
+            dict: Time series of the run (Run.ts), one DataFrame per Plot.key.
+        """
+        if self.catalog is None:
+            self.catalog = Catalog(self.dir)
+        if self.cache is None:
+            self.cache = SeriesCache(self.dir)
+
+        for plot in plots:
+            print(plot)
+            PROFILER.set_scope(run=self.runid, plot=plot.name)
+
+            # files, variable and time coordinate are resolved in memory from the run catalog
+            try:
+                names, var, ctime = self.catalog.resolve(plot.file_pattern, plot.var)
+            except (FileNotFoundError, KeyError) as e:
+                if strict:
+                    raise
+                print(f"⚠️ Warning: {plot.name} skipped for {self.runid}: {e}")
+                continue
+            sf = plot.sf
+
+            # only new or changed files are read, the rest comes from the run cache
+            times, data = self.cache.read(plot.source, self.catalog, names, var, ctime)
+
+            with PROFILER.stage("convert"):
+                # run specific time offset (TIME_OFFSET in styles.yml), not stored in the cache
+                if self.time_offset:
+                    times = shift_years(times, self.time_offset)
+
+                # MONTH/RESAMPLE/ROLLING/CLIM, computed from the cached series
+                times, data = transform_series(times, data, plot)
+
+                da = xr.DataArray(data * sf, [(ctime, times)], name=self.name).sortby(ctime)
+                self.ts[plot.key] = da.to_dataframe(name=self.name)
+
+        PROFILER.set_scope(run=self.runid)
+        with PROFILER.stage("cache"):
+            self.catalog.save()
+            self.cache.save()
+
+        return self.ts
+
+    def plot_ts(self, ax, plot, npix=None, method=None):
+        """
+        Plots the time series data on the given axis.
+
+        Args:
+            ax (matplotlib.axes.Axes): Axis to plot on.
+            var (str): Variable to plot.
+            npix (int): Width of the panel in pixels (used to downsample the series).
+            method (str): Downsampling method (None to draw every point, see downsample).
+
+        Raises:
+            ValueError: If time series data is not loaded.
+        """
+        if self.ts is None:
+            raise ValueError(f"Time series not loaded for run {self.runid}")
+
+        ts = self.ts[plot.key]
+        if method and npix:
+            ts = ts.iloc[downsample(ts.index.values, ts.values[:, 0], npix, method)]
+        ts.plot(ax=ax, legend=False, label=self.name, linestyle=self.line, marker=self.marker, color=self.color, linewidth=2)
+
+        rmin  = np.nanmin(self.ts[plot.key].values)
+        rmax  = np.nanmax(self.ts[plot.key].values)
+
+        tmin = self.ts[plot.key].index.min()
+        tmax = self.ts[plot.key].index.max()
+
+        # set x axis
+        ax.tick_params(axis='both', labelsize=18)
+#        if (not plot.time):
+#            ax.set_xticklabels([])
+#        else:
+#            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+        for lt in ax.get_xticklabels():
+            lt.set_ha('center')
+        ax.set_xlabel('')
+
+        return rmin, rmax, tmin, tmax
+
+
+def series_key(name, *parts):
+    """
+    Returns the key of a series: the plot key and a hash of its definition.
+
+    Two figures may define the same plot key differently (figs.yml can override
+    FILE_PATTERN, VAR, SF ...), so the loaded series are never shared by key alone.
+
+    Args:
+        name (str): Plot key.
+        *parts: Definition of the series (JSON serializable).
+
+    Returns:
+        str: <name>.<hash>
+    """
+    return f"{name}.{hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()[:10]}"
+
+
+class Plot:
+    """
+    Represents a plot configuration.
+    """
+
+    def __str__(self):
+        return f'        Plot(name={self.name}, var={self.var}, file_pattern={self.file_pattern}, sf={self.sf}, title={self.title}, loc={self.row}|{self.col})'
+
+    def __init__(self, data, obs=None):
+        """
+        Initializes a Plot object.
+
+        Args:
+            data (dict): Dictionary containing plot configuration.
+        """
+        self.name = data.get("NAME", "UNKNOWN")
+        self.pref = data.get("PREF", None)
+        self.var = data.get("VAR", None)
+        self.file_pattern = data.get("FILE_PATTERN", None)
+        self.sf = data.get("SF", 1.0)
+        self.title = data.get("TITLE", "UNKNOWN")
+        if ( self.pref != None ):
+            self.title = f"{self.pref} {self.title}"
+        self.row = data.get("ROW", 1)
+        self.col = data.get("COL", 1)
+        self.rowspan = data.get("ROWSPAN", 1)
+        self.colspan = data.get("COLSPAN", 1)
+        self.time = data.get("TIME", True)
+        self.fig_file = data.get("FIG_FILE", None)
+        self.downsample = data.get("DOWNSAMPLE", None)
+        self.month = data.get("MONTH", None)
+        self.resample = data.get("RESAMPLE", None)
+        self.rolling = data.get("ROLLING", None)
+        self.clim = data.get("CLIM", False)
+        # source (files and variable, see SeriesCache) and full definition of the series (see Run.ts)
+        self.source = series_key(self.name, self.file_pattern, self.var)
+        self.key = series_key(self.name, self.file_pattern, self.var, self.sf,
+                              self.month, self.resample, self.rolling, self.clim)
+        if obs:
+            self.ymin = obs.obs_min
+            self.ymax = obs.obs_max
+        else:
+            self.ymin =  9999.
+            self.ymax = -9999.
+        # y-range of the last render (obs range and series, padded by 2%)
+        self.ylim = (self.ymin, self.ymax)
+
+    def plot_timeseries(self, runs, npix=None, method=None):
+        """
+        Plots time series data for the given plot configuration.
+
+        Args:
+            ax (matplotlib.axes.Axes): Axis to plot on.
+            runs (list): List of Run objects containing time series data.
+            npix (int): Width of the panel in pixels.
+            method (str): Downsampling method (None to draw every point).
+
+        Returns:
+            tuple: Handles and labels for the legend.
+        """
+        # start from the obs range at every render (ymin/ymax are never updated, see ylim)
+        rmin = self.ymin
+        rmax = self.ymax
+        for run in runs:
+            PROFILER.set_scope(PROFILER.scope[0], run.runid, self.name)
+            with PROFILER.stage("plot"):
+                zmin, zmax, tmin, tmax = run.plot_ts(self.ax, self, npix, method)
+            rmin = min(rmin, zmin)
+            rmax = max(rmax, zmax)
+#            xmin = min(xmin, tmin)
+#            xmax = min(xmax, tmax)
+        rrange = rmax - rmin
+        self.ylim = (rmin - 0.02 * rrange, rmax + 0.02 * rrange)
+
+#        self.xmin = xmin - pd.DateOffset(months=6)
+#        self.xmax = xmax - pd.DateOffset(months=6)
+
+        self.ax.set_ylim(self.ylim)
+        hl, lb = self.ax.get_legend_handles_labels()
+        self.ax.set_title(self.title, fontsize=24)
+        self.ax.grid(True)
+        return hl, lb
+
+    def plot_observation(self, obs):
+        """
+        Plots observation data for the given plot configuration.
+
+        Args:
+            ax (matplotlib.axes.Axes): Axis to plot on.
+            obs (Obs): Observation data for the plot.
+        """
+
+    
+        if obs is not None:
+            # Add an additional axis for observations to the right
+            x0 = self.ax.get_position().x1
+            x1 = x0 + 0.02
+            y0 = self.ax.get_position().y0
+            y1 = self.ax.get_position().y1
+
+            # define axes for observation
+            obs_ax = self.ax.figure.add_axes([x0+0.005, y0, x1-x0, y1-y0])
+            obs_ax.set_visible(True)
+
+            # plot observation
+            obs_ax.errorbar(0, obs.mean, yerr=obs.std, fmt='*', markeredgecolor='k', markersize=8, color='k', linewidth=2)
+            obs_ax.set_xlim([-1, 1])
+            obs_ax.set_ylim(self.ylim)
+            obs_ax.set_xticks([])
+            obs_ax.set_yticklabels([])
+            obs_ax.grid()
+
+    def set_ax(self, fig, gs):
+        """
+        Sets the axis for the plot using GridSpec.
+
+        Args:
+            fig (matplotlib.figure.Figure): The figure to add the subplot to.
+            gs (matplotlib.gridspec.GridSpec): The GridSpec object defining the grid layout.
+        """
+        row = self.row - 1
+        col = self.col - 1
+        self.ax = fig.add_subplot(gs[row:row + self.rowspan, col:col + self.colspan])
+        self.ax.set_visible(True)
+
+
+class Obs:
+    """
+    Represents observation data for a specific variable.
+
+    Attributes:
+        mean (float): Mean value of the observation.
+        std (float): Standard deviation of the observation.
+        ref (str): Reference name for the observation.
+        max_dist (float): Optional score threshold on the normalized distance (run_score.py).
+        min_frac (float): Optional score threshold on the in-range fraction (run_score.py).
+    """
+
+    def __init__(self, data):
+        """
+        Initializes an Obs object by loading data from a YAML file.
+
+        Args:
+            data (dict): Dictionary containing observation data.
+        """
+        self.name = data["NAME"]
+        self.mean = data["MEAN"]
+        self.std = data["STD"]
+        self.ref = data.get("REF", "OBS")
+        self.max_dist = data.get("MAX_DIST", None)
+        self.min_frac = data.get("MIN_FRAC", None)
+        self.obs_max=self.mean+self.std
+        self.obs_min=self.mean-self.std
+
+    def __str__(self):
+        """
+        Returns a string representation of the Obs object.
+
+        Returns:
+            str: String representation of the observation data.
+        """
+        return f"    Obs(name={self.name}, mean={self.mean}, std={self.std}, ref={self.ref})"
+
+# ===================== LOADERS =====================
+def _load_run_ts(run, plots, strict=True, profile=False):
+    """
+    Loads the time series of one run (worker of load_runs_ts).
+
+    Args:
+        run (Run): Run to load.
+        plots (list): List of Plot configuration objects.
+        strict (bool): If False, missing series are skipped (see Run.load_ts).
+        profile (bool): Profile the loading (in a worker process).
+
+    Returns:
+        tuple: Loaded time series, catalog and cache of the run, and profiler records (None if not profiled).
+    """
+    if profile:
+        PROFILER.enable()
+    print('')
+    print(run)
+    print('')
+    run.load_ts(plots, strict)
+    return run.ts, run.catalog, run.cache, PROFILER.records if profile else None
+
+
+def load_runs_ts(tasks, jobs=1, strict=True):
+    """
+    Loads the time series of all the runs, concurrently if requested.
+
+    Each run is loaded by one worker process (loading is pure I/O and decoding)
+    and the resulting series (with the run catalog and cache) are merged back
+    into the Run objects.
+
+    Args:
+        tasks (list): List of (Run, list of Plot objects to load) tuples.
+        jobs (int): Number of worker processes (1 means sequential loading).
+        strict (bool): If False, missing series are skipped (see Run.load_ts).
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        for run, plots in tasks:
+            _load_run_ts(run, plots, strict)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        futures = [pool.submit(_load_run_ts, run, plots, strict, PROFILER.enabled) for run, plots in tasks]
+        for (run, _), future in zip(tasks, futures):
+            run.ts, run.catalog, run.cache, records = future.result()
+            if records:
+                PROFILER.merge(records)
+
+
+_YAML_CACHE = {}
+
+def load_yaml(file_path):
+    """
+    Loads a YAML file.
+
+    A file is only parsed once (unless it changes on disk), so the returned data
+    are shared and must not be modified.
+
+    Args:
+        file_path (str): Path to the YAML file.
+
+    Returns:
+        dict: Parsed YAML data.
+    """
+    key = os.path.abspath(file_path)
+    mtime = os.path.getmtime(file_path)
+    if key not in _YAML_CACHE or _YAML_CACHE[key][0] != mtime:
+        with open(file_path) as fid:
+            _YAML_CACHE[key] = (mtime, yaml.safe_load(fid))
+    return _YAML_CACHE[key][1]
+
+
+def yaml_modified():
+    """
+    Tells whether a YAML file loaded by load_yaml changed on disk since.
+
+    Returns:
+        bool: True if a loaded YAML file was modified or removed.
+    """
+    for key, (mtime, _) in list(_YAML_CACHE.items()):
+        try:
+            if os.path.getmtime(key) != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def load_runs(style_file, runids, cdir):
+    """
+    Loads run styles from a YAML file.
+
+    Args:
+        style_file (str): Path to the style configuration file.
+        runids (list): List of run IDs to load.
+        cdir (str): Base directory for the runs.
+
+    Returns:
+        list: List of Run objects.
+
+    Raises:
+        ValueError: If a run ID is not found in the style file.
+    """
+    data = load_yaml(style_file).get("runs", {})
+    runs = []
+    for rid in runids:
+        if rid not in data:
+            raise ValueError(f"RunID {rid} not found in style file")
+        info = data[rid]
+        runs.append(Run(cdir, rid, info.get("NAME", rid), info.get("LINE", "-"), info.get("COLOR", "black"), time_offset=info.get("TIME_OFFSET", 0)))
+    return runs
+
+
+def load_plots(plots_file, selection, obss):
+    """
+    Loads selected plots from plots.yml database based on figs.yml selection.
+
+    Args:
+        plots_file (str): Path to the plots.yml file.
+        selection (dict): Plot keys and their layout (ts section of figs.yml).
+        obss (dict): Dictionary of Obs objects.
+
+    Returns:
+        list: List of Plot objects.
+
+    Raises:
+        ValueError: If a plot key is not found in plots.yml or figs.yml is invalid.
+    """
+    all_plots = load_yaml(plots_file).get("plots", {})
+    figs = dict(sorted(selection.items(), key=lambda item: item[0]))  # for easy unit testing
+    selected = []
+
+    for key, layout in figs.items():
+        if key not in all_plots:
+            raise ValueError(f"Plot key {key} not found in plots.yml")
+        data = dict(all_plots[key])
+        data.update(layout)  # add row/col info
+        data["NAME"] = key  # add the plot key as NAME
+        selected.append(Plot(data, obss.get(key, None)))
+    return selected
+
+
+def load_obss(obss_file, selection):
+    """
+    Loads observation data from obs.yml based on figs.yml selection.
+
+    Args:
+        obss_file (str): Path to the obs.yml file.
+        selection (dict): Plot keys and their layout (ts section of figs.yml).
+
+    Returns:
+        dict: Dictionary of Obs objects.
+
+    Raises:
+        ValueError: If a plot key is not found in obs.yml or figs.yml is invalid.
+    """
+    all_obss = load_yaml(obss_file).get("obs", {})
+    figs = dict(sorted(selection.items(), key=lambda item: item[0]))  # for easy unit testing
+    selected = {}
+
+    for key, _ in figs.items():
+        if key not in all_obss:
+            print(f"⚠️ Warning: Obs key {key} not found in obs.yml")
+            continue
+        try:
+            data = dict(all_obss[key])
+            data["NAME"] = key  # add the plot key as NAME
+            selected[key] = Obs(data)
+        except (FileNotFoundError, KeyError) as e:
+            print(f"⚠️ Warning: Failed to load observation for {key}: {e}")
+    return selected
+
+
+# ===================== SCORES =====================
+def score_matrix(runs, plots, obss, period=None):
+    """
+    Computes the validation scores of runs against the obs.yml ranges.
+
+    The obs range of a key is [MEAN - STD, MEAN + STD]. The normalized departure
+    is the distance of the period mean to this range, signed and in units of
+    the range width (or of |MEAN| when STD is 0); it is 0 inside the range.
+
+    Args:
+        runs (list): List of Run objects with loaded time series.
+        plots (list): List of Plot objects (keys with an Obs entry).
+        obss (dict): Dictionary of Obs objects.
+        period (tuple): First and last year of the scoring period (None for the whole series).
+
+    Returns:
+        dict: runids and keys, plus (nrun, nkey) arrays of period mean, bias,
+            normalized departure, normalized distance and in-range fraction
+            (NaN where the series is missing or empty over the period).
+    """
+    keys = [plot.name for plot in plots]
+    series = [plot.key for plot in plots]
+    obs_mean = np.array([obss[key].mean for key in keys], dtype=float)
+    obs_min = np.array([obss[key].obs_min for key in keys], dtype=float)
+    obs_max = np.array([obss[key].obs_max for key in keys], dtype=float)
+
+    mean = np.full((len(runs), len(keys)), np.nan)
+    frac = np.full((len(runs), len(keys)), np.nan)
+    for i, run in enumerate(runs):
+        for j, key in enumerate(series):
+            ts = run.ts.get(key)
+            if ts is None:
+                continue
+            values = ts.iloc[:, 0].to_numpy(dtype=float)
+            if period is not None:
+                years = ts.index.year
+                values = values[(years >= period[0]) & (years <= period[1])]
+            values = values[np.isfinite(values)]
+            if values.size == 0:
+                continue
+            mean[i, j] = values.mean()
+            frac[i, j] = np.mean((values >= obs_min[j]) & (values <= obs_max[j]))
+
+    scale = np.where(obs_max > obs_min, obs_max - obs_min, np.abs(obs_mean))
+    scale = np.where(scale > 0, scale, 1.0)
+    departure = (mean - np.clip(mean, obs_min, obs_max)) / scale
+
+    return {
+        "runids": [run.runid for run in runs],
+        "keys": keys,
+        "mean": mean,
+        "bias": mean - obs_mean,
+        "departure": departure,
+        "dist": np.abs(departure),
+        "frac": frac,
+    }